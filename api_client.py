@@ -0,0 +1,85 @@
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# ------------------ Backend API Client ------------------
+
+def make_http_session(pool_size=16):
+    """A keep-alive `requests.Session` whose connection pool can be shared by every user session."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class MovieApiClient:
+    """Backend client for one frontend user session.
+
+    - Requests reuse pooled keep-alive connections and always URL-encode their parameters.
+    - Responses are cached for `ttl` seconds. Once expired, they are revalidated with
+      `If-None-Match`, so an unchanged result costs the backend a bodyless 304.
+    - Searches and movie lookups are always sent, because the backend records them in the
+      user's history and the popularity counts. A repeat is a conditional request, so an
+      unchanged result is not transferred again.
+    """
+
+    def __init__(self, base_url, session=None, ttl=60.0, timeout=5.0, max_entries=512):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or make_http_session()
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._cache = {}  # (path, params) -> (fetched_at, etag, payload)
+        self.requests_sent = 0
+        self.cache_hits = 0
+
+    def search(self, prefix, user_id, limit=20):
+        params = {"prefix": prefix.lower(), "user_id": user_id, "limit": limit, "rank": "true"}
+        return self.get("/search", params, ttl=0).get("movies", [])
+
+    def movie(self, movie_name, user_id):
+        return self.get(f"/movie/{requests.utils.quote(movie_name, safe='')}", {"user_id": user_id}, ttl=0)
+
+    def poster_url(self, movie_name, size="card"):
+        """URL of a movie's poster thumbnail; it redirects to an immutable, long-cached image."""
+        return f"{self.base_url}/poster/{requests.utils.quote(movie_name, safe='')}?size={size}"
+
+    def top_rated(self, n=10, **filters):
+        return self.get("/top-rated", {"N": n, **filters}).get("top_movies", [])
+
+    def movies_by_actors(self, prefix, user_id):
+        return self.get("/movies-by-actors", {"prefix": prefix, "user_id": user_id})
+
+    def history(self, user_id):
+        # History changes with every search, so it is never served from the cache.
+        return self.get("/history", {"user_id": user_id}, ttl=0).get("history", [])
+
+    def get(self, path, params=None, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        key = (path, self._key(params or {}))
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < ttl:
+            self.cache_hits += 1
+            return cached[2]
+
+        headers = {"If-None-Match": cached[1]} if cached is not None and cached[1] else {}
+        self.requests_sent += 1
+        response = self.session.get(f"{self.base_url}{path}", params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and cached is not None:
+            self._cache[key] = (now, cached[1], cached[2])
+            return cached[2]
+        response.raise_for_status()
+        payload = response.json()
+        if ttl > 0 or response.headers.get("ETag"):  # Kept past its ttl only to revalidate
+            self._cache.pop(key, None)
+            self._cache[key] = (now, response.headers.get("ETag"), payload)
+            while len(self._cache) > self.max_entries:
+                del self._cache[next(iter(self._cache))]  # Oldest insertion first
+        return payload
+
+    @staticmethod
+    def _key(params):
+        return tuple(sorted((name, str(value)) for name, value in params.items()))
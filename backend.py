@@ -1,29 +1,329 @@
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, g, jsonify, redirect, request, send_from_directory, url_for
 from pymongo import MongoClient
 import networkx as nx
+import numpy as np
 from flask_cors import CORS
+from movie_sync import MovieIndexSync, read_watermark
+from index_snapshot import collection_version, load_snapshot, save_snapshot
+from graph_engine import CSRGraph, MovieSimilarity
+from facet_index import FacetIndex
+from metrics import SIZE_BUCKETS, MetricsRegistry, SlowRequestProfiler
+from movie_ingest import FORMATS as INGEST_FORMATS, MovieIngestor, read_records
+from popularity import PopularityCounter
+from posters import PosterStore
+import atexit
+import gc
+import hashlib
+import io
 import logging
+import math
+import multiprocessing
 import os
-from heapq import heappush, heappop
+import pickle
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import ItemsView, Mapping, ValuesView
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from heapq import heappush, heappop, merge, nlargest
+from bisect import bisect_left, insort
+from itertools import islice
 
 # Set up logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 CORS(app)
 
+ENABLE_LIVE_SYNC = os.environ.get("MOVIE_LIVE_SYNC", "1") != "0"
+# Empty to disable snapshots
+SNAPSHOT_PATH = os.environ.get("MOVIE_SNAPSHOT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots", "movie_index.snap"))
+# Bump when MovieIndex gains or changes a structure, so older snapshots are rebuilt instead of restored
+INDEX_FORMAT = 9
+# How many of the most-voted movies get their recommendations precomputed. After the graph
+# changes they, and the scorer behind them, are rebuilt at most every RECOMMEND_REFRESH_SECONDS
+RECOMMEND_PRECOMPUTE = int(os.environ.get("RECOMMEND_PRECOMPUTE", 1000))
+RECOMMEND_REFRESH_SECONDS = float(os.environ.get("RECOMMEND_REFRESH_SECONDS", 30))
+MAX_RECOMMENDATIONS = 50
+# Processes that build the tries at startup, one per trie, so more than MAX_BUILD_WORKERS
+# are never used. Catalogs smaller than PARALLEL_BUILD_MIN_MOVIES are built in-process,
+# where forking would cost more than it saves
+INDEX_BUILD_WORKERS = int(os.environ.get("INDEX_BUILD_WORKERS", os.cpu_count() or 1))
+MAX_BUILD_WORKERS = 2
+PARALLEL_BUILD_MIN_MOVIES = 50_000
+MOVIE_LOAD_BATCH_SIZE = 1000
+# Fields kept in memory for every movie. The rest (trailer and song URLs, long text) is
+# read from MongoDB when a full document is requested, through a bounded LRU
+RESIDENT_FIELDS = ("Name", "Year", "IMDb", "Votes", "Genre", "Director", "Actors")
+# Bookkeeping fields (the live-sync watermark) that are never returned to clients
+INTERNAL_FIELDS = ("updated_at",)
+MOVIE_DETAILS_CACHE_SIZE = int(os.environ.get("MOVIE_DETAILS_CACHE_SIZE", 10_000))
+# Ranked suggestions put the titles users pick most first. Pick counts halve every
+# POPULARITY_HALF_LIFE_HOURS and are refreshed every POPULARITY_REFRESH_SECONDS (0 disables);
+# each refresh precomputes the suggestions of the HOT_PREFIXES most-searched prefixes
+POPULARITY_HALF_LIFE_HOURS = float(os.environ.get("POPULARITY_HALF_LIFE_HOURS", 24))
+POPULARITY_REFRESH_SECONDS = float(os.environ.get("POPULARITY_REFRESH_SECONDS", 30))
+HOT_PREFIXES = int(os.environ.get("HOT_PREFIXES", 256))
+# Poster files named after their movie are read from POSTER_DIR; thumbnails are pre-rendered
+# into POSTER_CACHE_DIR by POSTER_WORKERS processes at startup
+POSTER_DIR = os.environ.get("POSTER_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "posters"))
+POSTER_CACHE_DIR = os.environ.get("POSTER_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "thumbnails"))
+POSTER_WORKERS = int(os.environ.get("POSTER_WORKERS", os.cpu_count() or 1))
+# When set, POST /ingest requires "Authorization: Bearer <token>"
+INGEST_TOKEN = os.environ.get("INGEST_TOKEN")
+# Requests slower than this many milliseconds get a sampled stack profile logged; unset to disable
+SLOW_REQUEST_MS = os.environ.get("SLOW_REQUEST_MS")
+
+# ------------------ Metrics ------------------
+
+metrics = MetricsRegistry()
+REQUEST_SECONDS = metrics.histogram("http_request_duration_seconds", "Request latency by route.", ["route", "method"])
+REQUESTS_TOTAL = metrics.counter("http_requests_total", "Requests by route and status.", ["route", "method", "status"])
+TRIE_NODES_VISITED = metrics.histogram("trie_search_nodes_visited", "Trie nodes visited per search.",
+                                       ["trie", "mode"], SIZE_BUCKETS)
+TRIE_RESULTS = metrics.histogram("trie_search_results", "Names returned per trie search.", ["trie", "mode"], SIZE_BUCKETS)
+TITLE_CANDIDATES = metrics.histogram("title_search_candidates_scanned", "Movies checked per title word search.",
+                                     buckets=SIZE_BUCKETS)
+GRAPH_NEIGHBORS = metrics.histogram("graph_lookup_results", "Neighbors or nodes returned per graph lookup.",
+                                    ["operation"], SIZE_BUCKETS)
+INDEX_PHASE_SECONDS = metrics.gauge("index_phase_duration_seconds", "Duration of the latest run of each load/build phase.",
+                                    ["phase"])
+INDEX_UPDATE_SECONDS = metrics.histogram("index_update_duration_seconds", "Time to apply one live index update.")
+SUGGESTION_LOOKUPS = metrics.counter("suggestion_lookups_total", "Ranked suggestion lookups by where they were answered.",
+                                     ["source"])
+SLOW_REQUESTS = metrics.counter("slow_requests_total", "Requests slower than SLOW_REQUEST_MS.", ["route"])
+slow_request_profiler = (
+    SlowRequestProfiler(float(SLOW_REQUEST_MS) / 1000, sample_rate=float(os.environ.get("SLOW_REQUEST_SAMPLE_RATE", 1.0)))
+    if SLOW_REQUEST_MS else None
+)
+
 # ------------------ MongoDB Connection Class ------------------
 
+MISSING = -1  # Year or vote count absent from the document
+
+class MovieCatalog:
+    """The movie map: lowercased name -> resident fields of a movie, plus its id and name lookups.
+
+    Movies are stored column-wise: each one is a slot across parallel arrays, genre and
+    director strings are stored once and referenced by id, and actor names are shared
+    between movies. `get_movie_data()` returns a read-only mapping that builds a movie
+    dict on lookup. Values the typed columns cannot reproduce exactly ("9.0", "2,500,000",
+    "N/A", a list of genres) are also kept as given, so every movie reads back unchanged.
+    """
+
+    def __init__(self):
+        self._slots = {}             # Lowercased name -> slot
+        self._names = []             # Slot -> name as stored in MongoDB; None for a free slot
+        self._ids = []               # Slot -> MongoDB _id
+        self._years = array("i")
+        self._ratings = array("d")   # NaN when absent
+        self._votes = array("q")
+        self._genres = array("I")    # Index into _strings; 0 when absent
+        self._directors = array("I")
+        self._actors = []            # Slot -> tuple of shared actor names, or None
+        self._actor_lists = bytearray()  # 1 where Actors was a list rather than a comma-separated string
+        self._originals = {}         # Slot -> {field: value} for values the columns would not read back as stored
+        self._free = []
+        self._strings = [None]
+        self._string_ids = {}
+        self._actor_names = {}
+        self.movie_names_by_id = {}
+        self.shadowed_ids = {}       # _id -> lowercased name taken over by another document with that name
+
+    def __getstate__(self):
+        # Lookup maps are cheap to derive, so snapshots and clones skip them.
+        return {field: getattr(self, field) for field in (
+            "_names", "_ids", "_years", "_ratings", "_votes", "_genres", "_directors", "_actors", "_actor_lists",
+            "_originals", "_free", "_strings", "shadowed_ids")}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._slots = {name.lower(): slot for slot, name in enumerate(self._names) if name is not None}
+        self._string_ids = {string: string_id for string_id, string in enumerate(self._strings) if string_id}
+        self._actor_names = {actor: actor for actors in self._actors if actors for actor in actors}
+        self.movie_names_by_id = {self._ids[slot]: name for name, slot in self._slots.items()
+                                  if self._ids[slot] is not None}
+
+    def get_movie_data(self):
+        return MovieRecords(self)
+
+    def set_movie(self, movie_id, movie):
+        movie_name = movie["Name"].lower()
+        slot = self._slots.get(movie_name)
+        if slot is None:
+            slot = self._allocate()
+            self._slots[movie_name] = slot
+        if movie_id is not None:
+            displaced = self._ids[slot]
+            if displaced is not None and displaced != movie_id:
+                self.shadowed_ids[displaced] = movie_name
+            self.shadowed_ids.pop(movie_id, None)
+            self.movie_names_by_id.pop(displaced, None)
+            self._ids[slot] = movie_id
+            self.movie_names_by_id[movie_id] = movie_name
+        self._names[slot] = movie["Name"]
+        self._years[slot] = self._number(movie.get("Year"), int, MISSING)
+        self._ratings[slot] = self._number(movie.get("IMDb"), float, math.nan)
+        self._votes[slot] = self._number(str(movie.get("Votes", "")).replace(",", ""), int, MISSING)
+        self._genres[slot] = self._string_id(movie.get("Genre"))
+        self._directors[slot] = self._string_id(movie.get("Director"))
+        actors = movie.get("Actors")
+        self._actor_lists[slot] = isinstance(actors, list)
+        if isinstance(actors, str):
+            actors = actors.split(",")
+        self._actors[slot] = None if actors is None else tuple(
+            self._actor_names.setdefault(actor.strip(), actor.strip()) for actor in actors
+            if isinstance(actor, str) and actor.strip())
+        self._originals.pop(slot, None)
+        stored = self._record(slot)
+        originals = {field: movie[field] for field in RESIDENT_FIELDS
+                     if field in movie and (field not in stored or not self._same(stored[field], movie[field]))}
+        if originals:
+            self._originals[slot] = originals
+
+    def remove_movie(self, movie_name):
+        slot = self._slots.pop(movie_name, None)
+        if slot is None:
+            return None
+        movie = self._record(slot)
+        self.movie_names_by_id.pop(self._ids[slot], None)
+        self._names[slot] = self._ids[slot] = self._actors[slot] = None
+        self._originals.pop(slot, None)
+        self._free.append(slot)
+        return movie
+
+    def get_canonical_name(self, movie_name):
+        slot = self._slots.get(movie_name.lower())
+        return movie_name if slot is None else self._names[slot]
+
+    def get_movie_name_by_id(self, movie_id):
+        return self.movie_names_by_id.get(movie_id)
+
+    def get_movie_id(self, movie_name):
+        slot = self._slots.get(movie_name)
+        return None if slot is None else self._ids[slot]
+
+    def known_ids(self):
+        """Every `_id` the catalog accounts for: indexed movies plus the ones shadowed by a same-named movie."""
+        return set(self.movie_names_by_id).union(self.shadowed_ids)
+
+    def release_shadowed(self, movie_name):
+        """Forget the documents shadowed under a name that is free again, so a sweep indexes one of them."""
+        for movie_id in [movie_id for movie_id, name in self.shadowed_ids.items() if name == movie_name]:
+            del self.shadowed_ids[movie_id]
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _record(self, slot):
+        movie = {"Name": self._names[slot]}
+        year, rating, votes = self._years[slot], self._ratings[slot], self._votes[slot]
+        if year != MISSING:
+            movie["Year"] = year
+        if not math.isnan(rating):
+            movie["IMDb"] = rating
+        if votes != MISSING:
+            movie["Votes"] = votes
+        genre, director = self._strings[self._genres[slot]], self._strings[self._directors[slot]]
+        if genre is not None:
+            movie["Genre"] = genre
+        if director is not None:
+            movie["Director"] = director
+        actors = self._actors[slot]
+        if actors is not None:
+            movie["Actors"] = list(actors) if self._actor_lists[slot] else ", ".join(actors)
+        originals = self._originals.get(slot)
+        if originals:
+            movie.update((field, list(value) if isinstance(value, list) else value) for field, value in originals.items())
+        return movie
+
+    def _allocate(self):
+        if self._free:
+            return self._free.pop()
+        self._names.append(None)
+        self._ids.append(None)
+        self._years.append(MISSING)
+        self._ratings.append(math.nan)
+        self._votes.append(MISSING)
+        self._genres.append(0)
+        self._directors.append(0)
+        self._actors.append(None)
+        self._actor_lists.append(0)
+        return len(self._names) - 1
+
+    def _string_id(self, value):
+        if value is None or value == "":
+            return 0
+        if isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        value = str(value)
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(value)
+        return string_id
+
+    @staticmethod
+    def _same(stored, value):
+        return type(stored) is type(value) and stored == value
+
+    @staticmethod
+    def _number(value, kind, default):
+        try:
+            return kind(value) if value not in (None, "") else default
+        except (ValueError, TypeError):
+            return default
+
+class MovieRecords(Mapping):
+    """Read-only `lowercased name -> movie dict` view of a `MovieCatalog`, holding only RESIDENT_FIELDS."""
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+
+    def __getitem__(self, movie_name):
+        return self._catalog._record(self._catalog._slots[movie_name])
+
+    def __contains__(self, movie_name):
+        return movie_name in self._catalog._slots
+
+    def __iter__(self):
+        return iter(self._catalog._slots)
+
+    def __len__(self):
+        return len(self._catalog._slots)
+
+    def values(self):
+        return MovieRecordValues(self)
+
+    def items(self):
+        return MovieRecordItems(self)
+
+class MovieRecordValues(ValuesView):
+    def __iter__(self):
+        catalog = self._mapping._catalog
+        return map(catalog._record, catalog._slots.values())
+
+class MovieRecordItems(ItemsView):
+    def __iter__(self):
+        catalog = self._mapping._catalog
+        return ((name, catalog._record(slot)) for name, slot in catalog._slots.items())
+
 class MovieDataManager:
-    def __init__(self, db_url="mongodb://localhost:27017/", db_name="Movie_Information", collection_name="movies"):
+    def __init__(self, db_url="mongodb://localhost:27017/", db_name="Movie_Information", collection_name="movies", autoload=True):
         self.db_url = db_url
         self.db_name = db_name
         self.collection_name = collection_name
+        self.autoload = autoload
         self.client = None
         self.db = None
         self.collection = None
-        self.movie_data = {}
+        self.catalog = MovieCatalog()  # Follows the published index once serving starts
         
         self.connect_to_db()
 
@@ -34,7 +334,13 @@ class MovieDataManager:
             self.db = self.client[self.db_name]
             self.collection = self.db[self.collection_name]
             logger.info("Connected to MongoDB successfully")
-            self.load_movie_data()
+            try:
+                # Snapshot versions and the sync watermark read the newest updated_at; keep that an index seek.
+                self.collection.create_index("updated_at")
+            except Exception as e:
+                logger.error(f"Failed to create movie updated_at index: {e}")
+            if self.autoload:
+                self.load_movie_data()
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             self.collection = None
@@ -42,92 +348,582 @@ class MovieDataManager:
     def load_movie_data(self):
         if self.collection is not None:
             try:
-                self.movie_data = {movie["Name"].lower(): movie for movie in self.collection.find({}, {"_id": 0})}
-                logger.info(f"Loaded {len(self.movie_data)} movies into memory")
+                catalog = MovieCatalog()
+                with INDEX_PHASE_SECONDS.time("load_movie_data"), gc_paused():
+                    projection = {field: 1 for field in RESIDENT_FIELDS}
+                    for movie in self.collection.find({}, projection, batch_size=MOVIE_LOAD_BATCH_SIZE):
+                        catalog.set_movie(movie.pop("_id", None), movie)
+                self.catalog = catalog
+                logger.info(f"Loaded {len(catalog.get_movie_data())} movies into memory")
             except Exception as e:
                 logger.error(f"Failed to load movie data: {e}")
     
     def get_movie_data(self):
-        return self.movie_data
+        return self.catalog.get_movie_data()
+
+class MovieDetailsCache:
+    """Bounded LRU of the fields `MovieCatalog` does not keep resident, read from MongoDB by `_id`."""
+
+    def __init__(self, collection=None, max_entries=MOVIE_DETAILS_CACHE_SIZE):
+        self.collection = collection
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, movie_ids):
+        """Non-resident fields for each id, in one query for all misses; {} where none can be found."""
+        details = {}
+        missing = []
+        with self._lock:
+            for movie_id in movie_ids:
+                if movie_id in self._entries:
+                    self._entries.move_to_end(movie_id)
+                    details[movie_id] = self._entries[movie_id]
+                else:
+                    missing.append(movie_id)
+        if missing and self.collection is not None:
+            try:
+                documents = self.collection.find({"_id": {"$in": missing}},
+                                                 {field: 0 for field in RESIDENT_FIELDS + INTERNAL_FIELDS})
+                for document in documents:
+                    movie_id = document.pop("_id")
+                    details[movie_id] = document
+                    self._store(movie_id, document)
+            except Exception as e:
+                logger.error(f"Failed to load movie details: {e}")
+        return {movie_id: details.get(movie_id, {}) for movie_id in movie_ids}
+
+    def put(self, movie_id, document):
+        """Cache the non-resident fields of a document just read from MongoDB (so updates replace stale ones)."""
+        self._store(movie_id, {field: value for field, value in document.items()
+                               if field not in RESIDENT_FIELDS + INTERNAL_FIELDS and field != "_id"})
+
+    def discard(self, movie_id):
+        with self._lock:
+            self._entries.pop(movie_id, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, movie_id, details):
+        with self._lock:
+            self._entries[movie_id] = details
+            self._entries.move_to_end(movie_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
 
 # ------------------ Trie Structure Encapsulation ------------------
 
+def _count_visited(stats, count):
+    if stats is not None:
+        stats["nodes_visited"] = stats.get("nodes_visited", 0) + count
+
 class TrieNode:
     def __init__(self):
         self.children = {}
         self.is_end = False
         self.movie_names = []
+        self.top = []  # Best completions in this subtree, ordered by rank
 
 class Trie:
-    def __init__(self):
+    def __init__(self, top_k=20):
         self.root = TrieNode()
+        self.top_k = top_k
+        self._rank_keys = {}
+
+    def insert(self, name, rank=()):
+        """Insert a name; `rank` is a tuple where higher values rank first."""
+        key = (tuple(-value for value in rank), name)
+        old_key = self._rank_keys.get(name)
+        self._rank_keys[name] = key
+        path = self._insert_path(name.lower())
+        node = path[-1]
+        node.is_end = True
+        if name not in node.movie_names:
+            node.movie_names.append(name)
+        self._update_top(path, name, old_key is not None and key > old_key)
 
-    def insert(self, name):
+    def remove(self, name):
+        """Remove a name, pruning empty branches and repairing the cached top-K lists."""
+        path = self._node_path(name.lower())
+        if path is None or name not in path[-1].movie_names:
+            return False
+        node = path[-1]
+        node.movie_names.remove(name)
+        node.is_end = bool(node.movie_names)
+        self._prune(path, name.lower())
+        for node in reversed(path):
+            if name not in node.top:
+                break
+            node.top.remove(name)
+            self._rebuild_top(node)
+        del self._rank_keys[name]
+        return True
+
+    def search(self, prefix, limit=None, rank=False, stats=None):
+        """Names starting with `prefix`. Pass a `stats` dict to have `nodes_visited` added to it."""
+        node = self._find_node(prefix.lower(), stats)
+        if node is None:
+            return []
+        if rank and limit is not None and limit <= self.top_k:
+            return node.top[:limit]
+        if rank:
+            results = sorted(self._collect_names(node, stats=stats), key=self._rank_keys.__getitem__)
+            return results if limit is None else results[:limit]
+        return self._collect_names(node, limit, stats)
+
+    def fuzzy_search(self, query, max_edits=2, limit=None, prefix=True, stats=None):
+        """Return names within `max_edits` edits of `query`, closest first, then by rank.
+
+        Walks the trie with a Levenshtein automaton (one DP row per character) and stops
+        descending as soon as no cell of the row is within `max_edits`. With `prefix`
+        set, the query only has to match the beginning of a name, as in autocomplete: a
+        subtree is collected at the shallowest node that matches, and searched deeper
+        only while a closer match is still possible. `max_edits` is capped below the
+        query length, since with as many edits as characters every name would match.
+        """
+        query = query.lower()
+        max_edits = max(0, min(max_edits, len(query) - 1))
+        distances = {}
+
+        def collect(node, distance):
+            # A node's top-K only holds the best matches below it when no more than K are wanted
+            names = node.top if limit is not None and limit <= self.top_k else self._collect_names(node)
+            for name in names:
+                if distances.get(name, max_edits + 1) > distance:
+                    distances[name] = distance
+
+        # Each entry carries the distance its subtree was already collected at, if any.
+        stack = [(self.root, list(range(len(query) + 1)), max_edits + 1)]
+        if prefix and not query:
+            collect(self.root, 0)
+            stack = []
+        visited = 0
+        while stack:
+            node, row, collected = stack.pop()
+            visited += 1
+            if not prefix and node.is_end and row[-1] <= max_edits:
+                for name in node.movie_names:
+                    distances[name] = min(distances.get(name, row[-1]), row[-1])
+            for label, child in self._edges(node):
+                child_row = row
+                prefix_distance = max_edits + 1
+                exhausted = False
+                for char in label:
+                    child_row = self._next_row(child_row, query, char)
+                    prefix_distance = min(prefix_distance, child_row[-1])
+                    # Row minimums never fall along a path, so below here nothing gets under this bound.
+                    if min(child_row) >= (min(collected, prefix_distance) if prefix else max_edits + 1):
+                        exhausted = True
+                        break
+                if prefix and prefix_distance < collected:
+                    collect(child, prefix_distance)
+                if not exhausted:
+                    stack.append((child, child_row, min(collected, prefix_distance) if prefix else collected))
+        _count_visited(stats, visited)
+        ranked = sorted(distances, key=lambda name: (distances[name], self._rank_keys[name]))
+        return ranked if limit is None else ranked[:limit]
+
+    @staticmethod
+    def _next_row(row, query, char):
+        new_row = [row[0] + 1]
+        for j in range(1, len(row)):
+            cost = 0 if query[j - 1] == char else 1
+            new_row.append(min(new_row[j - 1] + 1, row[j] + 1, row[j - 1] + cost))
+        return new_row
+
+    def _edges(self, node):
+        return node.children.items()
+
+    def _make_node(self, label):
+        return TrieNode()
+
+    def __getstate__(self):
+        # Nodes are flattened into a preorder list so pickling deep tries never
+        # hits the recursion limit and loading skips the top-K maintenance of insert().
+        nodes = []
+        stack = [(None, self.root)]
+        while stack:
+            key, node = stack.pop()
+            nodes.append((key, getattr(node, "label", ""), node.is_end, node.movie_names, node.top, len(node.children)))
+            stack.extend(reversed(list(node.children.items())))
+        state = self.__dict__.copy()
+        state["root"] = nodes
+        return state
+
+    def __setstate__(self, state):
+        nodes = state.pop("root")
+        self.__dict__.update(state)
+        self.root = None
+        stack = []
+        for key, label, is_end, movie_names, top, child_count in nodes:
+            node = self._make_node(label)
+            node.is_end, node.movie_names, node.top = is_end, movie_names, top
+            if self.root is None:
+                self.root = node
+            else:
+                while stack[-1][1] == 0:
+                    stack.pop()
+                stack[-1][0].children[key] = node
+                stack[-1][1] -= 1
+            stack.append([node, child_count])
+
+    def _insert_path(self, word):
         node = self.root
-        for char in name.lower():
+        path = [node]
+        for char in word:
             if char not in node.children:
                 node.children[char] = TrieNode()
             node = node.children[char]
-        node.is_end = True
-        node.movie_names.append(name)
+            path.append(node)
+        return path
 
-    def search(self, prefix):
+    def _find_node(self, prefix, stats=None):
         node = self.root
-        for char in prefix.lower():
+        for depth, char in enumerate(prefix):
             if char not in node.children:
-                return []
+                _count_visited(stats, depth + 1)
+                return None
             node = node.children[char]
-        return self._collect_names(node)
+        _count_visited(stats, len(prefix) + 1)
+        return node
+
+    def _node_path(self, word):
+        node = self.root
+        path = [node]
+        for char in word:
+            node = node.children.get(char)
+            if node is None:
+                return None
+            path.append(node)
+        return path
 
-    def _collect_names(self, node):
+    def _prune(self, path, word):
+        for depth in range(len(path) - 1, 0, -1):
+            node = path[depth]
+            if node.is_end or node.children:
+                break
+            del path[depth - 1].children[word[depth - 1]]
+
+    def _collect_names(self, node, limit=None, stats=None):
         results = []
-        if node.is_end:
-            results.extend(node.movie_names)
-        for child in node.children.values():
-            results.extend(self._collect_names(child))
+        stack = [node]
+        visited = 0
+        while stack:
+            node = stack.pop()
+            visited += 1
+            if node.is_end:
+                results.extend(node.movie_names)
+                if limit is not None and len(results) >= limit:
+                    _count_visited(stats, visited)
+                    return results[:limit]
+            stack.extend(reversed(list(node.children.values())))
+        _count_visited(stats, visited)
         return results
 
+    def _update_top(self, path, name, demoted):
+        """Keep the cached top-K lists along `path` correct after inserting `name`."""
+        if self.top_k <= 0:
+            return
+        if demoted:
+            # The name ranks lower than before, so a sibling may have to take its place.
+            for node in reversed(path):
+                self._rebuild_top(node)
+            return
+        key = self._rank_keys.__getitem__
+        for node in path:
+            if name in node.top:
+                node.top.remove(name)
+            elif len(node.top) >= self.top_k and key(name) >= key(node.top[-1]):
+                continue
+            insort(node.top, name, key=key)
+            del node.top[self.top_k:]
+
+    def _rebuild_top(self, node):
+        candidates = set(node.movie_names) if node.is_end else set()
+        for child in node.children.values():
+            candidates.update(child.top)
+        node.top = sorted(candidates, key=self._rank_keys.__getitem__)[:self.top_k]
+
+class RadixNode:
+    __slots__ = ("label", "children", "is_end", "movie_names", "top")
+
+    def __init__(self, label=""):
+        self.label = label
+        self.children = {}  # First character of the child's label -> child
+        self.is_end = False
+        self.movie_names = []
+        self.top = []
+
+class RadixTrie(Trie):
+    """Path-compressed Trie: chains of single-child nodes collapse into one labelled edge.
+
+    Same API and ranking behaviour as `Trie`, with far fewer (and slotted) nodes.
+    """
+
+    def __init__(self, top_k=20):
+        super().__init__(top_k)
+        self.root = RadixNode()
+
+    def _insert_path(self, word):
+        node = self.root
+        path = [node]
+        while word:
+            child = node.children.get(word[0])
+            if child is None:
+                child = RadixNode(word)
+                node.children[word[0]] = child
+                path.append(child)
+                break
+            label = child.label
+            common = 1
+            limit = min(len(label), len(word))
+            while common < limit and label[common] == word[common]:
+                common += 1
+            if common < len(label):
+                # Split the edge so the shared part gets its own node.
+                middle = RadixNode(label[:common])
+                middle.top = list(child.top)
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                node.children[word[0]] = middle
+                child = middle
+            node = child
+            path.append(node)
+            word = word[common:]
+        return path
+
+    def _edges(self, node):
+        return ((child.label, child) for child in node.children.values())
+
+    def _make_node(self, label):
+        return RadixNode(label)
+
+    def _node_path(self, word):
+        node = self.root
+        path = [node]
+        while word:
+            node = node.children.get(word[0])
+            if node is None or not word.startswith(node.label):
+                return None
+            word = word[len(node.label):]
+            path.append(node)
+        return path
+
+    def _prune(self, path, word):
+        depth = len(path) - 1
+        while depth > 0 and not path[depth].is_end and not path[depth].children:
+            del path[depth - 1].children[path[depth].label[0]]
+            depth -= 1
+        node = path[depth]
+        if depth > 0 and not node.is_end and len(node.children) == 1:
+            # Re-compress: fold the lone remaining child into this edge.
+            (child,) = node.children.values()
+            child.label = node.label + child.label
+            path[depth - 1].children[child.label[0]] = child
+
+    def _find_node(self, prefix, stats=None):
+        node = self.root
+        visited = 1
+        while prefix:
+            child = node.children.get(prefix[0])
+            if child is None:
+                break
+            visited += 1
+            label = child.label
+            if prefix.startswith(label):
+                prefix = prefix[len(label):]
+                node = child
+            elif label.startswith(prefix):
+                # The prefix ends inside this edge; the subtree below is the same.
+                _count_visited(stats, visited)
+                return child
+            else:
+                break
+        _count_visited(stats, visited)
+        return None if prefix else node
+
 class MovieTrieManager:
-    def __init__(self):
-        self.movie_trie = Trie()
-        self.actor_trie = Trie()
+    def __init__(self, trie_class=RadixTrie):
+        self.movie_trie = trie_class()
+        self.actor_trie = trie_class()
+
+    def insert_movie(self, movie_name, rating=0.0, year=0):
+        self.movie_trie.insert(movie_name, rank=(rating, year))
+
+    def search_movies(self, prefix, limit=None, rank=False):
+        return self._observed("movies", "ranked" if rank else "prefix", self.movie_trie.search, prefix, limit, rank)
+
+    def insert_actor(self, actor_name, movie_count=0):
+        self.actor_trie.insert(actor_name, rank=(movie_count,))
 
-    def insert_movie(self, movie_name):
-        self.movie_trie.insert(movie_name)
+    def search_actors(self, prefix, limit=None, rank=False):
+        return self._observed("actors", "ranked" if rank else "prefix", self.actor_trie.search, prefix, limit, rank)
 
-    def search_movies(self, prefix):
-        return self.movie_trie.search(prefix)
+    def remove_movie(self, movie_name):
+        return self.movie_trie.remove(movie_name)
 
-    def insert_actor(self, actor_name):
-        self.actor_trie.insert(actor_name)
+    def remove_actor(self, actor_name):
+        return self.actor_trie.remove(actor_name)
 
-    def search_actors(self, prefix):
-        return self.actor_trie.search(prefix)
+    def fuzzy_search_movies(self, query, max_edits=2, limit=None):
+        return self._observed("movies", "fuzzy", self.movie_trie.fuzzy_search, query, max_edits, limit)
+
+    def fuzzy_search_actors(self, query, max_edits=2, limit=None):
+        return self._observed("actors", "fuzzy", self.actor_trie.fuzzy_search, query, max_edits, limit)
+
+    @staticmethod
+    def _observed(trie, mode, search, *args):
+        stats = {}
+        results = search(*args, stats=stats)
+        TRIE_NODES_VISITED.labels(trie, mode).observe(stats.get("nodes_visited", 0))
+        TRIE_RESULTS.labels(trie, mode).observe(len(results))
+        return results
 
 # ------------------ Graph Encapsulation ------------------
 
 class MovieGraph:
+    """The actor–movie graph in networkx, mirrored as integer edge arrays for building the CSR copy.
+
+    Mirror ids are never reused: a removed node just stops being live, and its edges are
+    dropped when the CSR is built. Once removed ids outnumber live ones, the mirror is
+    renumbered.
+    """
+
     def __init__(self):
         self.graph = nx.Graph()
         self.all_actors = set()
+        self._version = 0
+        self._csr = None
+        self._csr_version = -1
+        self._ids = {}  # Live node name -> mirror id
+        self._names = []  # Mirror id -> node name
+        self._is_actor = bytearray()
+        self._live = bytearray()
+        self._sources = array("i")  # One entry per edge, in either direction
+        self._targets = array("i")
 
     def add_movie(self, movie_name):
         self.graph.add_node(movie_name, type="movie")
+        self._node_id(movie_name, False)
+        self._version += 1
 
     def add_actor(self, actor_name):
         self.graph.add_node(actor_name, type="actor")
+        self._node_id(actor_name, True)
+        self._version += 1
 
     def add_edge(self, actor_name, movie_name):
+        if not self.graph.has_edge(actor_name, movie_name):
+            self._sources.append(self._node_id(actor_name, True))
+            self._targets.append(self._node_id(movie_name, False))
         self.graph.add_edge(actor_name, movie_name)
+        self._version += 1
+
+    def add_movies(self, movies):
+        """Bulk-load (movie name, actors) pairs, far cheaper than a node and edge call per credit."""
+        movies = [(movie_name, list(dict.fromkeys(movie_actors))) for movie_name, movie_actors in movies]
+        actors = list(dict.fromkeys(actor for _, movie_actors in movies for actor in movie_actors))
+        self.graph.add_nodes_from((movie_name for movie_name, _ in movies), type="movie")
+        self.graph.add_nodes_from(actors, type="actor")
+        self.graph.add_edges_from((actor, movie_name) for movie_name, movie_actors in movies for actor in movie_actors)
+        self.all_actors.update(actors)
+        for movie_name, movie_actors in movies:
+            movie_id = self._node_id(movie_name, False)
+            for actor in movie_actors:
+                self._sources.append(self._node_id(actor, True))
+                self._targets.append(movie_id)
+        self._version += 1
+
+    def remove_movie(self, movie_name):
+        """Remove a movie node and any actors left without movies; return its former actors."""
+        if movie_name not in self.graph:
+            return []
+        actors = [node for node in self.graph.neighbors(movie_name) if self.graph.nodes[node]["type"] == "actor"]
+        self.graph.remove_node(movie_name)
+        self._drop_node(movie_name)
+        self._version += 1
+        for actor in actors:
+            if self.graph.degree(actor) == 0:
+                self.graph.remove_node(actor)
+                self._drop_node(actor)
+                self.all_actors.discard(actor)
+        return actors
 
     def get_movies_by_actor(self, actor_name):
+        movies = []
         if actor_name in self.graph and self.graph.nodes[actor_name].get("type") == "actor":
-            return [node for node in self.graph.neighbors(actor_name) if self.graph.nodes[node]["type"] == "movie"]
-        return []
+            movies = [node for node in self.graph.neighbors(actor_name) if self.graph.nodes[node]["type"] == "movie"]
+        GRAPH_NEIGHBORS.labels("movies_by_actor").observe(len(movies))
+        return movies
 
     def get_graph(self):
         return self.graph
 
+    def csr(self):
+        """Compact CSR copy of the graph for traversals, rebuilt after the graph changes (by `IndexHolder` when live).
+
+        The rebuild is a few NumPy passes over the mirrored edge arrays.
+        """
+        if self._csr_version != self._version:
+            if len(self._names) > 2 * len(self._ids):
+                self._renumber()
+            live = np.frombuffer(self._live, dtype=np.uint8).astype(bool)
+            sources, targets = np.frombuffer(self._sources, dtype=np.int32), np.frombuffer(self._targets, dtype=np.int32)
+            keep = live[sources] & live[targets]
+            self._csr = CSRGraph.from_edges(list(self._names), np.frombuffer(self._is_actor, dtype=np.uint8),
+                                            sources[keep], targets[keep], dict(self._ids))
+            self._csr_version = self._version
+        return self._csr
+
+    def _node_id(self, name, is_actor):
+        node_id = self._ids.get(name)
+        if node_id is None:
+            node_id = self._ids[name] = len(self._names)
+            self._names.append(name)
+            self._is_actor.append(is_actor)
+            self._live.append(1)
+        else:
+            self._is_actor[node_id] = is_actor  # Re-adding a node replaces its type, as in networkx
+        return node_id
+
+    def _drop_node(self, name):
+        node_id = self._ids.pop(name, None)
+        if node_id is not None:
+            self._live[node_id] = 0
+
+    def _renumber(self):
+        """Give the live nodes consecutive ids and forget the edges of removed ones."""
+        live = np.frombuffer(self._live, dtype=np.uint8).astype(bool)
+        new_ids = np.cumsum(live, dtype=np.int32) - 1
+        sources, targets = np.frombuffer(self._sources, dtype=np.int32), np.frombuffer(self._targets, dtype=np.int32)
+        keep = live[sources] & live[targets]
+        self._sources = array("i", new_ids[sources[keep]].tobytes())
+        self._targets = array("i", new_ids[targets[keep]].tobytes())
+        self._names = [name for name, is_live in zip(self._names, self._live) if is_live]
+        self._is_actor = bytearray(np.frombuffer(self._is_actor, dtype=np.uint8)[live].tobytes())
+        self._live = bytearray(b"\x01") * len(self._names)
+        self._ids = {name: node_id for node_id, name in enumerate(self._names)}
+
+    def shortest_actor_path(self, source_actor, target_actor, max_degrees=6):
+        csr = self.csr()
+        if source_actor not in self.all_actors or target_actor not in self.all_actors:
+            return None
+        # Each degree of separation is an actor -> movie -> actor step.
+        path = csr.shortest_path(source_actor, target_actor, max_depth=2 * max_degrees)
+        GRAPH_NEIGHBORS.labels("actor_path").observe(len(path) if path else 0)
+        return path
+
+    def get_co_stars(self, actor_name, limit=None):
+        co_stars = self.csr().co_stars(actor_name, limit) if actor_name in self.all_actors else []
+        GRAPH_NEIGHBORS.labels("co_stars").observe(len(co_stars))
+        return co_stars
+
+    def get_neighborhood(self, name, hops, limit=None):
+        nodes = self.csr().k_hop(name, hops, limit)
+        GRAPH_NEIGHBORS.labels("neighborhood").observe(len(nodes))
+        return nodes
+
 # ------------------ Priority Queue Implementation ------------------
 
 class PriorityQueueItem:
@@ -177,20 +973,455 @@ class MoviePriorityQueue:
         self._heap = []
         self._size = 0
 
+# ------------------ Rating Index ------------------
+
+class RatingIndex:
+    """Movies kept sorted by IMDb score (year as tiebreak), overall, per genre and per (year, votes tier).
+
+    Built once at load time and updated per movie, so top-N queries walk a
+    presorted list instead of heapifying the whole catalog on every request. Year
+    and vote filters merge the sorted lists of the slices in range, so a filtered
+    page reads about as many keys as it returns instead of scanning the catalog.
+    """
+
+    MERGE_BATCH_MIN = 64  # Below this many changes, per-movie insorts beat one merge pass
+    _pending = None  # (added, dropped) key -> entry, while a batch is open
+
+    def __init__(self):
+        self._ranked = []    # Sorted (-rating, -year, name) keys, best first
+        self._by_genre = {}  # Lowercased genre -> sorted keys of movies in that genre
+        self._by_slice = {}  # (year, digits in the vote count) -> sorted keys of those movies
+        self._movies = {}    # Lowercased name -> (key, display name, rating, year, votes, genres)
+
+    def build(self, movies):
+        self._ranked, self._by_genre, self._by_slice, self._movies = [], {}, {}, {}
+        for movie in movies:
+            entry = self._make_entry(movie)
+            if entry is None:
+                continue
+            self._movies[entry[0][2]] = entry
+            self._ranked.append(entry[0])
+        self._ranked.sort()
+        for key in self._ranked:
+            entry = self._movies[key[2]]
+            for genre in entry[5]:
+                self._by_genre.setdefault(genre, []).append(key)
+            self._by_slice.setdefault(self._slice(entry), []).append(key)
+
+    def add_movie(self, movie):
+        self.remove_movie(movie.get("Name", ""))
+        entry = self._make_entry(movie)
+        if entry is None:
+            return
+        key, genres = entry[0], entry[5]
+        self._movies[key[2]] = entry
+        if self._pending is not None:
+            self._pending[0][key] = entry
+            return
+        insort(self._ranked, key)
+        for genre in genres:
+            insort(self._by_genre.setdefault(genre, []), key)
+        insort(self._by_slice.setdefault(self._slice(entry), []), key)
+
+    def remove_movie(self, movie_name):
+        entry = self._movies.pop(movie_name.lower(), None)
+        if entry is None:
+            return
+        key, genres = entry[0], entry[5]
+        if self._pending is not None:
+            if self._pending[0].pop(key, None) is None:
+                self._pending[1][key] = entry
+            return
+        self._discard(self._ranked, key)
+        for genre in genres:
+            self._discard(self._by_genre.get(genre, []), key)
+        self._discard(self._by_slice.get(self._slice(entry), []), key)
+
+    @contextmanager
+    def batch(self, size):
+        """Around `size` adds and removes: defer them and merge all of them in one pass at the end.
+
+        Each insort or delete shifts the whole sorted list, so a large batch is cheaper as
+        one copy of the list spliced at bisected positions.
+        """
+        if size < self.MERGE_BATCH_MIN or self._pending is not None:
+            yield
+            return
+        self._pending = ({}, {})
+        try:
+            yield
+        finally:
+            (added, dropped), self._pending = self._pending, None
+            self._ranked = self._merge(self._ranked, added, dropped)
+            for genre in {genre for entry in (*added.values(), *dropped.values()) for genre in entry[5]}:
+                self._by_genre[genre] = self._merge(
+                    self._by_genre.get(genre, []),
+                    [key for key, entry in added.items() if genre in entry[5]],
+                    {key for key, entry in dropped.items() if genre in entry[5]})
+            for part in {self._slice(entry) for entry in (*added.values(), *dropped.values())}:
+                self._by_slice[part] = self._merge(
+                    self._by_slice.get(part, []),
+                    [key for key, entry in added.items() if self._slice(entry) == part],
+                    {key for key, entry in dropped.items() if self._slice(entry) == part})
+
+    @staticmethod
+    def _merge(keys, added, dropped):
+        """`keys` without the `dropped` keys (all present) and with the `added` ones, still sorted."""
+        cuts = sorted([(bisect_left(keys, key), False, key) for key in dropped]
+                      + [(bisect_left(keys, key), True, key) for key in added])
+        merged = []
+        start = 0
+        for position, is_added, key in cuts:
+            merged += keys[start:position]
+            if is_added:
+                merged.append(key)
+                start = max(start, position)  # A drop at the same position already moved past it
+            else:
+                start = position + 1
+        merged += keys[start:]
+        return merged
+
+    def top(self, n=10, offset=0, genre=None, min_year=None, max_year=None, min_votes=None):
+        genre = genre.strip().lower() if genre else None
+        keys = self._by_genre.get(genre, []) if genre else self._ranked
+        if min_votes is not None and min_votes <= 0:
+            min_votes = None
+        if min_year is None and max_year is None and min_votes is None:
+            return [self._as_result(key) for key in keys[offset:offset + n]]
+        # Slices past the votes tier of `min_votes` all qualify; the ones in that tier are checked per movie.
+        tier = self._votes_tier(min_votes or 0)
+        slices = [part_keys for (year, votes_tier), part_keys in self._by_slice.items()
+                  if votes_tier >= tier and (min_year is None or year >= min_year)
+                  and (max_year is None or year <= max_year)]
+        # A scan reads about len(keys) / matches keys per result, so it wins unless the filter is selective.
+        if sum(map(len, slices)) * 8 < len(keys):
+            keys = merge(*slices)
+        results = []
+        skipped = 0
+        for key in keys:
+            _, _, _, year, votes, genres = self._movies[key[2]]
+            if genre is not None and genre not in genres:
+                continue
+            if min_year is not None and year < min_year:
+                continue
+            if max_year is not None and year > max_year:
+                continue
+            if min_votes is not None and votes < min_votes:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            results.append(self._as_result(key))
+            if len(results) >= n:
+                break
+        return results
+
+    def __len__(self):
+        return len(self._ranked)
+
+    def most_voted(self, n):
+        """Names of the `n` rated movies with the most votes."""
+        entries = nlargest(n, self._movies.values(), key=lambda entry: entry[4])
+        return [entry[0][2] for entry in entries]
+
+    def _as_result(self, key):
+        entry = self._movies[key[2]]
+        return {"Name": entry[1], "IMDb": entry[2]}
+
+    @classmethod
+    def _slice(cls, entry):
+        return entry[3], cls._votes_tier(entry[4])
+
+    @staticmethod
+    def _votes_tier(votes):
+        return len(str(votes)) if votes > 0 else 0
+
+    @staticmethod
+    def _make_entry(movie):
+        if not movie.get("IMDb") or not movie.get("Name"):
+            return None
+        try:
+            rating = float(movie["IMDb"])
+        except (ValueError, TypeError):
+            return None
+        try:
+            year = int(movie.get("Year") or 0)
+        except (ValueError, TypeError):
+            year = 0
+        votes = movie_votes(movie)
+        genres = movie_genres(movie)
+        name = movie["Name"].lower()
+        return (-rating, -year, name), movie["Name"], rating, year, votes, genres
+
+    @staticmethod
+    def _discard(keys, key):
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+# ------------------ Title Word Index ------------------
+
+_WORD = re.compile(r"\w+")
+
+def title_words(text):
+    """Normalized words of a title or query: case-folded, accents stripped, apostrophes dropped."""
+    text = text.casefold().replace("'", "").replace("\u2019", "")
+    if not text.isascii():
+        text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+    return _WORD.findall(text)
+
+class TitleIndex:
+    """Inverted index from title words to ascending integer movie ids, for word and word-prefix search.
+
+    `build()` numbers movies in rank order (best rating, then year), so walking a posting
+    list or an intersection visits matches best first and can stop after `limit` hits.
+    Movies added later get ids past that ranked range and are sorted by rank per query;
+    removed ids are tombstoned. Once such changes pile up, the index renumbers itself.
+    """
+
+    def __init__(self):
+        self._postings = {}       # Word -> array of movie ids, ascending
+        self._vocabulary = []     # Sorted words, for last-word prefix ranges
+        self._names = []          # Movie id -> lowercased title, None once removed
+        self._ratings = array("d")
+        self._years = array("i")
+        self._ids = {}            # Lowercased title -> movie id
+        self._ranked_count = 0    # Ids below this were assigned in rank order
+        self._removed = 0
+
+    def build(self, movies):
+        entries = []
+        for movie in movies:
+            rating, year = movie_rank(movie)
+            entries.append((-rating, -year, movie["Name"].lower()))
+        self._build(sorted(entries))
+
+    def add_movie(self, movie):
+        name = movie["Name"].lower()
+        self.remove_movie(name)
+        rating, year = movie_rank(movie)
+        self._append(name, rating, year, bulk=False)
+        if len(self._names) - self._ranked_count + self._removed > max(1024, self._ranked_count // 8):
+            self._compact()
+
+    def remove_movie(self, movie_name):
+        movie_id = self._ids.pop(movie_name.lower(), None)
+        if movie_id is not None:
+            self._names[movie_id] = None
+            self._removed += 1
+
+    def search(self, query, limit=20, prefix=True, stats=None):
+        """Titles containing every word of `query`, best rated first.
+
+        With `prefix`, the last word only has to start a title word, so results
+        follow the user as they type ("lord ri" finds "The Lord of the Rings").
+        """
+        words = title_words(query)
+        if not words or limit == 0:
+            return []
+        partial = words.pop() if prefix else None
+        required = set(words)
+        lists = []
+        for word in required:
+            postings = self._postings.get(word)
+            if postings is None:
+                return []
+            lists.append(postings)
+        partial_lists = []
+        if partial is not None:
+            start = bisect_left(self._vocabulary, partial)
+            end = bisect_left(self._vocabulary, partial + "\U0010ffff", start)
+            if start == end:
+                return []
+            partial_lists = [self._postings[word] for word in self._vocabulary[start:end]]
+
+        # Drive the scan from whichever candidate set is smallest and filter it against the rest.
+        driver = min(lists, key=len) if lists else None
+        if driver is None or sum(len(postings) for postings in partial_lists) < len(driver):
+            if len(partial_lists) == 1:
+                driver, partial_lists = partial_lists[0], []
+            else:
+                results, scanned = self._scan_union(partial_lists, lists, limit)
+                driver = None
+        else:
+            lists = [postings for postings in lists if postings is not driver]
+        if driver is not None:
+            results, scanned = self._scan_driver(driver, lists, partial_lists, partial, limit)
+
+        # Movies added since the last build are few and unordered: check them all, then merge by rank.
+        recent = {postings[i] for postings in (partial_lists if driver is None else [driver])
+                  for i in range(bisect_left(postings, self._ranked_count), len(postings))}
+        matched_recent = [movie_id for movie_id in recent if self._matches(movie_id, required, partial)]
+        if matched_recent:
+            results = sorted(results + matched_recent, key=self._rank_key)[:limit]
+        if stats is not None:
+            stats["candidates_scanned"] = scanned + len(recent)
+        return [self._names[movie_id] for movie_id in results]
+
+    def _scan_driver(self, driver, checks, partial_lists, partial, limit):
+        """Ranked ids from `driver` that are in every `checks` list and (if given) any `partial_lists` one.
+
+        Works through the driver in growing chunks with vectorized binary searches, so a
+        common query stops after its first chunk and a rare one never loops in Python.
+        """
+        ids = np.frombuffer(driver, dtype=np.uintc)[:bisect_left(driver, self._ranked_count)]
+        checks = sorted((np.frombuffer(postings, dtype=np.uintc) for postings in checks), key=len)
+        # Each title word with the prefix is its own list; past a few, re-tokenizing is cheaper.
+        partials = [np.frombuffer(postings, dtype=np.uintc) for postings in partial_lists] if len(partial_lists) <= 16 else None
+        results = []
+        start, chunk = 0, 256
+        while start < len(ids) and (limit is None or len(results) < limit):
+            block = ids[start:start + chunk]
+            start, chunk = start + chunk, chunk * 4
+            for postings in checks:
+                block = block[self._contains(postings, block)]
+            if partials:
+                mask = np.zeros(len(block), dtype=bool)
+                for postings in partials:
+                    mask |= self._contains(postings, block)
+                block = block[mask]
+            for movie_id in block.tolist():
+                name = self._names[movie_id]
+                if name is None or (partial_lists and partials is None
+                                    and not any(word.startswith(partial) for word in title_words(name))):
+                    continue
+                results.append(movie_id)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results, min(start, len(ids))
+
+    def _scan_union(self, partial_lists, checks, limit):
+        """Ranked ids in any of `partial_lists` and every `checks` list, merged lazily in id order."""
+        ranked = [islice(postings, bisect_left(postings, self._ranked_count)) for postings in partial_lists]
+        cursors = [0] * len(checks)
+        results = []
+        scanned = 0
+        last = None
+        for movie_id in merge(*ranked):
+            if limit is not None and len(results) >= limit:
+                break
+            if movie_id == last:
+                continue  # A title can hold several words with the same prefix
+            last = movie_id
+            scanned += 1
+            if self._names[movie_id] is not None and all(
+                    self._gallop(postings, movie_id, cursors, i) for i, postings in enumerate(checks)):
+                results.append(movie_id)
+        return results, scanned
+
+    @staticmethod
+    def _contains(postings, ids):
+        positions = np.searchsorted(postings, ids)
+        found = positions < len(postings)
+        found[found] = postings[positions[found]] == ids[found]
+        return found
+
+    def __len__(self):
+        return len(self._ids)
+
+    @staticmethod
+    def _gallop(postings, movie_id, cursors, i):
+        position = bisect_left(postings, movie_id, cursors[i])
+        cursors[i] = position
+        return position < len(postings) and postings[position] == movie_id
+
+    def _matches(self, movie_id, required, partial):
+        name = self._names[movie_id]
+        if name is None:
+            return False
+        words = title_words(name)
+        if required and not required.issubset(words):
+            return False
+        return partial is None or any(word.startswith(partial) for word in words)
+
+    def _rank_key(self, movie_id):
+        return -self._ratings[movie_id], -self._years[movie_id], self._names[movie_id]
+
+    def _build(self, entries):
+        self.__init__()
+        for negative_rating, negative_year, name in entries:
+            self._append(name, -negative_rating, -negative_year, bulk=True)
+        self._vocabulary = sorted(self._postings)
+        self._ranked_count = len(self._names)
+
+    def _append(self, name, rating, year, bulk):
+        movie_id = len(self._names)
+        self._names.append(name)
+        self._ratings.append(rating)
+        self._years.append(year)
+        self._ids[name] = movie_id
+        for word in set(title_words(name)):
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = array("I")
+                if not bulk:
+                    insort(self._vocabulary, word)  # A bulk build sorts the vocabulary once at the end
+            postings.append(movie_id)
+
+    def _compact(self):
+        """Renumber every live movie in rank order, dropping tombstones."""
+        self._build(sorted(self._rank_key(movie_id) for movie_id in self._ids.values()))
+
 # ------------------ Search History Encapsulation ------------------
 
+class MongoHistoryStore:
+    """Persists search events to a MongoDB collection with bulk inserts; old events expire by TTL."""
+
+    def __init__(self, collection, retention_days=90):
+        self.collection = collection
+        try:
+            self.collection.create_index("ts", expireAfterSeconds=retention_days * 24 * 3600)
+            self.collection.create_index([("user_id", 1), ("ts", -1)])
+        except Exception as e:
+            logger.error(f"Failed to create search history indexes: {e}")
+
+    def write(self, events):
+        self.collection.insert_many(
+            [{"user_id": user_id, "movie": movie_name, "ts": timestamp} for user_id, movie_name, timestamp in events],
+            ordered=False,
+        )
+
+    def read_user(self, user_id, limit):
+        """The movies of a user's `limit` most recent events, oldest first."""
+        # BSON dates keep milliseconds only; _id order breaks ties between events in one batch.
+        events = self.collection.find({"user_id": user_id}, {"_id": 0, "movie": 1}).sort(
+            [("ts", -1), ("_id", -1)]).limit(limit)
+        return [event["movie"] for event in reversed(list(events))]
+
 class SearchHistoryManager:
-    def __init__(self):
-        self._search_history = {}  
+    """Per-user recent searches, bounded per user and in the number of users kept.
+
+    Each user's history is an ordered set keyed on the lowercased name, so saving is O(1)
+    and repeats move to the end. Users are evicted least-recently-active first. With a
+    `store`, saves are queued and written behind in batches by a background thread, so
+    saving never waits on history I/O, and a user's persisted history is read (one
+    bounded query) the first time it is asked for, so startup reads nothing.
+    """
+
+    def __init__(self, max_items_per_user=50, max_users=100_000, store=None, flush_interval=1.0,
+                 batch_size=1000, max_pending=100_000):
+        self.max_items_per_user = max_items_per_user
+        self.max_users = max_users
+        self._search_history = OrderedDict()  # user_id -> OrderedDict(lowercased name -> name)
+        self._loaded = set()  # Users in _search_history whose persisted history is merged in
+        self._lock = threading.Lock()
+        self._store = store
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._pending = deque(maxlen=max_pending)  # Oldest unsaved events are dropped under overload
+        self._stop = threading.Event()
+        self._writer = None
+        if store is not None:
+            self._writer = threading.Thread(target=self._write_behind, name="search-history-writer", daemon=True)
+            self._writer.start()
 
     def save_search(self, user_id, movie_name):
         if not movie_name or not isinstance(movie_name, str):
             return False
         try:
-            if user_id not in self._search_history:
-                self._search_history[user_id] = []
-            if movie_name.lower() not in [m.lower() for m in self._search_history[user_id]]:
-                self._search_history[user_id].append(movie_name)
+            self._remember(user_id, movie_name)
+            if self._store is not None:
+                self._pending.append((user_id, movie_name, datetime.now(timezone.utc)))
             return True
         except Exception as e:
             logger.error(f"Failed to save search: {e}")
@@ -198,75 +1429,808 @@ class SearchHistoryManager:
 
     def get_search_history(self, user_id):
         try:
-            return self._search_history.get(user_id, [])
+            if self._store is not None and user_id not in self._loaded:
+                self._merge_stored(user_id, self._store.read_user(user_id, self.max_items_per_user))
+            with self._lock:
+                history = self._search_history.get(user_id)
+                return list(history.values()) if history else []
         except Exception as e:
             logger.error(f"Failed to get search history: {e}")
             return []
 
+    def flush(self):
+        while self._pending:
+            batch = []
+            while self._pending and len(batch) < self._batch_size:
+                batch.append(self._pending.popleft())
+            try:
+                self._store.write(batch)
+            except Exception as e:
+                logger.error(f"Failed to persist {len(batch)} search history events: {e}")
+                return
+
+    def close(self):
+        if self._writer is not None:
+            self._stop.set()
+            self._writer.join()
+            self._writer = None
+            self.flush()
+
+    def _remember(self, user_id, movie_name):
+        key = movie_name.lower()
+        with self._lock:
+            history = self._history(user_id)
+            if key in history:
+                history.move_to_end(key)
+            else:
+                history[key] = movie_name
+                if len(history) > self.max_items_per_user:
+                    history.popitem(last=False)
+
+    def _merge_stored(self, user_id, movie_names):
+        """Put persisted searches before the ones made since this process started."""
+        with self._lock:
+            history = self._history(user_id)
+            merged = OrderedDict((movie_name.lower(), movie_name) for movie_name in movie_names)
+            for key, movie_name in history.items():
+                merged.pop(key, None)
+                merged[key] = movie_name
+            while len(merged) > self.max_items_per_user:
+                merged.popitem(last=False)
+            self._search_history[user_id] = merged
+            self._loaded.add(user_id)
+
+    def _history(self, user_id):
+        """The user's history, created and marked most recently active; evicts idle users. Hold `_lock`."""
+        history = self._search_history.get(user_id)
+        if history is None:
+            history = self._search_history[user_id] = OrderedDict()
+            while len(self._search_history) > self.max_users:
+                evicted, _ = self._search_history.popitem(last=False)
+                self._loaded.discard(evicted)
+        else:
+            self._search_history.move_to_end(user_id)
+        return history
+
+    def _write_behind(self):
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+
+
+# ------------------ Response Cache ------------------
+
+class CachedResponse:
+    __slots__ = ("version", "payload", "body", "etag")
+
+    def __init__(self, version, payload, body, etag):
+        self.version = version
+        self.payload = payload
+        self.body = body
+        self.etag = etag
+
+class ResponseCache:
+    """Bounded LRU of serialized JSON responses, keyed by route and normalized parameters.
+
+    Entries remember the data version they were computed from; a lookup made after the
+    version moved on counts as a miss, so no explicit invalidation pass is needed.
+    """
+
+    def __init__(self, version_source, max_entries=4096):
+        self.version_source = version_source
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+
+    def fetch(self, key, compute):
+        """Return the cached entry for `key`, calling `compute()` for a payload on a miss."""
+        version = self.version_source()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        payload = compute()
+        body = app.json.dumps(payload).encode()
+        entry = CachedResponse(version, payload, body, hashlib.blake2b(body, digest_size=12).hexdigest())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def respond(self, entry):
+        """Build the HTTP response, answering 304 when the client already holds this ETag."""
+        if request.if_none_match.contains(entry.etag):
+            with self._lock:
+                self.not_modified += 1
+            response = Response(status=304)
+        else:
+            response = Response(entry.body, mimetype="application/json")
+        response.set_etag(entry.etag)
+        response.headers["Cache-Control"] = "no-cache"  # Always revalidate; data can change any time
+        return response
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "not_modified": self.not_modified,
+            }
+
+# ------------------ Index Bundle (Read-Copy-Update) ------------------
+
+def movie_rank(movie):
+    """Return the (IMDb score, year) pair used to order movies, best first."""
+    try:
+        rating = float(movie.get("IMDb") or 0)
+    except (ValueError, TypeError):
+        rating = 0.0
+    try:
+        year = int(movie.get("Year") or 0)
+    except (ValueError, TypeError):
+        year = 0
+    return rating, year
+
+def parse_actors(movie):
+    """Normalize the `Actors` field, stored either as a comma-separated string or a list."""
+    actors = movie.get("Actors", [])
+    if isinstance(actors, str):
+        actors = actors.split(",")
+    elif not isinstance(actors, list):
+        return []
+    return [actor.strip().lower() for actor in actors if actor and actor.strip()]
+
+def movie_genres(movie):
+    """Lowercased genres of a movie, from a comma-separated string or a list."""
+    genres = movie.get("Genre") or []
+    if isinstance(genres, str):
+        genres = genres.split(",")
+    return tuple({genre.strip().lower() for genre in genres if genre and genre.strip()})
+
+def movie_votes(movie):
+    try:
+        return int(str(movie.get("Votes") or 0).replace(",", ""))
+    except ValueError:
+        return 0
+
+def movie_facets(movie):
+    """The (name, rating, year, votes, genres, director) row `FacetIndex` stores for a movie."""
+    rating, year = movie_rank(movie)
+    director = movie.get("Director")
+    director = director.strip() if isinstance(director, str) else ""
+    return movie["Name"].lower(), rating, year, movie_votes(movie), movie_genres(movie), director
+
+# ------------------ Index Build Workers ------------------
+
+@contextmanager
+def gc_paused():
+    """Suspend the cyclic garbage collector while millions of long-lived objects are created.
+
+    Otherwise every few thousand allocations trigger a collection, and the full ones walk
+    everything built so far; none of these objects are garbage.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def build_pool(movie_count, workers):
+    """A forked process pool for building a large catalog, or None to build in-process."""
+    if workers < 2 or movie_count < PARALLEL_BUILD_MIN_MOVIES or "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    # One process per trie; forked so workers share the already-imported code instead of re-running the module.
+    return ProcessPoolExecutor(min(workers, MAX_BUILD_WORKERS), mp_context=multiprocessing.get_context("fork"))
+
+def submit(pool, function, *args):
+    """Run `function` on the pool, or right away without one; either way return a Future."""
+    if pool is not None:
+        return pool.submit(function, *args)
+    future = Future()
+    future.set_result(function(*args))
+    return future
+
+def build_trie(trie_class, entries):
+    trie = trie_class()
+    for name, rank in entries:
+        trie.insert(name, rank=rank)
+    return trie
+
+class MovieIndex:
+    """One complete, mutually consistent copy of the movie map, tries, graph, rating, title and facet indexes."""
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog if catalog is not None else MovieCatalog()
+        self.movie_trie_manager = MovieTrieManager()
+        self.movie_graph = MovieGraph()
+        self.rating_index = RatingIndex()
+        self.title_index = TitleIndex()
+        self.facet_index = FacetIndex()
+        self._similarity = None
+        self._similarity_version = -1
+        self._recommendations = {}  # Precomputed for popular movies; valid for `_similarity_version`
+        self._readers = deque()  # One entry per request currently reading this copy
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_readers"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._readers = deque()
+
+    def get_movie_data(self):
+        return self.catalog.get_movie_data()
+
+    def build(self, workers=1):
+        """Build every index from the catalog.
+
+        Each actor goes into the actor trie once, ranked by its final movie count. With
+        `workers` > 1 and a large catalog, worker processes build the two tries (from just
+        the names and ranks) while this process builds the graph and the rating, title and
+        facet indexes.
+        """
+        movies = self.get_movie_data().values()
+        with gc_paused():
+            pool = build_pool(len(movies), workers)
+            try:
+                self._build(movies, pool)
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+
+    def _build(self, movies, pool):
+        with INDEX_PHASE_SECONDS.time("parse_movies"):
+            rows = [(movie["Name"].lower(), *movie_rank(movie), parse_actors(movie)) for movie in movies]
+        with INDEX_PHASE_SECONDS.time("index_movies"):
+            trie_class = type(self.movie_trie_manager.movie_trie)
+            movie_trie = submit(pool, build_trie, trie_class, [(name, (rating, year)) for name, rating, year, _ in rows])
+            self.movie_graph.add_movies((name, actors) for name, _, _, actors in rows)
+            del rows
+            graph = self.movie_graph.get_graph()
+            actor_trie = submit(pool, build_trie, type(self.movie_trie_manager.actor_trie),
+                                [(actor, (graph.degree(actor),)) for actor in self.movie_graph.all_actors])
+        with INDEX_PHASE_SECONDS.time("rating_index"):
+            self.rating_index.build(self.get_movie_data().values())
+        with INDEX_PHASE_SECONDS.time("title_index"):
+            self.title_index.build(self.get_movie_data().values())
+        with INDEX_PHASE_SECONDS.time("facet_index"):
+            self.facet_index.build(movie_facets(movie) for movie in self.get_movie_data().values())
+        with INDEX_PHASE_SECONDS.time("graph_csr"):
+            self.movie_graph.csr()
+        with INDEX_PHASE_SECONDS.time("recommendations"):
+            self.refresh_similarity()
+        with INDEX_PHASE_SECONDS.time("tries"):
+            self.movie_trie_manager.movie_trie = movie_trie.result()
+            self.movie_trie_manager.actor_trie = actor_trie.result()
+
+    def refresh_similarity(self):
+        """Rebuild the similarity scorer and popular recommendations if the graph changed since; True if rebuilt."""
+        if self._similarity_version == self.movie_graph._version:
+            return False
+        movies = ((name, (movie.get("Director") or "").strip().lower(), movie_genres(movie), movie_rank(movie)[0])
+                  for name, movie in self.get_movie_data().items())
+        self._similarity = MovieSimilarity(self.movie_graph.csr(), movies)
+        self._similarity_version = self.movie_graph._version
+        popular = self.rating_index.most_voted(RECOMMEND_PRECOMPUTE)
+        self._recommendations = self._similarity.similar_many(popular, MAX_RECOMMENDATIONS)
+        return True
+
+    def similarity(self):
+        """Recommendation scorer as of its last refresh; built here only if this copy never had one."""
+        if self._similarity is None:
+            self.refresh_similarity()
+        return self._similarity
+
+    def recommend(self, movie_name, limit=10):
+        """Movies most like `movie_name`: shared actors, then director and genre, best rated first on ties.
+
+        The scorer may be up to one refresh behind live updates, so movies deleted since
+        are skipped and movies added since have no recommendations yet.
+        """
+        similarity = self.similarity()
+        precomputed = self._recommendations.get(movie_name)
+        if precomputed is None or limit > MAX_RECOMMENDATIONS:
+            precomputed = similarity.similar(movie_name, max(limit, MAX_RECOMMENDATIONS))
+        movie_data = self.get_movie_data()
+        return [
+            {"Name": self.catalog.get_canonical_name(name), "score": score, "shared_actors": shared_actors,
+             "same_director": same_director, "shared_genres": shared_genres}
+            for name, score, shared_actors, same_director, shared_genres in precomputed if name in movie_data
+        ][:limit]
+
+    def browse(self, sort="rating", offset=0, limit=20, **filters):
+        """One page of movies matching the facet filters, with the total and per-facet counts."""
+        result = self.facet_index.query(sort=sort, offset=offset, limit=limit, **filters)
+        movie_data = self.get_movie_data()
+        movies = []
+        for name in result["names"]:
+            movie = movie_data[name]
+            movies.append({field: movie.get(field) for field in ("Name", "Year", "IMDb", "Genre", "Director")})
+        return {"total": result["total"], "offset": offset, "movies": movies, "facets": result["facets"]}
+
+    def index_movie(self, movie):
+        movie_name = movie["Name"].lower()
+        self.movie_trie_manager.insert_movie(movie_name, *movie_rank(movie))
+        self.movie_graph.add_movie(movie_name)
+        for actor in parse_actors(movie):
+            self.movie_graph.add_actor(actor)
+            self.movie_graph.add_edge(actor, movie_name)
+            self.movie_trie_manager.insert_actor(actor, self.movie_graph.get_graph().degree(actor))
+            self.movie_graph.all_actors.add(actor)
+
+    def unindex_movie(self, movie_name):
+        self.catalog.remove_movie(movie_name)
+        self.movie_trie_manager.remove_movie(movie_name)
+        self.rating_index.remove_movie(movie_name)
+        self.title_index.remove_movie(movie_name)
+        self.facet_index.remove(movie_name)
+        for actor in self.movie_graph.remove_movie(movie_name):
+            if actor in self.movie_graph.all_actors:
+                self.movie_trie_manager.insert_actor(actor, self.movie_graph.get_graph().degree(actor))
+            else:
+                self.movie_trie_manager.remove_actor(actor)
+
+    def apply_upsert(self, document):
+        """Apply an inserted or updated MongoDB document to every index."""
+        movie = dict(document)
+        movie_id = movie.pop("_id", None)
+        if not movie.get("Name"):
+            return
+        movie_name = movie["Name"].lower()
+        previous_name = self.catalog.get_movie_name_by_id(movie_id)
+        if previous_name is not None:
+            self.unindex_movie(previous_name)
+            if previous_name != movie_name:
+                self.catalog.release_shadowed(previous_name)
+        # Another document with the same name is replaced, and remembered so sync sweeps leave it be.
+        displaced = self.catalog.get_movie_id(movie_name)
+        if movie_name in self.get_movie_data():
+            self.unindex_movie(movie_name)
+        self.catalog.set_movie(movie_id, movie)
+        if displaced is not None and displaced != movie_id:
+            self.catalog.shadowed_ids[displaced] = movie_name
+        self.index_movie(movie)
+        self.rating_index.add_movie(movie)
+        self.title_index.add_movie(movie)
+        self.facet_index.add(*movie_facets(movie))
+        if self.facet_index.needs_rebuild():
+            # Restores rank-ordered positions, so rating-sorted pages are a plain bitmap scan again.
+            self.facet_index.build(movie_facets(movie) for movie in self.get_movie_data().values())
+
+    def apply_delete(self, movie_id):
+        self.catalog.shadowed_ids.pop(movie_id, None)
+        movie_name = self.catalog.get_movie_name_by_id(movie_id)
+        if movie_name is not None:
+            self.unindex_movie(movie_name)
+            self.catalog.release_shadowed(movie_name)
+
+    def is_noop(self, operation, value):
+        """True if applying the change would leave this index as it is, e.g. a re-sent unchanged document."""
+        if operation == "delete":
+            return value not in self.catalog.movie_names_by_id and value not in self.catalog.shadowed_ids
+        if not value.get("Name"):
+            return True
+        movie_name = value["Name"].lower()
+        if movie_name not in self.get_movie_data() or self.catalog.get_movie_id(movie_name) != value.get("_id"):
+            return False
+        return self.get_movie_data()[movie_name] == {field: value[field] for field in RESIDENT_FIELDS if field in value}
+
+class IndexHolder:
+    """Publishes `MovieIndex` copies with read-copy-update semantics (a left-right scheme).
+
+    Readers never lock: `read()` pins whichever copy is current for one request. The
+    writer applies a batch of changes to a standby copy, publishes it with a single
+    reference assignment, waits for readers still pinned to the old copy to drain, then
+    replays the batch on it so it becomes the next standby. The graph CSR is rebuilt
+    before publishing, never by readers. The standby is cloned from the current copy on
+    the first write (or ahead of it by `start(warm_standby=True)`), so read-only
+    deployments hold one copy.
+
+    The recommendation scorer is too costly to rebuild per change. A background thread
+    refreshes it at most every `refresh_interval` seconds, and only if the graph changed.
+    """
+
+    def __init__(self, index, on_publish=None, refresh_interval=RECOMMEND_REFRESH_SECONDS):
+        self.current = index
+        self.on_publish = on_publish
+        self.refresh_interval = refresh_interval
+        self.version = 0  # Bumped on every publish; cached responses are tied to it
+        self._standby = None
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, warm_standby=False):
+        if self._thread is None and (warm_standby or self.refresh_interval > 0):
+            self._thread = threading.Thread(target=self._run, args=(warm_standby,), name="index-maintenance",
+                                            daemon=True)
+            self._thread.start()
+
+    def close(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    @contextmanager
+    def read(self):
+        while True:
+            index = self.current
+            index._readers.append(None)
+            # A writer may have swapped copies between the two lines above; if so,
+            # it could already be mutating `index`, so unpin and take the new one.
+            if index is self.current:
+                break
+            index._readers.pop()
+        try:
+            yield index
+        finally:
+            index._readers.pop()
+
+    def update(self, changes):
+        """Apply `changes`, a list of ("upsert", document) or ("delete", movie_id) pairs."""
+        with self._write_lock:
+            changes = [(operation, value) for operation, value in changes if not self.current.is_noop(operation, value)]
+            if not changes:
+                return
+            standby = self._standby if self._standby is not None else self._clone(self.current)
+            self._apply(standby, changes)
+            standby.movie_graph.csr()
+            retired = self._swap(standby)
+            self._apply(retired, changes)
+            self._standby = retired
+
+    def refresh_recommendations(self):
+        """Rebuild the recommendation scorer of the published copy if the graph changed, and share it with the standby."""
+        with self._write_lock:
+            index = self.current
+            if not index.refresh_similarity():
+                return False
+            if self._standby is not None:
+                self._standby._similarity = index._similarity
+                self._standby._similarity_version = self._standby.movie_graph._version
+                self._standby._recommendations = index._recommendations
+            self.version += 1  # Cached recommendations came from the old scorer
+            return True
+
+    def warm_standby(self):
+        """Clone the standby now, so the first update does not pay for it."""
+        with self._write_lock:
+            if self._standby is None:
+                self._standby = self._clone(self.current)
+
+    def publish(self, index):
+        """Replace every copy with a freshly built index."""
+        with self._write_lock:
+            self._swap(index)
+            self._standby = None
+
+    def _swap(self, index):
+        retired = self.current
+        self.current = index
+        self.version += 1
+        if self.on_publish is not None:
+            self.on_publish(index)
+        while retired._readers:
+            time.sleep(0.0005)
+        return retired
+
+    @staticmethod
+    def _apply(index, changes):
+        with index.rating_index.batch(len(changes)):
+            for operation, value in changes:
+                if operation == "upsert":
+                    index.apply_upsert(value)
+                elif operation == "delete":
+                    index.apply_delete(value)
+
+    @staticmethod
+    def _clone(index):
+        with gc_paused():
+            return pickle.loads(pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _run(self, warm_standby):
+        try:
+            if warm_standby:
+                self.warm_standby()
+        except Exception as e:
+            logger.error(f"Failed to prepare the standby index: {e}")
+        while self.refresh_interval > 0 and not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh_recommendations()
+            except Exception as e:
+                logger.error(f"Failed to refresh recommendations: {e}")
+
+# ------------------ Suggestion Ranking ------------------
+
+class SuggestionRanker:
+    """Orders title suggestions by how often users pick them, then by rating.
+
+    `/search` prefixes and `/movie` picks are counted in decayed `PopularityCounter`s. A
+    background thread refreshes them every `refresh_interval` seconds, then precomputes
+    the suggestions of the `hot_prefixes` most-searched prefixes. Those are rebuilt
+    within a second of an index swap, so the bulk of autocomplete traffic is a dict lookup.
+    """
+
+    def __init__(self, index_holder, refresh_interval=30.0, half_life=24 * 3600.0, hot_prefixes=256, hot_results=20):
+        self.index_holder = index_holder
+        self.refresh_interval = refresh_interval
+        self.hot_prefixes = hot_prefixes
+        self.hot_results = hot_results
+        self.queries = PopularityCounter(half_life)
+        self.selections = PopularityCounter(half_life)
+        self.version = 0  # Bumped whenever pick counts change; ranked responses are cached per version
+        self._popular = ([], [])  # Most-picked lowercased names in sorted order, and their counts
+        self._hot = (None, {})  # (index version, prefix -> suggestions)
+        self._stop = threading.Event()
+        self._thread = None
 
+    def start(self):
+        if self.refresh_interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="suggestion-popularity", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def record_query(self, prefix):
+        if prefix:
+            self.queries.record(prefix)
+
+    def record_selection(self, movie_name):
+        self.selections.record(movie_name.lower())
+
+    def suggest(self, index, prefix, limit=None):
+        """Names under `prefix`: the most-picked first, then the rest by rating."""
+        version, hot = self._hot
+        if limit is not None and limit <= self.hot_results and version == self.index_holder.version:
+            results = hot.get(prefix)
+            if results is not None:
+                SUGGESTION_LOOKUPS.labels("hot").inc()
+                return results[:limit]
+        SUGGESTION_LOOKUPS.labels("computed").inc()
+        return self._rank(index, prefix, limit)
+
+    def refresh(self):
+        if self.selections.refresh():
+            scores = self.selections.scores
+            names = sorted(scores)
+            self._popular = (names, [scores[name] for name in names])
+            self.version += 1
+        self.queries.refresh()
+        self._rebuild_hot()
+
+    def _rank(self, index, prefix, limit):
+        names, counts = self._popular
+        start = bisect_left(names, prefix)
+        end = bisect_left(names, prefix + "\U0010ffff", start)
+        movie_data = index.get_movie_data()
+        results = [names[i] for i in sorted(range(start, end), key=lambda i: -counts[i]) if names[i] in movie_data]
+        if limit is not None and len(results) >= limit:
+            return results[:limit]
+        picked = set(results)
+        trie_manager = index.movie_trie_manager
+        if limit is None:
+            return results + [name for name in trie_manager.search_movies(prefix, None, True) if name not in picked]
+        # Stay within the trie's cached top-K when it has room for the picked names too.
+        needed = limit - len(results)
+        fetch = min(needed + len(picked), max(needed, trie_manager.movie_trie.top_k))
+        ranked = trie_manager.search_movies(prefix, fetch, True)
+        rest = [name for name in ranked if name not in picked]
+        if len(rest) < needed and len(ranked) == fetch:
+            rest = [name for name in trie_manager.search_movies(prefix, needed + len(picked), True) if name not in picked]
+        return results + rest[:needed]
+
+    def _rebuild_hot(self):
+        # Read the version first: if a swap lands in between, the entries are merely discarded early.
+        version = self.index_holder.version
+        with self.index_holder.read() as index:
+            hot = {prefix: self._rank(index, prefix, self.hot_results) for prefix in self.queries.hottest(self.hot_prefixes)}
+        self._hot = (version, hot)
+
+    def _run(self):
+        next_refresh = time.monotonic() + self.refresh_interval
+        while not self._stop.wait(min(self.refresh_interval, 1.0)):
+            try:
+                if time.monotonic() >= next_refresh:
+                    next_refresh += self.refresh_interval
+                    self.refresh()
+                elif self._hot[0] != self.index_holder.version:
+                    self._rebuild_hot()
+            except Exception as e:
+                logger.error(f"Failed to refresh suggestion popularity: {e}")
 
 # ------------------ Initialize Managers ------------------
-movie_data_manager = MovieDataManager()
-movie_trie_manager = MovieTrieManager()
-movie_graph = MovieGraph()
-search_history_manager = SearchHistoryManager()
+movie_data_manager = MovieDataManager(autoload=False)
+search_history_manager = SearchHistoryManager(
+    store=MongoHistoryStore(movie_data_manager.db["search_history"]) if movie_data_manager.collection is not None else None
+)
+atexit.register(search_history_manager.close)
 movie_priority_queue = MoviePriorityQueue()
+index_holder = IndexHolder(MovieIndex(), on_publish=lambda index: setattr(movie_data_manager, "catalog", index.catalog))
+response_cache = ResponseCache(lambda: index_holder.version, int(os.environ.get("RESPONSE_CACHE_SIZE", 4096)))
+movie_details_cache = MovieDetailsCache(movie_data_manager.collection)
+suggestion_ranker = SuggestionRanker(index_holder, POPULARITY_REFRESH_SECONDS, POPULARITY_HALF_LIFE_HOURS * 3600, HOT_PREFIXES)
+atexit.register(suggestion_ranker.close)
+poster_store = PosterStore(POSTER_DIR, POSTER_CACHE_DIR, workers=POSTER_WORKERS)
+metrics.gauge("index_version", "Number of index swaps since startup.", function=lambda: index_holder.version)
+metrics.gauge("movies_indexed", "Movies in the published index.", function=lambda: len(index_holder.current.get_movie_data()))
+metrics.gauge("response_cache_entries", "Entries in the response cache.", function=lambda: response_cache.stats()["entries"])
+metrics.gauge("response_cache_hit_rate", "Response cache hit rate since startup.",
+              function=lambda: response_cache.stats()["hit_rate"])
+metrics.gauge("movie_details_cache_entries", "Movies whose non-resident fields are cached.",
+              function=lambda: len(movie_details_cache))
+metrics.gauge("posters_available", "Movies with pre-rendered poster thumbnails.", function=lambda: len(poster_store))
+metrics.gauge("suggestion_popular_titles", "Titles whose pick counts are tracked exactly.",
+              function=lambda: len(suggestion_ranker.selections))
+
+def movie_details(index, movie_names):
+    """Full documents for the movies in `index`: resident fields plus the rest via `movie_details_cache`."""
+    movie_data = index.get_movie_data()
+    movies = {name: movie_data[name] for name in movie_names if name in movie_data}
+    movie_ids = {name: index.catalog.get_movie_id(name) for name in movies}
+    details = movie_details_cache.get_many([movie_id for movie_id in movie_ids.values() if movie_id is not None])
+    return {name: {**details.get(movie_ids[name], {}), **movie} for name, movie in movies.items()}
 
 # Initialize data
+def apply_movie_upsert(document):
+    if document.get("_id") is not None:
+        movie_details_cache.put(document["_id"], document)
+    with INDEX_UPDATE_SECONDS.time():
+        index_holder.update([("upsert", document)])
+
+def apply_movie_batch(documents):
+    """Apply many upserted documents with a single index swap; live sync will not apply them again."""
+    for document in documents:
+        movie_details_cache.put(document["_id"], document)
+    if movie_sync is not None:
+        movie_sync.mark_applied(documents)
+    with INDEX_UPDATE_SECONDS.time():
+        index_holder.update([("upsert", document) for document in documents])
+
+def apply_movie_delete(movie_id):
+    movie_details_cache.discard(movie_id)
+    with INDEX_UPDATE_SECONDS.time():
+        index_holder.update([("delete", movie_id)])
+
 def build_graph_and_tries():
     if not movie_data_manager.get_movie_data():
         logger.warning("No movie data to build graph and tries")
         return
     
-    for movie in movie_data_manager.get_movie_data().values():
-        movie_name = movie["Name"].lower()
-        movie_trie_manager.insert_movie(movie_name)
-        movie_graph.add_movie(movie_name)
-        actors = movie.get("Actors", [])
-        if isinstance(actors, str):
-            actors = [actor.strip().lower() for actor in actors.split(",")]
-        elif isinstance(actors, list):
-            actors = [actor.strip().lower() for actor in actors]
-        for actor in actors:
-            if actor:
-                movie_graph.add_actor(actor)
-                movie_graph.add_edge(actor, movie_name)
-                movie_trie_manager.insert_actor(actor)
-                movie_graph.all_actors.add(actor)
+    index = MovieIndex(movie_data_manager.catalog)
+    with INDEX_PHASE_SECONDS.time("build_graph_and_tries"):
+        index.build(INDEX_BUILD_WORKERS)
+        index_holder.publish(index)
+    logger.info(f"Rating index built with {len(index.rating_index)} rated movies")
+    logger.info(f"Graph built with {index.movie_graph.get_graph().number_of_nodes()} nodes and {index.movie_graph.get_graph().number_of_edges()} edges")
+
+def load_indexes():
+    """Restore the indexes from a snapshot matching the collection, or load and build them."""
+    if movie_data_manager.collection is None:
+        return
+    version = None
+    if SNAPSHOT_PATH:
+        try:
+            version = f"{INDEX_FORMAT}|{collection_version(movie_data_manager.collection)}"
+        except Exception as e:
+            logger.error(f"Failed to read collection version: {e}")
+    state = None
+    if version:
+        with INDEX_PHASE_SECONDS.time("snapshot_load"), gc_paused():
+            state = load_snapshot(SNAPSHOT_PATH, version)
+    if state is not None:
+        index_holder.publish(state["index"])
+        logger.info(f"Restored {len(movie_data_manager.get_movie_data())} movies from index snapshot")
+        return
+
+    movie_data_manager.load_movie_data()
+    build_graph_and_tries()
+    if version and movie_data_manager.get_movie_data():
+        try:
+            with INDEX_PHASE_SECONDS.time("snapshot_save"):
+                save_snapshot(SNAPSHOT_PATH, version, {"index": index_holder.current})
+        except Exception as e:
+            logger.error(f"Failed to save index snapshot: {e}")
 
-    logger.info(f"Graph built with {movie_graph.get_graph().number_of_nodes()} nodes and {movie_graph.get_graph().number_of_edges()} edges")
+# Read before loading, so writes made while the indexes load are still polled afterwards.
+sync_watermark = None
+if ENABLE_LIVE_SYNC and movie_data_manager.collection is not None:
+    sync_watermark = read_watermark(movie_data_manager.collection)
+load_indexes()
 
-build_graph_and_tries()
+movie_sync = None
+if ENABLE_LIVE_SYNC and movie_data_manager.collection is not None:
+    movie_sync = MovieIndexSync(movie_data_manager.collection, apply_movie_upsert, apply_movie_delete,
+                                known_ids=lambda: index_holder.current.catalog.known_ids(), watermark=sync_watermark)
+    movie_sync.start()
+index_holder.start(warm_standby=movie_sync is not None)
+atexit.register(index_holder.close)
+suggestion_ranker.start()
+poster_store.start()
 
 # ------------------ API Endpoints ------------------
+MAX_FUZZY_EDITS = 3
+MAX_FUZZY_RESULTS = 20  # Within the tries' top-K, so each matching subtree is answered from its cached list
+MAX_DEGREES = 10
+MAX_BATCH_ACTORS = 100
+MAX_NEIGHBORHOOD_HOPS = 4
+MAX_BROWSE_LIMIT = 100
+MAX_INGEST_BATCH = 10_000
+POSTER_MAX_AGE = 365 * 24 * 3600
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    if slow_request_profiler is not None:
+        slow_request_profiler.start_request()
+
+@app.after_request
+def record_request_metrics(response):
+    # Label by the route pattern, not the raw path, so /movie/<name> stays one series.
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    elapsed = time.perf_counter() - g.request_started
+    REQUEST_SECONDS.labels(route, request.method).observe(elapsed)
+    REQUESTS_TOTAL.labels(route, request.method, response.status_code).inc()
+    return response
+
+@app.teardown_request
+def finish_request_profile(error=None):
+    # Teardown runs even when a request fails, so no thread is left being sampled.
+    if slow_request_profiler is None:
+        return
+    elapsed = time.perf_counter() - g.request_started
+    if slow_request_profiler.finish_request(elapsed, f"{request.method} {request.full_path}") is not None:
+        SLOW_REQUESTS.labels(request.url_rule.rule if request.url_rule is not None else "unmatched").inc()
+
+def get_bool_arg(name, default=False):
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def get_max_edits_arg():
+    # More than a few edits matches nearly everything and defeats the pruning.
+    return min(max(request.args.get("max_edits", 2, type=int), 0), MAX_FUZZY_EDITS)
+
 @app.route("/top-rated", methods=["GET"])
 def get_top_rated_movies():
     try:
-        n = int(request.args.get("N", 10))
-        all_movies = list(movie_data_manager.get_movie_data().values())
-        
-        # Use the priority queue
-        temp_queue = MoviePriorityQueue()
-        
-        for movie in all_movies:
-            try:
-                if 'IMDb' in movie and movie['IMDb']:
-                    imdb_score = float(movie['IMDb'])
-                    name = movie.get('Name', 'Unknown Movie')
-                    # Use -imdb_score to make high scores come out first
-                    temp_queue.enqueue(-imdb_score, {
-                        'Name': name,
-                        'IMDb': imdb_score
-                    })
-            except (ValueError, TypeError):
-                continue
+        n = max(int(request.args.get("N", 10)), 0)
+        offset = max(int(request.args.get("offset", 0)), 0)
+        genre = (request.args.get("genre") or "").strip().lower() or None
+        min_year = request.args.get("min_year", type=int)
+        max_year = request.args.get("max_year", type=int)
+        min_votes = request.args.get("min_votes", type=int)
 
-        # Get top N by dequeuing
-        top_movies = []
-        for _ in range(min(n, len(temp_queue))):
-            top_movies.append(temp_queue.dequeue())
+        def compute():
+            with index_holder.read() as index:
+                return {"top_movies": index.rating_index.top(n, offset, genre, min_year, max_year, min_votes)}
 
-        return jsonify({"top_movies": top_movies})
+        entry = response_cache.fetch(("top-rated", n, offset, genre, min_year, max_year, min_votes), compute)
+        return response_cache.respond(entry)
     
     except Exception as e:
         logger.error(f"Top-rated endpoint error: {e}")
@@ -278,10 +2242,36 @@ def search_movies():
     try:
         prefix = request.args.get("prefix", "").lower()
         user_id = request.args.get("user_id", "default_user")
-        movies = movie_trie_manager.search_movies(prefix)
+        limit = request.args.get("limit", type=int)
+        if limit is not None:
+            limit = max(limit, 0)
+        rank = get_bool_arg("rank")
+        fuzzy = get_bool_arg("fuzzy")
+        words = get_bool_arg("words")
+        max_edits = get_max_edits_arg() if fuzzy else None
+        if fuzzy:
+            limit = MAX_FUZZY_RESULTS if limit is None else min(limit, MAX_FUZZY_RESULTS)
+
+        def compute():
+            with index_holder.read() as index:
+                if words:
+                    stats = {}
+                    movies = index.title_index.search(prefix, limit, stats=stats)
+                    TITLE_CANDIDATES.observe(stats.get("candidates_scanned", 0))
+                    return {"movies": movies}
+                if fuzzy:
+                    return {"movies": index.movie_trie_manager.fuzzy_search_movies(prefix, max_edits, limit)}
+                if rank:
+                    return {"movies": suggestion_ranker.suggest(index, prefix, limit)}
+                return {"movies": index.movie_trie_manager.search_movies(prefix, limit)}
+
+        suggestion_ranker.record_query(prefix)
+        popularity = suggestion_ranker.version if rank and not fuzzy and not words else None
+        entry = response_cache.fetch(("search", prefix, limit, rank, fuzzy, max_edits, words, popularity), compute)
+        movies = entry.payload["movies"]
         if movies and len(prefix) > 2:
             search_history_manager.save_search(user_id, movies[0])
-        return jsonify({"movies": movies})
+        return response_cache.respond(entry)
     except Exception as e:
         logger.error(f"Search endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
@@ -291,12 +2281,104 @@ def get_movie_details(movie_name):
     try:
         user_id = request.args.get("user_id", "default_user")
         search_history_manager.save_search(user_id, movie_name)
-        movie = movie_data_manager.get_movie_data().get(movie_name.lower(), {"error": "Movie not found"})
-        return jsonify(movie)
+
+        def compute():
+            with index_holder.read() as index:
+                return movie_details(index, [movie_name.lower()]).get(movie_name.lower(), {"error": "Movie not found"})
+
+        entry = response_cache.fetch(("movie", movie_name.lower()), compute)
+        if "error" not in entry.payload:
+            suggestion_ranker.record_selection(movie_name)
+        return response_cache.respond(entry)
     except Exception as e:
         logger.error(f"Movie details endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route("/poster/<string:movie_name>", methods=["GET"])
+def movie_poster(movie_name):
+    """Redirect to the pre-rendered thumbnail of a movie's poster (`size`: thumb, card or large)."""
+    try:
+        size = request.args.get("size", "card")
+        if size not in poster_store.sizes:
+            return jsonify({"error": f"'size' must be one of {', '.join(poster_store.sizes)}"}), 400
+        digest = poster_store.digest(movie_name, size)
+        if digest is None:
+            return jsonify({"error": "Poster not found"}), 404
+        response = redirect(url_for("poster_file", digest=digest))
+        # Replacing a poster changes where its name points, so only this hop has a short lifetime.
+        response.cache_control.max_age = 300
+        return response
+    except Exception as e:
+        logger.error(f"Poster endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/posters/<string:digest>.jpg", methods=["GET"])
+def poster_file(digest):
+    """A thumbnail by content hash: immutable, so cacheable for a year; supports If-None-Match and Range."""
+    try:
+        path = poster_store.path(digest)
+        if path is None:
+            return jsonify({"error": "Poster not found"}), 404
+        response = send_from_directory(os.path.dirname(path), os.path.basename(path), mimetype="image/jpeg",
+                                       etag=digest, max_age=POSTER_MAX_AGE, conditional=True)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+    except Exception as e:
+        logger.error(f"Poster file endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/recommend/<string:movie_name>", methods=["GET"])
+def recommend_movies(movie_name):
+    try:
+        limit = min(max(request.args.get("limit", 10, type=int), 0), MAX_RECOMMENDATIONS)
+        name = movie_name.lower()
+
+        def compute():
+            with index_holder.read() as index:
+                if name not in index.get_movie_data():
+                    return {"error": "Movie not found"}
+                return {"movie": index.catalog.get_canonical_name(name), "recommendations": index.recommend(name, limit)}
+
+        return response_cache.respond(response_cache.fetch(("recommend", name, limit), compute))
+    except Exception as e:
+        logger.error(f"Recommend endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/browse", methods=["GET"])
+def browse_movies():
+    """Faceted browse: `genre` and `director` (repeatable or comma-separated), `min_year`, `max_year`,
+    `min_rating`, `max_rating`, `sort` (rating, year or votes), `offset` and `limit`.
+    """
+    try:
+        def values(name):
+            items = [item.strip().lower() for value in request.args.getlist(name) for item in value.split(",")]
+            return tuple(sorted({item for item in items if item}))
+
+        filters = {
+            "genres": values("genre"),
+            "directors": values("director"),
+            "min_year": request.args.get("min_year", type=int),
+            "max_year": request.args.get("max_year", type=int),
+            "min_rating": request.args.get("min_rating", type=float),
+            "max_rating": request.args.get("max_rating", type=float),
+        }
+        sort = request.args.get("sort", "rating").strip().lower()
+        if sort not in FacetIndex.SORTS:
+            return jsonify({"error": f"'sort' must be one of {', '.join(FacetIndex.SORTS)}"}), 400
+        offset = max(request.args.get("offset", 0, type=int), 0)
+        limit = min(max(request.args.get("limit", 20, type=int), 0), MAX_BROWSE_LIMIT)
+
+        def compute():
+            with index_holder.read() as index:
+                return index.browse(sort, offset, limit, **filters)
+
+        key = ("browse", sort, offset, limit, *filters.values())
+        return response_cache.respond(response_cache.fetch(key, compute))
+    except Exception as e:
+        logger.error(f"Browse endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
 @app.route("/movies-by-actor", methods=["GET"])
 def movies_by_actor():
     try:
@@ -305,20 +2387,17 @@ def movies_by_actor():
         if not prefix:
             return jsonify({"actors": [], "movies": [], "message": "Please provide an actor prefix"})
         
-        matching_actors = movie_trie_manager.search_actors(prefix)
-        if not matching_actors:
-            return jsonify({"actors": [], "movies": [], "message": "No actors found"})
+        with index_holder.read() as index:
+            if get_bool_arg("fuzzy"):
+                matching_actors = index.movie_trie_manager.fuzzy_search_actors(prefix, get_max_edits_arg(), MAX_FUZZY_RESULTS)
+            else:
+                matching_actors = index.movie_trie_manager.search_actors(prefix)
+            if not matching_actors:
+                return jsonify({"actors": [], "movies": [], "message": "No actors found"})
 
-        selected_actor = prefix if prefix in movie_graph.all_actors else matching_actors[0]
-        movies = movie_graph.get_movies_by_actor(selected_actor)
-        
-        # Convert movie names to original case from the database
-        original_case_movies = []
-        for movie_lower in movies:
-            for movie_name in movie_data_manager.get_movie_data().keys():
-                if movie_name.lower() == movie_lower:
-                    original_case_movies.append(movie_name)
-                    break
+            selected_actor = prefix if prefix in index.movie_graph.all_actors else matching_actors[0]
+            movies = index.movie_graph.get_movies_by_actor(selected_actor)
+            original_case_movies = [index.catalog.get_canonical_name(movie) for movie in movies]
 
         return jsonify({
             "actors": matching_actors,
@@ -328,6 +2407,127 @@ def movies_by_actor():
         logger.error(f"Movies-by-actor endpoint error: {e}")
         return jsonify({"error": "Internal server error"}), 500
     
+@app.route("/movies-by-actors", methods=["GET", "POST"])
+def movies_by_actors():
+    """Full movie records for many actors in one round trip.
+
+    GET takes an actor `prefix` (plus optional `limit`, `fuzzy`); POST takes a JSON body
+    of the form {"actors": [...]}.
+    """
+    try:
+        limit = min(max(request.args.get("limit", 20, type=int), 0), MAX_BATCH_ACTORS)
+        with index_holder.read() as index:
+            if request.method == "POST":
+                body = request.get_json(silent=True) or {}
+                actors = body.get("actors", [])
+                if not isinstance(actors, list):
+                    return jsonify({"error": "'actors' must be a list"}), 400
+                actors = [actor.strip().lower() for actor in actors if isinstance(actor, str) and actor.strip()]
+                actors = list(dict.fromkeys(actors))[:MAX_BATCH_ACTORS]
+            else:
+                prefix = request.args.get("prefix", "").strip().lower()
+                if not prefix:
+                    return jsonify({"actors": [], "movies": {}, "message": "Please provide an actor prefix"})
+                if get_bool_arg("fuzzy"):
+                    actors = index.movie_trie_manager.fuzzy_search_actors(prefix, get_max_edits_arg(),
+                                                                          min(limit, MAX_FUZZY_RESULTS))
+                else:
+                    actors = index.movie_trie_manager.search_actors(prefix, limit, rank=True)
+                if prefix in index.movie_graph.all_actors and prefix not in actors:
+                    actors = [prefix] + actors[:max(limit - 1, 0)]
+
+            movies_by_actor = {actor: index.movie_graph.get_movies_by_actor(actor) for actor in actors}
+            details = movie_details(index, {movie for movies in movies_by_actor.values() for movie in movies})
+            movies = {
+                actor: [details[movie] for movie in actor_movies if movie in details]
+                for actor, actor_movies in movies_by_actor.items()
+            }
+        return jsonify({"actors": actors, "movies": movies})
+    except Exception as e:
+        logger.error(f"Movies-by-actors endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/actor-path", methods=["GET"])
+def actor_path():
+    try:
+        source = request.args.get("from", "").strip().lower()
+        target = request.args.get("to", "").strip().lower()
+        max_degrees = min(max(request.args.get("max_degrees", 6, type=int), 1), MAX_DEGREES)
+        if not source or not target:
+            return jsonify({"error": "Please provide both 'from' and 'to' actors"}), 400
+        with index_holder.read() as index:
+            path = index.movie_graph.shortest_actor_path(source, target, max_degrees)
+        if path is None:
+            return jsonify({"path": [], "degrees": None, "message": "No connection found"})
+        return jsonify({"path": path, "degrees": (len(path) - 1) // 2})
+    except Exception as e:
+        logger.error(f"Actor-path endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/co-stars", methods=["GET"])
+def co_stars():
+    try:
+        actor = request.args.get("actor", "").strip().lower()
+        limit = max(request.args.get("limit", 20, type=int), 0)
+        with index_holder.read() as index:
+            stars = index.movie_graph.get_co_stars(actor, limit)
+        return jsonify({"actor": actor, "co_stars": [{"name": name, "shared_movies": count} for name, count in stars]})
+    except Exception as e:
+        logger.error(f"Co-stars endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/neighborhood", methods=["GET"])
+def neighborhood():
+    try:
+        name = request.args.get("name", "").strip().lower()
+        hops = min(max(request.args.get("k", 2, type=int), 1), MAX_NEIGHBORHOOD_HOPS)
+        limit = max(request.args.get("limit", 100, type=int), 0)
+        with index_holder.read() as index:
+            nodes = index.movie_graph.get_neighborhood(name, hops, limit)
+        return jsonify({"name": name, "nodes": [
+            {"name": node, "type": "actor" if is_actor else "movie", "distance": distance}
+            for node, is_actor, distance in nodes
+        ]})
+    except Exception as e:
+        logger.error(f"Neighborhood endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/ingest", methods=["POST"])
+def ingest_movies():
+    """Bulk-load movies from an NDJSON or CSV request body (`format`, or a text/csv content type).
+
+    The body is read as a stream and written in ordered batches of `batch_size` upserts;
+    the indexes are updated once per batch, so new movies are searchable while the
+    upload is still running.
+    """
+    try:
+        if INGEST_TOKEN and request.headers.get("Authorization") != f"Bearer {INGEST_TOKEN}":
+            return jsonify({"error": "Unauthorized"}), 401
+        if movie_data_manager.collection is None:
+            return jsonify({"error": "Database unavailable"}), 503
+        format = request.args.get("format") or ("csv" if request.mimetype == "text/csv" else "ndjson")
+        if format not in INGEST_FORMATS:
+            return jsonify({"error": f"'format' must be one of {', '.join(INGEST_FORMATS)}"}), 400
+        batch_size = min(max(request.args.get("batch_size", 1000, type=int), 1), MAX_INGEST_BATCH)
+
+        ingestor = MovieIngestor(movie_data_manager.collection, on_batch=apply_movie_batch, batch_size=batch_size)
+        stream = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+        report = ingestor.ingest(read_records(stream, format))
+        logger.info(f"Ingested {report['inserted']} new and {report['updated']} updated movies "
+                    f"({report['invalid']} invalid rows)")
+        return jsonify(report), 500 if "failed" in report else 200
+    except Exception as e:
+        logger.error(f"Ingest endpoint error: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+@app.route("/cache-stats", methods=["GET"])
+def cache_stats():
+    return jsonify(response_cache.stats())
+
 @app.route("/history", methods=["GET"])
 def search_history_endpoint():
     try:
@@ -342,4 +2542,19 @@ def search_history_endpoint():
 
 # ------------------ Run App ------------------
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000, debug=True)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Movie search backend")
+    parser.add_argument("--production", action="store_true",
+                        help="serve with the multi-threaded waitress server instead of the Flask dev server")
+    parser.add_argument("--threads", type=int, default=16, help="worker threads in production mode")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if args.production:
+        from waitress import serve
+
+        # Readers pin an index copy without locking, so request threads scale with cores and I/O.
+        serve(app, host="0.0.0.0", port=args.port, threads=args.threads)
+    else:
+        app.run(host="0.0.0.0", port=args.port, debug=True)
@@ -0,0 +1,56 @@
+"""Memory and lookup-latency comparison between `Trie` and `RadixTrie`.
+
+Usage: python benchmarks/compare_tries.py [number_of_names]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.standin import import_backend  # noqa: E402
+from benchmarks.synthetic import actor_names  # noqa: E402
+
+# Importing the backend connects to MongoDB, so hand it an empty in-memory stand-in.
+backend, _ = import_backend()
+Trie, RadixTrie = backend.Trie, backend.RadixTrie
+
+
+def measure(trie_class, names, prefixes):
+    tracemalloc.start()
+    start = time.perf_counter()
+    trie = trie_class()
+    for rank, name in enumerate(names):
+        trie.insert(name, rank=(rank % 100,))
+    build_seconds = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for prefix in prefixes:
+        trie.search(prefix, limit=10, rank=True)
+    ranked_us = (time.perf_counter() - start) / len(prefixes) * 1e6
+
+    start = time.perf_counter()
+    for prefix in prefixes:
+        trie.search(prefix)
+    full_us = (time.perf_counter() - start) / len(prefixes) * 1e6
+    return build_seconds, memory, ranked_us, full_us
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    names = actor_names(count)
+    rnd = random.Random(7)
+    prefixes = [name[:rnd.randint(3, 8)] for name in rnd.sample(names, 1000)]
+    print(f"{count} names, {len(prefixes)} lookups")
+    print(f"{'backend':<10} {'build (s)':>10} {'memory (MB)':>12} {'ranked (us)':>12} {'full (us)':>10}")
+    for trie_class in (Trie, RadixTrie):
+        build_seconds, memory, ranked_us, full_us = measure(trie_class, names, prefixes)
+        print(f"{trie_class.__name__:<10} {build_seconds:>10.2f} {memory / 2**20:>12.1f} {ranked_us:>12.1f} {full_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
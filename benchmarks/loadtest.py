@@ -0,0 +1,379 @@
+"""Load test: replay an autocomplete query mix against a live backend and gate on latency thresholds.
+
+Usage:
+    python benchmarks/loadtest.py --movies 20000 --concurrency 16
+    python benchmarks/loadtest.py --record benchmarks/mix.ndjson          # save the synthetic mix
+    python benchmarks/loadtest.py --log benchmarks/mix.ndjson             # replay a recorded one
+    python benchmarks/loadtest.py --save-thresholds benchmarks/loadtest_thresholds.json
+    python benchmarks/loadtest.py --url http://localhost:8000 --log access.ndjson
+
+Unless `--url` is given, the backend is started in a subprocess on a synthetic catalog in
+the in-memory MongoDB stand-in, served by waitress (or Werkzeug's threaded server when
+waitress is missing), so client and server do not share an interpreter lock. Non-resident
+movie fields are looked up by `_id` in a dict, as MongoDB would through its `_id` index,
+instead of by mongomock's full scan.
+
+The mix is a list of sessions replayed by `--concurrency` client threads over keep-alive
+connections. A session is one user typing a title letter by letter into `/search` and then
+opening it with `/movie/<name>`, typing an actor name into `/movies-by-actor`, or loading
+`/top-rated` or `/history`. A recorded log has one JSON object per line,
+{"session": ..., "path": "/search", "params": {...}}, and the lines of one session are
+replayed in order.
+
+Throughput and p50/p95/p99 latency are reported per route. `--repeat` replays the mix
+several times; each route is then gated on its median percentile across the runs. With a
+thresholds file (by default `benchmarks/loadtest_thresholds.json`, when present), the exit
+status is 1 if any route's percentile exceeds its threshold or the error rate exceeds
+`--max-error-rate`. `--save-thresholds` records each route's worst percentile across the
+runs times `--headroom`, so every route gets a limit from its own spread.
+"""
+import argparse
+import json
+import os
+import platform
+import queue
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.run import RESULTS_DIR, current_commit, percentile  # noqa: E402
+from benchmarks.synthetic import generate_movies  # noqa: E402
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest_thresholds.json")
+GATED_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+# Paths with a name in them are reported under their route pattern
+ROUTE_PATTERNS = (("/movie/", "/movie/<name>"), ("/recommend/", "/recommend/<name>"), ("/poster/", "/poster/<name>"))
+
+
+def route_of(path):
+    for start, pattern in ROUTE_PATTERNS:
+        if path.startswith(start):
+            return pattern
+    return path
+
+# ------------------ Query Mix ------------------
+
+
+def synthetic_sessions(movies, count, seed):
+    """`count` sessions of typing traffic; popular titles and actors come up far more often."""
+    rnd = random.Random(seed)
+    names = [movie["Name"] for movie in movies]
+    actors = sorted({actor.strip() for movie in movies
+                     for actor in (movie["Actors"].split(",") if isinstance(movie["Actors"], str) else movie["Actors"])})
+    users = [f"user{number}" for number in range(max(count // 10, 1))]
+
+    def popular(items):
+        # Pareto-distributed picks, so a few hundred items draw most of the traffic
+        return items[min(int(rnd.paretovariate(1.2)) - 1, len(items) - 1)]
+
+    rnd.shuffle(names)
+    rnd.shuffle(actors)
+    sessions = []
+    for _ in range(count):
+        user = rnd.choice(users)
+        kind = rnd.random()
+        requests = []
+        if kind < 0.7:
+            title = popular(names)
+            for length in range(1, min(len(title), rnd.randint(3, 10)) + 1):
+                requests.append(("/search", {"prefix": title[:length].lower(), "rank": "true", "limit": 20,
+                                             "user_id": user}))
+            requests.append((f"/movie/{quote(title, safe='')}", {"user_id": user}))
+        elif kind < 0.85:
+            actor = popular(actors)
+            for length in range(3, min(len(actor), rnd.randint(4, 10)) + 1):
+                requests.append(("/movies-by-actor", {"prefix": actor[:length], "user_id": user}))
+        elif kind < 0.95:
+            requests.append(("/top-rated", {"N": rnd.choice([10, 20, 50]), "offset": rnd.choice([0, 0, 10, 20])}))
+        else:
+            requests.append(("/history", {"user_id": user}))
+        sessions.append(requests)
+    return sessions
+
+
+def read_log(path):
+    sessions = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                sessions.setdefault(entry.get("session"), []).append((entry["path"], entry.get("params", {})))
+    return list(sessions.values())
+
+
+def write_log(path, sessions):
+    with open(path, "w") as f:
+        for number, requests in enumerate(sessions):
+            for request_path, params in requests:
+                f.write(json.dumps({"session": number, "path": request_path, "params": params}) + "\n")
+
+# ------------------ Backend Under Test ------------------
+
+
+def serve(args):
+    """Subprocess entry point: import the backend on the synthetic catalog and serve it until killed."""
+    from benchmarks.standin import IdLookupCollection, import_backend
+
+    backend, client = import_backend(generate_movies(args.movies, args.seed))
+    backend.movie_details_cache.collection = IdLookupCollection(client["Movie_Information"]["movies"])
+    if args.no_response_cache:
+        backend.response_cache.max_entries = 0
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        from werkzeug.serving import make_server
+
+        make_server("127.0.0.1", args.port, backend.app, threaded=True).serve_forever()
+    else:
+        waitress_serve(backend.app, host="127.0.0.1", port=args.port, threads=args.threads, _quiet=True)
+
+
+def start_backend(args):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    command = [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(port), "--movies", str(args.movies),
+               "--seed", str(args.seed), "--threads", str(args.threads)]
+    if args.no_response_cache:
+        command.append("--no-response-cache")
+    process = subprocess.Popen(command)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + args.startup_timeout
+    import requests
+
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"backend exited with status {process.returncode} during startup")
+        try:
+            requests.get(f"{url}/cache-stats", timeout=1).raise_for_status()
+            return process, url
+        except requests.RequestException:
+            time.sleep(0.5)
+    process.kill()
+    raise RuntimeError(f"backend did not start within {args.startup_timeout:.0f}s")
+
+# ------------------ Replay ------------------
+
+
+def replay(url, sessions, concurrency, think_time=0.0):
+    """Replay every session once on `concurrency` threads; return (wall seconds, route -> [(latency, status)])."""
+    import requests
+
+    from api_client import make_http_session
+
+    work = queue.SimpleQueue()
+    for requests_of_session in sessions:
+        work.put(requests_of_session)
+    samples = {}
+    lock = threading.Lock()
+
+    def client():
+        session = make_http_session(pool_size=1)
+        local = {}
+        while True:
+            try:
+                requests_of_session = work.get_nowait()
+            except queue.Empty:
+                break
+            for request_path, params in requests_of_session:
+                start = time.perf_counter()
+                try:
+                    status = session.get(f"{url}{request_path}", params=params, timeout=30).status_code
+                except requests.RequestException:
+                    status = None
+                local.setdefault(route_of(request_path), []).append((time.perf_counter() - start, status))
+                if think_time:
+                    time.sleep(think_time)
+        with lock:
+            for route, route_samples in local.items():
+                samples.setdefault(route, []).extend(route_samples)
+
+    threads = [threading.Thread(target=client, name=f"load-client-{number}") for number in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, samples
+
+
+def summarize(seconds, samples):
+    routes = {}
+    for route, route_samples in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in route_samples)
+        errors = sum(1 for _, status in route_samples if status is None or status >= 500)
+        routes[route] = {
+            "requests": len(route_samples),
+            "errors": errors,
+            "throughput_rps": len(route_samples) / seconds,
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+        }
+    total = sum(route["requests"] for route in routes.values())
+    errors = sum(route["errors"] for route in routes.values())
+    return {"seconds": seconds, "requests": total, "errors": errors, "throughput_rps": total / seconds, "routes": routes}
+
+
+def print_summary(summary):
+    print(f"\n{'route':<20} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, result in summary["routes"].items():
+        print(f"{route:<20} {result['requests']:>9} {result['errors']:>7} {result['throughput_rps']:>9.1f} "
+              f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}")
+    print(f"{'total':<20} {summary['requests']:>9} {summary['errors']:>7} {summary['throughput_rps']:>9.1f}"
+          f"   in {summary['seconds']:.1f}s")
+
+# ------------------ Thresholds ------------------
+
+
+def check_thresholds(summary, thresholds, setup):
+    """Print each gated percentile against its threshold; return the ones exceeded."""
+    recorded = thresholds.get("meta", {}).get("setup")
+    if recorded and recorded != setup:
+        print(f"\nWarning: thresholds were recorded for {recorded}, this run is {setup}")
+    regressions = []
+    print(f"\n{'route':<20} {'metric':<8} {'threshold':>10} {'current':>10}")
+    for route, limits in thresholds.get("routes", {}).items():
+        result = summary["routes"].get(route)
+        if result is None:
+            continue
+        for metric in GATED_METRICS:
+            if metric not in limits:
+                continue
+            flag = " !" if result[metric] > limits[metric] else ""
+            if flag:
+                regressions.append((route, metric, result[metric], limits[metric]))
+            print(f"{route:<20} {metric:<8} {limits[metric]:>10.2f} {result[metric]:>10.2f}{flag}")
+    return regressions
+
+
+def combine(summaries, reduce):
+    """Totals over every run, with each route's gated percentiles `reduce`d over the runs that saw it."""
+    seconds = sum(summary["seconds"] for summary in summaries)
+    routes = {}
+    for summary in summaries:
+        for route, result in summary["routes"].items():
+            routes.setdefault(route, []).append(result)
+    combined = {}
+    for route, results in sorted(routes.items()):
+        requests = sum(result["requests"] for result in results)
+        combined[route] = {
+            "requests": requests,
+            "errors": sum(result["errors"] for result in results),
+            "throughput_rps": requests / seconds,
+            "mean_ms": sum(result["mean_ms"] * result["requests"] for result in results) / requests,
+            **{metric: reduce([result[metric] for result in results]) for metric in GATED_METRICS},
+        }
+    total = sum(summary["requests"] for summary in summaries)
+    return {"seconds": seconds, "requests": total, "errors": sum(summary["errors"] for summary in summaries),
+            "throughput_rps": total / seconds, "routes": combined}
+
+
+def make_thresholds(summaries, setup, headroom):
+    """Each route's worst percentile across `summaries`, times `headroom`."""
+    worst = combine(summaries, max)
+    return {
+        "meta": {"setup": setup, "headroom": headroom, "runs": len(summaries), "commit": current_commit(),
+                 "platform": platform.platform(), "date": datetime.now(timezone.utc).isoformat()},
+        "routes": {route: {metric: round(result[metric] * headroom, 2) for metric in GATED_METRICS}
+                   for route, result in worst["routes"].items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="load an already running backend instead of starting one")
+    parser.add_argument("--movies", type=int, default=10_000, help="synthetic catalog size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sessions", type=int, default=1000, help="synthetic sessions to replay")
+    parser.add_argument("--log", help="NDJSON query log to replay instead of the synthetic mix")
+    parser.add_argument("--record", help="write the query mix to this NDJSON file")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between a session's requests")
+    parser.add_argument("--warmup", type=int, default=100, help="sessions replayed before measuring")
+    parser.add_argument("--repeat", type=int, default=1, help="measured replays of the mix")
+    parser.add_argument("--threads", type=int, default=16, help="server threads when starting the backend")
+    parser.add_argument("--no-response-cache", action="store_true", help="turn the backend's response cache off")
+    parser.add_argument("--startup-timeout", type=float, default=600.0)
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS, help="latency thresholds to gate on")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="allowed share of failed or 5xx requests")
+    parser.add_argument("--save-thresholds", help="write each route's worst percentiles times --headroom as thresholds")
+    parser.add_argument("--headroom", type=float, default=1.5)
+    parser.add_argument("--out", help="results file (default: benchmarks/results/loadtest-<commit>-<movies>.json)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args)
+        return
+
+    sessions = read_log(args.log) if args.log else synthetic_sessions(list(generate_movies(args.movies, args.seed)),
+                                                                      args.sessions, args.seed)
+    if args.record:
+        write_log(args.record, sessions)
+    setup = {"movies": args.movies, "mix": os.path.basename(args.log) if args.log else f"synthetic:{args.sessions}",
+             "concurrency": args.concurrency, "response_cache": not args.no_response_cache}
+
+    process = None
+    try:
+        if args.url:
+            url = args.url.rstrip("/")
+        else:
+            print(f"Starting backend on {args.movies} synthetic movies (seed {args.seed})")
+            process, url = start_backend(args)
+        if args.warmup:
+            replay(url, random.Random(args.seed).sample(sessions, min(args.warmup, len(sessions))), args.concurrency)
+        summaries = []
+        for run in range(1, args.repeat + 1):
+            print(f"Replaying {len(sessions)} sessions on {args.concurrency} clients against {url}"
+                  f" (run {run} of {args.repeat})")
+            summaries.append(summarize(*replay(url, sessions, args.concurrency, args.think_ms / 1000)))
+            print_summary(summaries[-1])
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    summary = combine(summaries, statistics.median)
+    if len(summaries) > 1:
+        print("\nMedian of the runs:")
+        print_summary(summary)
+    out = args.out or os.path.join(RESULTS_DIR, f"loadtest-{current_commit()}-{args.movies}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"meta": {**setup, "commit": current_commit(), "date": datetime.now(timezone.utc).isoformat(),
+                            "python": platform.python_version(), "platform": platform.platform()},
+                   "results": summary, "runs": summaries}, f, indent=2)
+    print(f"\nSaved results to {out}")
+
+    if args.save_thresholds:
+        with open(args.save_thresholds, "w") as f:
+            json.dump(make_thresholds(summaries, setup, args.headroom), f, indent=2)
+        print(f"Saved thresholds to {args.save_thresholds}")
+
+    failed = False
+    error_rate = summary["errors"] / summary["requests"] if summary["requests"] else 0.0
+    if error_rate > args.max_error_rate:
+        print(f"\n{summary['errors']} of {summary['requests']} requests failed ({error_rate:.1%})")
+        failed = True
+    if args.thresholds and not args.save_thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            regressions = check_thresholds(summary, json.load(f), setup)
+        if regressions:
+            print(f"\n{len(regressions)} latency percentile(s) exceeded their thresholds")
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
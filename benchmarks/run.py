@@ -0,0 +1,243 @@
+"""Benchmark suite: tries, index build, graph lookups and every Flask route on a synthetic catalog.
+
+Usage:
+    python benchmarks/run.py --movies 100000
+    python benchmarks/run.py --movies 100000 --baseline benchmarks/results/<commit>-100000.json
+
+Each case reports wall time, per-call latency percentiles where it makes sense, peak
+traced memory and net allocated blocks. Results go to `benchmarks/results/` as JSON
+named after the current commit. With `--baseline`, every shared metric is compared
+and the exit status is 1 if any slowed down or grew by more than `--threshold`.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.standin import ROOT, import_backend  # noqa: E402
+from benchmarks.synthetic import generate_movies  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+COMPARED_METRICS = ("seconds", "p50_us", "p95_us", "peak_mb")
+MEASURE_MEMORY = True
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def run_case(name, workload):
+    """Time `workload()` (which returns per-call latencies or None), then re-run it under tracemalloc."""
+    gc.collect()
+    start = time.perf_counter()
+    latencies, _ = workload()
+    result = {"seconds": time.perf_counter() - start}
+    if latencies:
+        latencies = sorted(latencies)
+        result.update({
+            "calls": len(latencies),
+            "mean_us": sum(latencies) / len(latencies) * 1e6,
+            "p50_us": percentile(latencies, 0.50) * 1e6,
+            "p95_us": percentile(latencies, 0.95) * 1e6,
+            "p99_us": percentile(latencies, 0.99) * 1e6,
+        })
+    if MEASURE_MEMORY:
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        _, keep_alive = workload()
+        result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        result["allocated_blocks"] = sys.getallocatedblocks() - blocks_before
+        del keep_alive
+    print(f"  {name:<32} {result['seconds']:>9.3f}s"
+          + (f"  p50 {result['p50_us']:>9.1f}us  p95 {result['p95_us']:>9.1f}us" if "p50_us" in result else "")
+          + (f"  peak {result['peak_mb']:>8.1f}MB" if "peak_mb" in result else ""))
+    return result
+
+
+def timed_calls(function, arguments):
+    latencies = []
+    for argument in arguments:
+        start = time.perf_counter()
+        function(argument)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def trie_cases(backend, movies, rnd, calls):
+    names = [movie["Name"].lower() for movie in movies]
+    ranks = [backend.movie_rank(movie) for movie in movies]
+    prefixes = [name[:rnd.randint(1, 6)] for name in rnd.choices(names, k=calls)]
+    results = {}
+    for trie_class in (backend.Trie, backend.RadixTrie):
+        label = trie_class.__name__
+
+        def insert_all():
+            trie = trie_class()
+            return timed_calls(lambda item: trie.insert(*item), zip(names, ranks)), trie
+
+        results[f"{label}.insert"] = run_case(f"{label}.insert", insert_all)
+        _, trie = insert_all()
+        results[f"{label}.search_ranked"] = run_case(
+            f"{label}.search(limit=20, rank)",
+            lambda: (timed_calls(lambda prefix: trie.search(prefix, 20, True), prefixes), None))
+        results[f"{label}.search_full"] = run_case(
+            f"{label}.search(full)",
+            lambda: (timed_calls(trie.search, prefixes[:max(calls // 10, 1)]), None))
+        results[f"{label}.fuzzy_search"] = run_case(
+            f"{label}.fuzzy_search(2 edits)",
+            lambda: (timed_calls(lambda prefix: trie.fuzzy_search(prefix + "x", 2, 20), prefixes[:max(calls // 10, 1)]), None))
+    return results
+
+
+def index_cases(backend, rnd, calls):
+    results = {"build_graph_and_tries": run_case("build_graph_and_tries", lambda: (None, backend.build_graph_and_tries()))}
+    with backend.index_holder.read() as index:
+        actors = rnd.choices(sorted(index.movie_graph.all_actors), k=calls)
+        results["MovieGraph.get_movies_by_actor"] = run_case(
+            "MovieGraph.get_movies_by_actor",
+            lambda: (timed_calls(index.movie_graph.get_movies_by_actor, actors), None))
+    return results
+
+
+def route_cases(backend, movies, rnd, calls):
+    client = backend.app.test_client()
+    names = [movie["Name"] for movie in movies]
+    with backend.index_holder.read() as index:
+        actors = sorted(index.movie_graph.all_actors)
+    genres = ["drama", "comedy", "sci-fi", "horror"]
+
+    def prefix():
+        return rnd.choice(names).lower()[:rnd.randint(1, 6)]
+
+    routes = {
+        "/search": lambda: ("/search", {"prefix": prefix()}),
+        "/search ranked": lambda: ("/search", {"prefix": prefix(), "limit": 20, "rank": "true"}),
+        "/search fuzzy": lambda: ("/search", {"prefix": prefix() + "x", "fuzzy": 1, "limit": 20}),
+        "/search words": lambda: ("/search", {"prefix": prefix(), "words": 1, "limit": 20}),
+        "/movie/<name>": lambda: (f"/movie/{quote(rnd.choice(names), safe='')}", {}),
+        "/recommend/<name>": lambda: (f"/recommend/{quote(rnd.choice(names), safe='')}", {}),
+        "/movies-by-actor": lambda: ("/movies-by-actor", {"prefix": rnd.choice(actors)[:rnd.randint(3, 10)]}),
+        "/movies-by-actors": lambda: ("/movies-by-actors", {"prefix": rnd.choice(actors)[:rnd.randint(3, 10)]}),
+        "/top-rated": lambda: ("/top-rated", {"N": rnd.randint(5, 50), "offset": rnd.randint(0, 100)}),
+        "/top-rated filtered": lambda: ("/top-rated", {"N": 10, "genre": rnd.choice(genres), "min_votes": 100,
+                                                        "min_year": rnd.randint(1950, 2000), "max_year": 2025}),
+        "/browse": lambda: ("/browse", {"genre": rnd.choice(genres), "min_year": rnd.randint(1950, 2010),
+                                        "min_rating": rnd.choice([5, 7, 8]), "offset": rnd.randint(0, 100)}),
+        "/actor-path": lambda: ("/actor-path", {"from": rnd.choice(actors), "to": rnd.choice(actors)}),
+        "/co-stars": lambda: ("/co-stars", {"actor": rnd.choice(actors)}),
+        "/neighborhood": lambda: ("/neighborhood", {"name": rnd.choice(actors), "k": 2}),
+        "/history": lambda: ("/history", {"user_id": f"user{rnd.randint(0, 100)}"}),
+    }
+    results = {}
+    for route, make_request in routes.items():
+        requests = [make_request() for _ in range(calls)]
+        results[f"route {route}"] = run_case(
+            f"GET {route}",
+            lambda: (timed_calls(lambda request: client.get(request[0], query_string=request[1]), requests), None))
+    return results
+
+
+def compare(baseline, current, threshold):
+    regressions = []
+    print(f"\n{'case':<36} {'metric':<10} {'baseline':>12} {'current':>12} {'change':>8}")
+    for case, metrics in current["results"].items():
+        base = baseline["results"].get(case)
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in metrics or not base.get(metric):
+                continue
+            change = metrics[metric] / base[metric] - 1
+            flag = " !" if change > threshold else ""
+            if flag:
+                regressions.append((case, metric, change))
+            print(f"{case:<36} {metric:<10} {base[metric]:>12.2f} {metrics[metric]:>12.2f} {change:>+7.1%}{flag}")
+    return regressions
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    global MEASURE_MEMORY
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=10_000, help="synthetic catalog size (10k to 5M)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--calls", type=int, default=2000, help="calls per lookup or route benchmark")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass (halves run time)")
+    parser.add_argument("--response-cache", action="store_true",
+                        help="leave the HTTP response cache on (off by default to measure computation)")
+    parser.add_argument("--only", choices=["tries", "index", "routes"], action="append",
+                        help="run only these groups (repeatable)")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/<commit>-<movies>.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    groups = args.only or ["tries", "index", "routes"]
+    print(f"Generating {args.movies} synthetic movies (seed {args.seed})")
+    movies = list(generate_movies(args.movies, args.seed))
+    backend, _ = import_backend(movies)
+    if not args.response_cache:
+        backend.response_cache.max_entries = 0
+    MEASURE_MEMORY = not args.no_memory
+
+    rnd = random.Random(args.seed)
+    results = {}
+    if "tries" in groups:
+        print("Tries")
+        results.update(trie_cases(backend, movies, rnd, args.calls))
+    if "index" in groups:
+        print("Index build and graph")
+        results.update(index_cases(backend, rnd, args.calls))
+    if "routes" in groups:
+        print("Flask routes")
+        results.update(route_cases(backend, movies, rnd, args.calls))
+
+    report = {
+        "meta": {
+            "commit": current_commit(),
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "movies": args.movies,
+            "seed": args.seed,
+            "calls": args.calls,
+        },
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{report['meta']['commit']}-{args.movies}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved results to {out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Imports backend.py against an in-memory MongoDB stand-in (mongomock)."""
+import logging
+import os
+import sys
+
+import mongomock
+import pymongo
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def import_backend(movies=(), batch_size=10_000):
+    """Seed a mongomock `movies` collection with `movies`, then import and return (backend, client)."""
+    # Benchmarks measure building from the collection, so skip snapshots and the sync thread.
+    os.environ.setdefault("MOVIE_SNAPSHOT_PATH", "")
+    os.environ.setdefault("MOVIE_LIVE_SYNC", "0")
+    client = mongomock.MongoClient()
+    collection = client["Movie_Information"]["movies"]
+    batch = []
+    for movie in movies:
+        batch.append(movie)
+        if len(batch) >= batch_size:
+            collection.insert_many(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch)
+
+    pymongo.MongoClient = lambda *args, **kwargs: client
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import backend
+
+    logging.getLogger().setLevel(logging.WARNING)
+    return backend, client
+
+
+class IdLookupCollection:
+    """A mongomock collection whose `{"_id": {"$in": [...]}}` finds are dict lookups, as with MongoDB's `_id` index.
+
+    mongomock scans and copies every document for each such query, which would dominate
+    the latency of routes that fetch non-resident fields. Other calls go to the
+    collection; writes made through it afterwards are not seen by the lookups.
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+        self._documents = {document["_id"]: document for document in collection.find()}
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def find(self, filter=None, projection=None, *args, **kwargs):
+        ids = (filter or {}).get("_id")
+        if len(filter or {}) != 1 or not isinstance(ids, dict) or list(ids) != ["$in"] or args or kwargs:
+            return self._collection.find(filter, projection, *args, **kwargs)
+        excluded = {field for field, keep in (projection or {}).items() if not keep}
+        included = {field for field, keep in (projection or {}).items() if keep} | {"_id"}
+        documents = (self._documents[movie_id] for movie_id in ids["$in"] if movie_id in self._documents)
+        return [{field: value for field, value in document.items()
+                 if field not in excluded and (len(included) == 1 or field in included)}
+                for document in documents]
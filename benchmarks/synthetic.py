@@ -0,0 +1,77 @@
+"""Deterministic synthetic movie catalogs for benchmarks.
+
+Titles draw words from a Zipf-like distribution, so a few prefixes ("the", "love")
+are very common, as in real catalogs. Actor popularity is heavily skewed: most actors
+have a handful of credits and a few have hundreds. The same `seed` and `count` always
+produce the same catalog.
+"""
+import random
+from itertools import accumulate
+
+FIRST = ["james", "mary", "robert", "patricia", "john", "jennifer", "michael", "linda", "david", "elizabeth",
+         "william", "barbara", "richard", "susan", "joseph", "jessica", "thomas", "sarah", "charles", "karen",
+         "daniel", "nancy", "matthew", "lisa", "anthony", "betty", "mark", "sandra", "donald", "ashley",
+         "priya", "rahul", "wei", "yuki", "carlos", "sofia", "ahmed", "fatima", "ivan", "olga"]
+SYLLABLES = ["an", "ber", "cor", "del", "en", "fa", "gar", "hol", "is", "jo", "ka", "lin", "mar",
+             "no", "or", "per", "qui", "ros", "san", "tor", "ul", "vel", "wen", "xa", "yor", "zan"]
+TITLE_WORDS = ["the", "of", "love", "night", "man", "last", "dark", "day", "life", "city", "house", "girl",
+               "king", "war", "story", "dead", "blood", "black", "world", "time", "star", "little", "lost",
+               "home", "dream", "fire", "secret", "american", "heart", "devil", "death", "christmas", "island",
+               "return", "great", "road", "red", "big", "summer", "shadow", "new", "wild", "lady", "game",
+               "street", "moon", "ghost", "kill", "brother", "angel", "river", "queen", "murder", "golden",
+               "blue", "witch", "legend", "dragon", "sky", "storm", "beyond", "silent", "hidden", "broken",
+               "iron", "empire", "knight", "rings", "lord", "inception", "interstellar", "matrix", "galaxy",
+               "ocean", "mountain", "desert", "winter", "spring", "autumn", "echo", "mirror", "garden",
+               "train", "wolf", "tiger", "eagle", "thunder", "silver", "crystal", "stone", "paper", "glass"]
+TITLE_WEIGHTS = list(accumulate(1 / (rank + 1) for rank in range(len(TITLE_WORDS))))
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Romance", "Horror", "Sci-Fi", "Crime", "Adventure",
+          "Animation", "Fantasy", "Documentary", "Mystery", "Family", "War", "Western", "Musical"]
+SEQUELS = ["2", "3", "II", "III", "Part II", "Returns", "Reloaded", "Origins", "Rising", "Forever"]
+
+
+def actor_names(count, seed=42):
+    """`count` distinct person names."""
+    rnd = random.Random(seed)
+    names = []
+    seen = set()
+    while len(names) < count:
+        surname = "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4)))
+        name = f"{rnd.choice(FIRST)} {surname}"
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def generate_movies(count, seed=42):
+    """Yield `count` movie documents shaped like the `movies` collection (without `_id`)."""
+    rnd = random.Random(seed)
+    actors = [name.title() for name in actor_names(max(1000, count // 2), seed + 1)]
+    directors = [name.title() for name in actor_names(max(100, count // 20), seed + 2)]
+    titles = set()
+    for number in range(count):
+        words = rnd.choices(TITLE_WORDS, cum_weights=TITLE_WEIGHTS, k=rnd.randint(1, 4))
+        title = " ".join(words).title()
+        if rnd.random() < 0.05:
+            title = f"{title} {rnd.choice(SEQUELS)}"
+        if title.lower() in titles:
+            title = f"{title} ({1920 + number % 105})"
+        if title.lower() in titles:
+            title = f"{title} #{number}"
+        titles.add(title.lower())
+
+        # Beta-distributed positions skew credits towards a small set of prolific actors.
+        cast = {actors[int(rnd.betavariate(0.4, 4) * len(actors))] for _ in range(rnd.randint(2, 8))}
+        cast = sorted(cast)
+        yield {
+            "Name": title,
+            "Year": rnd.randint(1920, 2025),
+            "Director": directors[int(rnd.betavariate(0.5, 3) * len(directors))],
+            "Genre": ", ".join(rnd.sample(GENRES, rnd.choice([1, 1, 2, 3]))),
+            "IMDb": round(min(max(rnd.gauss(6.4, 1.1), 1.0), 9.9), 1),
+            "Votes": int(rnd.lognormvariate(7, 2)),
+            # The real collection mixes both encodings of the cast.
+            "Actors": ", ".join(cast) if number % 2 else cast,
+            "Trailer_URL": f"https://youtu.be/trailer{number:08d}",
+            "Famous_Song": f"https://youtu.be/song{number:08d}",
+        }
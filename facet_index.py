@@ -0,0 +1,297 @@
+import numpy as np
+
+# ------------------ Bitmap Facet Index ------------------
+#
+# Movies are numbered by position. Every set of movies (a genre, "year <= 2010",
+# the query result) is a packed bitmap of uint64 words, so combining filters is a
+# handful of word-wise ANDs over n / 64 words. Positions are assigned in rank order
+# (best rating, then year, then name) when the index is built, so results sorted by
+# rating come straight out of the result bitmap.
+
+
+def _words(capacity):
+    return np.zeros((capacity + 63) // 64, dtype=np.uint64)
+
+
+def _set_bits(words, positions):
+    positions = np.asarray(positions, dtype=np.int64)
+    np.bitwise_or.at(words, positions >> 6, np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64)))
+
+
+def _count(words):
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+def _to_bools(words, size):
+    return np.unpackbits(words.view(np.uint8), count=size, bitorder="little").view(bool)
+
+
+class RangeBitmaps:
+    """Range-encoded bitmaps over one numeric column: row `i` holds every movie with value <= `values[i]`.
+
+    Any range filter is then one row ANDed with the complement of another, however many
+    distinct values the range spans.
+    """
+
+    def __init__(self, capacity):
+        self.values = np.empty(0)
+        self.rows = np.empty((0, len(_words(capacity))), dtype=np.uint64)
+
+    def build(self, column, capacity):
+        self.values, codes = np.unique(column, return_inverse=True)
+        self.rows = np.zeros((len(self.values), len(_words(capacity))), dtype=np.uint64)
+        for code in range(len(self.values)):
+            _set_bits(self.rows[code], np.flatnonzero(codes == code))
+        np.bitwise_or.accumulate(self.rows, axis=0, out=self.rows)
+
+    def add(self, position, value):
+        index = int(np.searchsorted(self.values, value))
+        if index == len(self.values) or self.values[index] != value:
+            below = self.rows[index - 1] if index else np.zeros(self.rows.shape[1], dtype=np.uint64)
+            self.values = np.insert(self.values, index, value)
+            self.rows = np.insert(self.rows, index, below, axis=0)
+        _set_bits(self.rows[index:].reshape(-1), position + np.arange(len(self.values) - index) * self.rows.shape[1] * 64)
+
+    def at_most(self, value):
+        index = int(np.searchsorted(self.values, value, side="right")) - 1
+        return self.rows[index] if index >= 0 else np.zeros(self.rows.shape[1], dtype=np.uint64)
+
+    def between(self, low=None, high=None, universe=None):
+        """Bitmap of movies with `low` <= value <= `high` (either bound may be None)."""
+        words = self.at_most(high) if high is not None else universe
+        if low is not None:
+            index = int(np.searchsorted(self.values, low, side="left")) - 1
+            if index >= 0:
+                words = words & ~self.rows[index]
+        return words
+
+    def grow(self, capacity):
+        extra = len(_words(capacity)) - self.rows.shape[1]
+        self.rows = np.pad(self.rows, ((0, 0), (0, extra)))
+
+
+class FacetIndex:
+    """Faceted browse over genre, year, director and rating, with facet counts and sorted pages.
+
+    Genres get one bitmap each. Year and rating are range-encoded (`RangeBitmaps`).
+    Directors are too many for a bitmap each, so they keep a sorted position list that
+    is only turned into a bitmap when filtered on. Movies added after `build()` are
+    appended past the rank-ordered range and removed ones are cleared from `live`; once
+    such changes pile up, `needs_rebuild()` asks for a fresh build.
+    """
+
+    SORTS = ("rating", "year", "votes")
+
+    def __init__(self):
+        self.build([])
+
+    def build(self, movies):
+        """`movies` yields (name, rating, year, votes, genres, director), in any order."""
+        movies = sorted(movies, key=lambda movie: (-movie[1], -movie[2], movie[0]))
+        size = len(movies)
+        self._capacity = max(size, 64)
+        self._size = size
+        self._ranked_count = size
+        self._removed = 0
+        self.names = [movie[0] for movie in movies]
+        self._positions = {name: position for position, name in enumerate(self.names)}
+        self.rating = np.zeros(self._capacity, dtype=np.float32)
+        self.year = np.zeros(self._capacity, dtype=np.int32)
+        self.votes = np.zeros(self._capacity, dtype=np.int64)
+        self.director = np.full(self._capacity, -1, dtype=np.int32)
+        self.rating[:size] = [movie[1] for movie in movies]
+        self.year[:size] = [movie[2] for movie in movies]
+        self.votes[:size] = [movie[3] for movie in movies]
+
+        self.live = _words(self._capacity)
+        _set_bits(self.live, np.arange(size))
+        genre_positions = {}
+        self.director_names = []
+        self._director_codes = {}
+        self._director_positions = []
+        for position, (_, _, _, _, genres, director) in enumerate(movies):
+            for genre in genres:
+                genre_positions.setdefault(genre, []).append(position)
+            if director:
+                self.director[position] = self._director_code(director)
+                self._director_positions[self.director[position]].append(position)
+        self.genres = {}
+        for genre, positions in genre_positions.items():
+            self.genres[genre] = _words(self._capacity)
+            _set_bits(self.genres[genre], positions)
+        self._director_positions = [np.array(positions, dtype=np.int64) for positions in self._director_positions]
+        self.years = RangeBitmaps(self._capacity)
+        self.years.build(self.year[:size], self._capacity)
+        self.ratings = RangeBitmaps(self._capacity)
+        self.ratings.build(self.rating[:size], self._capacity)
+        self._orders = {}
+
+    def add(self, name, rating, year, votes, genres, director):
+        self.remove(name)
+        self._make_writable()
+        if self._size == self._capacity:
+            self._grow()
+        position = self._size
+        self._size += 1
+        self.names.append(name)
+        self._positions[name] = position
+        self.rating[position], self.year[position], self.votes[position] = rating, year, votes
+        _set_bits(self.live, [position])
+        for genre in genres:
+            if genre not in self.genres:
+                self.genres[genre] = _words(self._capacity)
+            _set_bits(self.genres[genre], [position])
+        if director:
+            code = self.director[position] = self._director_code(director)
+            self._director_positions[code] = np.append(self._director_positions[code], position)
+        self.years.add(position, year)
+        self.ratings.add(position, np.float32(rating))
+        self._orders = {}
+
+    def remove(self, name):
+        position = self._positions.pop(name, None)
+        if position is None:
+            return
+        self._make_writable()
+        self.live[position >> 6] &= ~(np.uint64(1) << np.uint64(position & 63))
+        self._removed += 1
+
+    def needs_rebuild(self):
+        return self._size - self._ranked_count + self._removed > max(1024, self._ranked_count // 8)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def query(self, genres=(), directors=(), min_year=None, max_year=None, min_rating=None, max_rating=None,
+              sort="rating", offset=0, limit=20, facet_limit=20):
+        """Filter, count and page. Values within one facet are ORed, facets are ANDed.
+
+        Each facet's counts apply every filter except its own, so they show what
+        choosing another value of that facet would return.
+        """
+        filters = {
+            "genre": self._union([self.genres.get(genre) for genre in genres]) if genres else None,
+            "director": self._directors_bitmap(directors) if directors else None,
+            "year": self.years.between(min_year, max_year, self.live)
+            if min_year is not None or max_year is not None else None,
+            "rating": self.ratings.between(None if min_rating is None else np.float32(min_rating),
+                                           None if max_rating is None else np.float32(max_rating), self.live)
+            if min_rating is not None or max_rating is not None else None,
+        }
+        matched = self._combine(filters.values())
+        selected = _to_bools(matched, self._size)
+        order = self._order(sort)
+        positions = np.flatnonzero(selected) if order is None else order[selected[order]]
+        page = positions[offset:offset + limit]
+        return {
+            "total": _count(matched),
+            "names": [self.names[position] for position in page.tolist()],
+            "facets": self._facets(filters, facet_limit),
+        }
+
+    def _facets(self, filters, limit):
+        def without(facet):
+            return self._combine(value for name, value in filters.items() if name != facet)
+
+        genre_base = without("genre")
+        genres = {genre: _count(genre_base & words) for genre, words in self.genres.items()}
+        years = self._histogram(self.year, without("year"), missing=0)
+        ratings = self._histogram(np.floor(self.rating).astype(np.int32), without("rating"))
+        directors = self._histogram(self.director, without("director"), missing=-1, limit=limit)
+        return {
+            "genre": dict(sorted(((genre, count) for genre, count in genres.items() if count),
+                                 key=lambda item: (-item[1], item[0]))[:limit]),
+            "year": {str(year): count for year, count in sorted(years.items())},
+            "rating": {str(rating): count for rating, count in sorted(ratings.items())},
+            "director": {self.director_names[code]: count for code, count in directors.items()},
+        }
+
+    def _histogram(self, column, words, missing=None, limit=None):
+        """Counts of each value of `column` among the movies in `words`, most common `limit` only if given."""
+        values = column[:self._size][_to_bools(words, self._size)]
+        if missing is not None:
+            values = values[values != missing]
+        if not len(values):
+            return {}
+        low = int(values.min())
+        counts = np.bincount(values - low)
+        values = np.flatnonzero(counts)
+        counts = counts[values]
+        values += low
+        if limit is not None and len(values) > limit:
+            top = np.lexsort((values, -counts))[:limit]
+            values, counts = values[top], counts[top]
+        return dict(zip(values.tolist(), counts.tolist()))
+
+    def _combine(self, bitmaps):
+        words = self.live
+        for bitmap in bitmaps:
+            if bitmap is not None:
+                words = words & bitmap
+        return words
+
+    def _union(self, bitmaps):
+        words = _words(self._capacity)
+        for bitmap in bitmaps:
+            if bitmap is not None:
+                words |= bitmap
+        return words
+
+    def _directors_bitmap(self, directors):
+        words = _words(self._capacity)
+        for director in directors:
+            code = self._director_codes.get(director.lower())
+            if code is not None:
+                _set_bits(words, self._director_positions[code])
+        return words
+
+    def _director_code(self, director):
+        code = self._director_codes.get(director.lower())
+        if code is None:
+            code = self._director_codes[director.lower()] = len(self.director_names)
+            self.director_names.append(director)
+            self._director_positions.append([])
+        return code
+
+    def _order(self, sort):
+        """Positions in `sort` order, or None when position order already is (rating, nothing appended)."""
+        if sort not in self.SORTS:
+            raise ValueError(f"Unknown sort {sort!r}")
+        if sort == "rating" and self._size == self._ranked_count:
+            return None
+        order = self._orders.get(sort)
+        if order is None:
+            size = self._size
+            positions = np.arange(size)
+            if sort == "rating":
+                keys = (positions, -self.year[:size], -self.rating[:size])
+            elif sort == "year":
+                keys = (positions, -self.year[:size])
+            else:
+                keys = (positions, -self.votes[:size])
+            order = self._orders[sort] = np.lexsort(keys)
+        return order
+
+    def _make_writable(self):
+        """Copy the arrays before the first in-place write if they are read-only views of a snapshot mmap."""
+        if self.live.flags.writeable:
+            return
+        for column in ("rating", "year", "votes", "director", "live"):
+            setattr(self, column, getattr(self, column).copy())
+        self.genres = {genre: bitmap.copy() for genre, bitmap in self.genres.items()}
+        self.years.rows = self.years.rows.copy()
+        self.ratings.rows = self.ratings.rows.copy()
+
+    def _grow(self):
+        self._capacity *= 2
+        for column in ("rating", "year", "votes", "director"):
+            array = getattr(self, column)
+            setattr(self, column, np.concatenate([array, np.full(len(array), -1 if column == "director" else 0,
+                                                                  dtype=array.dtype)]))
+        words = len(_words(self._capacity))
+        self.live = np.pad(self.live, (0, words - len(self.live)))
+        self.genres = {genre: np.pad(bitmap, (0, words - len(bitmap))) for genre, bitmap in self.genres.items()}
+        self.years.grow(self._capacity)
+        self.ratings.grow(self._capacity)
@@ -1,10 +1,15 @@
 import streamlit as st
-import requests
 import webbrowser
+from api_client import MovieApiClient, make_http_session
 
 API_URL = "http://localhost:8000"
 st.set_page_config(page_title="Cinema Spotlight", layout="wide")
 
+@st.cache_resource
+def get_http_session():
+    # One keep-alive connection pool for every browser session of this Streamlit server
+    return make_http_session()
+
 # ------------------ Enhanced Styling with New Background ------------------
 st.markdown("""
     <style>
@@ -111,19 +116,27 @@ nav = st.radio(
 # ------------------ Session State ------------------
 if "user_id" not in st.session_state:
     st.session_state.user_id = "default_user"
+if "api" not in st.session_state:
+    st.session_state.api = MovieApiClient(API_URL, session=get_http_session())
+api = st.session_state.api
 
 # ------------------ Reusable Card ------------------
 def show_movie_card(movie):
+    # The browser fetches the pre-rendered thumbnail straight from the backend; it is hidden when there is none.
     st.markdown(f"""
-        <div class='card-text'>
-            <div style="font-size: 1.4rem; color: #f5c518; margin-bottom: 0.5rem;">
-                🎥 {movie['Name']}
-            </div>
-            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem;">
-                <div>📅 <strong>Year:</strong> {movie.get('Year', 'N/A')}</div>
-                <div>🎬 <strong>Director:</strong> {movie.get('Director', 'N/A')}</div>
-                <div>🎭 <strong>Genre:</strong> {movie.get('Genre', 'N/A')}</div>
-                <div>⭐ <strong>IMDb:</strong> {movie.get('IMDb', 'N/A')}</div>
+        <div class='card-text' style="display: flex; gap: 1rem; align-items: flex-start;">
+            <img src="{api.poster_url(movie['Name'], 'card')}" width="120" height="180" loading="lazy"
+                 alt="" style="border-radius: 4px; flex: none;" onerror="this.style.display='none'">
+            <div style="flex: 1;">
+                <div style="font-size: 1.4rem; color: #f5c518; margin-bottom: 0.5rem;">
+                    🎥 {movie['Name']}
+                </div>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem;">
+                    <div>📅 <strong>Year:</strong> {movie.get('Year', 'N/A')}</div>
+                    <div>🎬 <strong>Director:</strong> {movie.get('Director', 'N/A')}</div>
+                    <div>🎭 <strong>Genre:</strong> {movie.get('Genre', 'N/A')}</div>
+                    <div>⭐ <strong>IMDb:</strong> {movie.get('IMDb', 'N/A')}</div>
+                </div>
             </div>
         </div>
     """, unsafe_allow_html=True)
@@ -137,8 +150,7 @@ if nav == "Search Movies":
     suggestions = []
     if search_input:
         try:
-            response = requests.get(f"{API_URL}/search?prefix={search_input}&user_id={st.session_state.user_id}")
-            suggestions = response.json().get("movies", [])
+            suggestions = api.search(search_input, st.session_state.user_id, limit=20)
         except:
             st.error("Error fetching suggestions.")
 
@@ -146,8 +158,7 @@ if nav == "Search Movies":
         selected_movie = st.selectbox("Choose a Film", suggestions, key="movie_select")
         if selected_movie:
             try:
-                movie_response = requests.get(f"{API_URL}/movie/{selected_movie}?user_id={st.session_state.user_id}")
-                movie = movie_response.json()
+                movie = api.movie(selected_movie, st.session_state.user_id)
                 if "error" not in movie:
                     show_movie_card(movie)
                     col1, col2 = st.columns(2)
@@ -172,28 +183,24 @@ elif nav == "Top Rated":
     
     if st.button("SHOW TOP FILMS"):
         try:
-            response = requests.get(f"{API_URL}/top-rated?N={n_movies}")
-            if response.status_code == 200:
-                top_movies = response.json().get("top_movies", [])
-                if not top_movies:
-                    st.info("No rated movies found.")
-                else:
-                    cols = st.columns(2)
-                    for idx, movie in enumerate(top_movies):
-                        with cols[idx % 2]:
-                            st.markdown(f"""
-                                <div class="card-text">
-                                    <div style="font-size: 1.3rem; color: #f5c518; margin-bottom: 0.5rem;">
-                                        #{idx+1} {movie.get('Name', 'Unknown Movie')}
-                                    </div>
-                                    <div style="font-size: 1.1rem; display: flex; align-items: center;">
-                                        <span style="font-size: 1.5rem; margin-right: 5px;">⭐</spana>
-                                        <strong>{movie.get('IMDb', 'N/A')}</strong>
-                                    </div>
-                                </div>
-                            """, unsafe_allow_html=True)
+            top_movies = api.top_rated(n_movies)
+            if not top_movies:
+                st.info("No rated movies found.")
             else:
-                st.error("Failed to fetch top movies. Please try again.")
+                cols = st.columns(2)
+                for idx, movie in enumerate(top_movies):
+                    with cols[idx % 2]:
+                        st.markdown(f"""
+                            <div class="card-text">
+                                <div style="font-size: 1.3rem; color: #f5c518; margin-bottom: 0.5rem;">
+                                    #{idx+1} {movie.get('Name', 'Unknown Movie')}
+                                </div>
+                                <div style="font-size: 1.1rem; display: flex; align-items: center;">
+                                    <span style="font-size: 1.5rem; margin-right: 5px;">⭐</spana>
+                                    <strong>{movie.get('IMDb', 'N/A')}</strong>
+                                </div>
+                            </div>
+                        """, unsafe_allow_html=True)
         except Exception as e:
             st.error(f"An error occurred: {str(e)}")
     st.markdown("</div>", unsafe_allow_html=True)
@@ -203,40 +210,36 @@ elif nav == "Movies by Actor":
     st.subheader("🎭 MOVIES BY ACTOR")
     actor_prefix = st.text_input("Enter Actor Name:", "", key="actor_input")
     matching_actors = []
+    movies_by_actor = {}
     if actor_prefix:
         try:
-            response = requests.get(f"{API_URL}/movies-by-actor?prefix={actor_prefix}&user_id={st.session_state.user_id}")
-            data = response.json()
+            # One round trip returns the matching actors together with their movies.
+            data = api.movies_by_actors(actor_prefix, st.session_state.user_id)
             matching_actors = data.get("actors", [])
+            movies_by_actor = data.get("movies", {})
         except Exception as e:
             st.error(f"Error fetching actor suggestions: {str(e)}")
 
     if matching_actors:
         selected_actor = st.selectbox("Pick an Actor", matching_actors, key="actor_select")
-        try:
-            response = requests.get(f"{API_URL}/movies-by-actor?prefix={selected_actor}&user_id={st.session_state.user_id}")
-            data = response.json()
-            movies = data.get("movies", [])
-            
-            cols = st.columns(2)
-            for idx, movie in enumerate(movies):
-                with cols[idx % 2]:
-                    movie_name = movie.get("Name") if isinstance(movie, dict) else movie
-                    st.markdown(f"""
-                        <div class="card-text">
-                            🎬 <strong>{movie_name}</strong>
-                        </div>
-                    """, unsafe_allow_html=True)
-        except Exception as e:
-            st.error(f"Error loading movies for actor: {str(e)}")
+        movies = movies_by_actor.get(selected_actor, [])
+
+        cols = st.columns(2)
+        for idx, movie in enumerate(movies):
+            with cols[idx % 2]:
+                movie_name = movie.get("Name") if isinstance(movie, dict) else movie
+                st.markdown(f"""
+                    <div class="card-text">
+                        🎬 <strong>{movie_name}</strong>
+                    </div>
+                """, unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
 elif nav == "Search History":
     st.markdown("<div class='glass-box'>", unsafe_allow_html=True)
     st.subheader("🕘 SEARCH HISTORY")
     try:
-        response = requests.get(f"{API_URL}/history?user_id={st.session_state.user_id}")
-        history = response.json().get("history", [])
+        history = api.history(st.session_state.user_id)
         if not history:
             st.info("Your search history is empty.")
         else:
@@ -0,0 +1,272 @@
+import numpy as np
+
+# ------------------ CSR Graph Engine ------------------
+
+class CSRGraph:
+    """Read-only actor–movie graph with interned node ids and NumPy CSR adjacency.
+
+    Node `i`'s neighbours are `indices[indptr[i]:indptr[i + 1]]`. Traversals expand a
+    whole BFS frontier per NumPy call instead of visiting nodes one at a time in Python.
+    """
+
+    def __init__(self, names, is_actor, indptr, indices, ids=None):
+        self.names = names
+        self.is_actor = is_actor
+        self.indptr = indptr
+        self.indices = indices
+        self.ids = {name: node_id for node_id, name in enumerate(names)} if ids is None else ids
+
+    @classmethod
+    def from_networkx(cls, graph):
+        names = list(graph.nodes)
+        ids = {name: node_id for node_id, name in enumerate(names)}
+        is_actor = np.fromiter((data.get("type") == "actor" for _, data in graph.nodes(data=True)),
+                               dtype=bool, count=len(names))
+        sources, targets = np.fromiter(
+            (ids[name] for edge in graph.edges() for name in edge), dtype=np.int32, count=2 * graph.number_of_edges()
+        ).reshape(-1, 2).T
+        return cls.from_edges(names, is_actor, sources, targets, ids)
+
+    @classmethod
+    def from_edges(cls, names, is_actor, sources, targets, ids=None):
+        """Build from undirected edges given as two arrays of node ids; `ids` maps the names to look up by.
+
+        Nodes left out of `ids` are kept (their ids stay valid) but have no edges and
+        cannot be looked up, which is how removed nodes are dropped without renumbering.
+        """
+        sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+        order = np.argsort(sources, kind="stable")
+        indices = targets[order].astype(np.int32)
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(names)), out=indptr[1:])
+        return cls(names, np.asarray(is_actor, dtype=bool), indptr, indices, ids)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["ids"]  # Cheap to rebuild, expensive to pickle
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.ids = {name: node_id for node_id, name in enumerate(self.names)}
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def neighbors(self, name):
+        node_id = self.ids.get(name)
+        if node_id is None:
+            return []
+        return [self.names[i] for i in self.indices[self.indptr[node_id]:self.indptr[node_id + 1]]]
+
+    def degree(self, name):
+        node_id = self.ids[name]
+        return int(self.indptr[node_id + 1] - self.indptr[node_id])
+
+    def co_stars(self, actor_name, limit=None):
+        """Actors sharing at least one movie with `actor_name`, most shared movies first."""
+        node_id = self.ids.get(actor_name)
+        if node_id is None or not self.is_actor[node_id]:
+            return []
+        movies = self.indices[self.indptr[node_id]:self.indptr[node_id + 1]]
+        actors, _ = self._expand(movies)
+        actors = actors[actors != node_id]
+        if not len(actors):
+            return []
+        co_star_ids, counts = np.unique(actors, return_counts=True)
+        order = np.lexsort((co_star_ids, -counts))
+        if limit is not None:
+            order = order[:limit]
+        return [(self.names[co_star_ids[i]], int(counts[i])) for i in order]
+
+    def k_hop(self, name, k, limit=None):
+        """Nodes within `k` hops of `name`, as (name, is_actor, distance) ordered by distance."""
+        node_id = self.ids.get(name)
+        if node_id is None:
+            return []
+        distance = np.full(len(self.names), -1, dtype=np.int32)
+        distance[node_id] = 0
+        frontier = np.array([node_id], dtype=np.int32)
+        results = []
+        for hop in range(1, k + 1):
+            reached, _ = self._expand(frontier)
+            reached = np.unique(reached)
+            frontier = reached[distance[reached] < 0]
+            if not len(frontier):
+                break
+            distance[frontier] = hop
+            results.extend((self.names[i], bool(self.is_actor[i]), hop) for i in frontier)
+            if limit is not None and len(results) >= limit:
+                return results[:limit]
+        return results
+
+    def shortest_path(self, source_name, target_name, max_depth=12):
+        """Shortest node path between two nodes via bidirectional BFS, or None if unreachable."""
+        source, target = self.ids.get(source_name), self.ids.get(target_name)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return [source_name]
+        size = len(self.names)
+        parents = [np.full(size, -2, dtype=np.int32), np.full(size, -2, dtype=np.int32)]
+        distances = [np.full(size, -1, dtype=np.int32), np.full(size, -1, dtype=np.int32)]
+        parents[0][source], parents[1][target] = -1, -1
+        distances[0][source], distances[1][target] = 0, 0
+        frontiers = [np.array([source], dtype=np.int32), np.array([target], dtype=np.int32)]
+        depths = [0, 0]
+        while depths[0] + depths[1] < max_depth:
+            # Always grow the cheaper side; this keeps the search to roughly the square root of a one-sided BFS.
+            side = 0 if self._frontier_cost(frontiers[0]) <= self._frontier_cost(frontiers[1]) else 1
+            reached, origins = self._expand(frontiers[side])
+            fresh = distances[side][reached] < 0
+            reached, origins = reached[fresh], origins[fresh]
+            if not len(reached):
+                return None
+            reached, first = np.unique(reached, return_index=True)
+            depths[side] += 1
+            parents[side][reached] = origins[first]
+            distances[side][reached] = depths[side]
+            frontiers[side] = reached
+            other = distances[1 - side][reached]
+            if (other >= 0).any():
+                # Every meeting node is at the same depth on this side, so the one closest
+                # to the other side completes a shortest path.
+                candidates = np.flatnonzero(other >= 0)
+                meeting = reached[candidates[np.argmin(other[candidates])]]
+                return self._join(parents, int(meeting))
+        return None
+
+    def _frontier_cost(self, frontier):
+        return int((self.indptr[frontier + 1] - self.indptr[frontier]).sum())
+
+    def _expand(self, frontier, positions=False):
+        """All neighbours of a frontier, with the frontier node (or, with `positions`, its index) each one was reached from."""
+        starts = self.indptr[frontier]
+        lengths = self.indptr[frontier + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        origins = np.arange(len(frontier), dtype=np.int32) if positions else frontier
+        return self.indices[offsets + np.arange(total)], np.repeat(origins, lengths).astype(np.int32)
+
+    def _join(self, parents, meeting):
+        path = []
+        node = meeting
+        while node != -1:
+            path.append(node)
+            node = int(parents[0][node])
+        path.reverse()
+        node = int(parents[1][meeting])
+        while node != -1:
+            path.append(node)
+            node = int(parents[1][node])
+        return [self.names[i] for i in path]
+
+# ------------------ Movie Similarity ------------------
+
+DIRECTOR_WEIGHT = 1.0
+GENRE_WEIGHT = 0.5
+
+
+class MovieSimilarity:
+    """"More like this" scores computed from the movie×actor incidence rows of a `CSRGraph`.
+
+    Scoring a movie against every other one is a single sparse row product: the movie
+    lists of its actors are gathered with one `_expand` and summed with `bincount`. Each
+    shared actor adds 1 / log2(1 + their movie count), so prolific actors count for
+    less. A shared director adds `DIRECTOR_WEIGHT`, and genre overlap (Jaccard) scaled
+    by `GENRE_WEIGHT` is added on top. Ties go to the higher rated movie.
+    """
+
+    def __init__(self, csr, movies):
+        """`movies` yields (name, director, genres, rating) for the movie nodes of `csr`."""
+        size = len(csr.names)
+        self.csr = csr
+        self.director = np.full(size, -1, dtype=np.int32)
+        self.genres = np.zeros(size, dtype=np.uint64)  # Bit set over the first 64 genres seen
+        self.rating = np.zeros(size, dtype=np.float32)
+        director_codes, genre_bits = {}, {}
+        node_ids, directors, genre_masks, ratings = [], [], [], []
+        for name, director, genres, rating in movies:
+            node_id = csr.ids.get(name)
+            if node_id is None:
+                continue
+            mask = 0
+            for genre in genres:
+                bit = genre_bits.setdefault(genre, len(genre_bits))
+                if bit < 64:
+                    mask |= 1 << bit
+            node_ids.append(node_id)
+            directors.append(director_codes.setdefault(director, len(director_codes)) if director else -1)
+            genre_masks.append(mask)
+            ratings.append(rating)
+        node_ids = np.array(node_ids, dtype=np.int64)
+        self.director[node_ids] = directors
+        self.genres[node_ids] = np.array(genre_masks, dtype=np.uint64)
+        self.rating[node_ids] = ratings
+        # Movies grouped by director, for the "same director" candidates.
+        self.by_director = np.argsort(self.director, kind="stable").astype(np.int32)
+        self.sorted_directors = self.director[self.by_director]
+        degree = np.diff(csr.indptr)
+        self.actor_weight = np.where(csr.is_actor, 1.0 / np.log2(1.0 + np.maximum(degree, 1)), 0.0)
+
+    def similar(self, name, limit=10):
+        """The `limit` movies most like `name`, as (name, score, shared actors, same director, shared genres)."""
+        return self.similar_many([name], limit).get(name, [])
+
+    def similar_many(self, names, limit=10, block_size=256):
+        """`similar()` for many movies at once; each block of sources shares one sparse product."""
+        sources = [(name, self.csr.ids[name]) for name in names
+                   if name in self.csr.ids and not self.csr.is_actor[self.csr.ids[name]]]
+        results = {}
+        for start in range(0, len(sources), block_size):
+            block = sources[start:start + block_size]
+            owners, movies, scores, shared = self._co_occurrence(np.array([node_id for _, node_id in block], dtype=np.int32))
+            bounds = np.searchsorted(owners, np.arange(len(block) + 1))
+            for position, (name, node_id) in enumerate(block):
+                row = slice(bounds[position], bounds[position + 1])
+                results[name] = self._rank(node_id, movies[row], scores[row], shared[row], limit)
+        return results
+
+    def _co_occurrence(self, sources):
+        """Shared-actor scores between each source and every movie it shares an actor with.
+
+        Returns (source position, movie id, weighted score, shared actor count) arrays,
+        sorted by source position then movie id.
+        """
+        actors, actor_owner = self.csr._expand(sources, positions=True)
+        movies, via = self.csr._expand(actors, positions=True)
+        size = len(self.csr.names)
+        keys = actor_owner[via].astype(np.int64) * size + movies
+        keys, inverse = np.unique(keys, return_inverse=True)
+        scores = np.bincount(inverse, weights=self.actor_weight[actors[via]], minlength=len(keys))
+        shared = np.bincount(inverse, minlength=len(keys))
+        return keys // size, (keys % size).astype(np.int32), scores, shared
+
+    def _rank(self, node_id, movies, scores, shared, limit):
+        director = self.director[node_id]
+        if director >= 0:
+            low, high = np.searchsorted(self.sorted_directors, [director, director + 1])
+            extra = np.setdiff1d(self.by_director[low:high], movies, assume_unique=True)
+            movies = np.concatenate([movies, extra])
+            scores = np.concatenate([scores, np.zeros(len(extra))])
+            shared = np.concatenate([shared, np.zeros(len(extra), dtype=shared.dtype)])
+        keep = movies != node_id
+        movies, scores, shared = movies[keep], scores[keep], shared[keep]
+        if not len(movies):
+            return []
+        same_director = (self.director[movies] == director) & (director >= 0)
+        common = _popcount(self.genres[movies] & self.genres[node_id])
+        union = _popcount(self.genres[movies] | self.genres[node_id])
+        jaccard = np.divide(common, union, out=np.zeros(len(movies)), where=union > 0)
+        total = scores + DIRECTOR_WEIGHT * same_director + GENRE_WEIGHT * jaccard
+        order = np.lexsort((-self.rating[movies], -total))[:limit]
+        return [(self.csr.names[movies[i]], round(float(total[i]), 4), int(shared[i]), bool(same_director[i]), int(common[i]))
+                for i in order]
+
+
+def _popcount(values):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
@@ -0,0 +1,97 @@
+import json
+import logging
+import mmap
+import os
+import pickle
+import struct
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Index Snapshots ------------------
+#
+# File layout: MAGIC | header length (u64) | JSON header | aligned out-of-band buffers | pickle stream
+#
+# Large contiguous buffers (NumPy arrays and anything else exposing pickle protocol 5
+# `PickleBuffer`s) are written out-of-band and handed back to `pickle.loads` as views
+# into a read-only mmap, so they are never copied and worker processes loading the
+# same snapshot share those pages through the OS page cache.
+
+MAGIC = b"MOVIDX01"
+ALIGNMENT = 64
+
+
+def collection_version(collection):
+    """Cheap fingerprint of the collection: document count, newest `_id` and newest `updated_at`.
+
+    The count comes from collection metadata and the other two are index lookups, so
+    checking it on every worker start costs three round trips whatever the collection
+    size. Edits must set `updated_at` (as `movie_ingest.py` does) to invalidate a snapshot.
+    """
+    newest = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    updated = collection.find_one({"updated_at": {"$exists": True}}, {"updated_at": 1}, sort=[("updated_at", -1)])
+    return "|".join([
+        str(collection.estimated_document_count()),
+        str(newest["_id"]) if newest else "",
+        str(updated["updated_at"]) if updated else "",
+    ])
+
+
+def save_snapshot(path, version, state):
+    buffers = []
+    payload = pickle.dumps(state, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+
+    header = {"version": version, "buffers": [], "payload": None}
+    offset = 0
+    for raw in raw_buffers:
+        header["buffers"].append([offset, raw.nbytes])
+        offset = _align(offset + raw.nbytes)
+    header["payload"] = [offset, len(payload)]
+    header_bytes = json.dumps(header).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header_bytes))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for (buffer_offset, _), raw in zip(header["buffers"], raw_buffers):
+            f.seek(data_start + buffer_offset)
+            f.write(raw)
+        f.seek(data_start + header["payload"][0])
+        f.write(payload)
+    os.replace(temp_path, path)  # Readers only ever see a complete snapshot
+    logger.info(f"Saved index snapshot to {path} ({data_start + offset + len(payload)} bytes)")
+
+
+def load_snapshot(path, version):
+    """Return the state saved for `version`, or None if there is no matching snapshot."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            logger.warning(f"Ignoring {path}: not an index snapshot")
+            return None
+        (header_length,) = struct.unpack("<Q", view[len(MAGIC):len(MAGIC) + 8])
+        header_end = len(MAGIC) + 8 + header_length
+        header = json.loads(bytes(view[len(MAGIC) + 8:header_end]))
+        if header["version"] != version:
+            logger.info(f"Index snapshot is stale ({header['version']} != {version})")
+            return None
+        data_start = _align(header_end)
+        buffers = [view[data_start + offset:data_start + offset + size] for offset, size in header["buffers"]]
+        payload_offset, payload_size = header["payload"]
+        payload = view[data_start + payload_offset:data_start + payload_offset + payload_size]
+        return pickle.loads(payload, buffers=buffers)
+    except Exception as e:
+        logger.error(f"Failed to load index snapshot {path}: {e}")
+        return None
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
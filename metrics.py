@@ -0,0 +1,269 @@
+import logging
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Metrics (Prometheus Text Format) ------------------
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 20000, 100000)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """The child series for one combination of label values (created on first use)."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._make_child())
+        return child
+
+    def _make_child(self):
+        raise NotImplementedError
+
+    def _label_text(self, values, extra=()):
+        pairs = [*zip(self.labelnames, values), *extra]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _make_child(self):
+        return _Value()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{self._label_text(values)} {_number(child.value)}"]
+
+
+class Gauge(_Metric):
+    """A value that can go up and down. With `function`, it is read at scrape time instead."""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=(), function=None):
+        super().__init__(name, help_text, labelnames)
+        self.function = function
+
+    def _make_child(self):
+        return _Value()
+
+    def set(self, value):
+        self.labels().set(value)
+
+    @contextmanager
+    def time(self, *values):
+        """Set the labelled child to the duration of the `with` block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.labels(*values).set(time.perf_counter() - start)
+
+    def render(self):
+        if self.function is None:
+            return super().render()
+        try:
+            value = self.function()
+        except Exception as e:
+            logger.error(f"Failed to read gauge {self.name}: {e}")
+            return []
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {_number(value)}"]
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{self._label_text(values)} {_number(child.value)}"]
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "total", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # The last slot is the +Inf bucket
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        position = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[position] += 1
+            self.total += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _make_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    @contextmanager
+    def time(self, *values):
+        """Observe the duration of the `with` block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.labels(*values).observe(time.perf_counter() - start)
+
+    def _render_child(self, values, child):
+        with child._lock:
+            counts, total = list(child.counts), child.total
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), counts):
+            cumulative += count
+            le = bound if bound == "+Inf" else _number(bound)
+            lines.append(f"{self.name}_bucket{self._label_text(values, [('le', le)])} {cumulative}")
+        lines.append(f"{self.name}_sum{self._label_text(values)} {_number(total)}")
+        lines.append(f"{self.name}_count{self._label_text(values)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=(), function=None):
+        return self._register(Gauge(name, help_text, labelnames, function))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        """Every registered metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# ------------------ Slow Request Profiler ------------------
+
+class SlowRequestProfiler:
+    """Samples the call stacks of in-flight requests and logs where slow ones spent their time.
+
+    A background thread reads `sys._current_frames()` every `interval` seconds, but only
+    while at least one sampled request is running. A request that finishes within
+    `threshold` seconds discards its samples, so the cost is a dictionary entry per
+    request plus one stack walk per running request per interval.
+    """
+
+    def __init__(self, threshold, interval=0.005, sample_rate=1.0, max_depth=12, top_stacks=5):
+        self.threshold = threshold
+        self.interval = interval
+        self.sample_rate = sample_rate
+        self.max_depth = max_depth
+        self.top_stacks = top_stacks
+        self._active = {}  # Thread id -> stack -> sample count
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start_request(self):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        with self._lock:
+            self._active[threading.get_ident()] = StackCounter()
+            self._wake.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name="slow-request-profiler", daemon=True)
+                self._thread.start()
+
+    def finish_request(self, elapsed, description):
+        """Stop sampling the current thread; return (and log) a report if the request was slow."""
+        with self._lock:
+            samples = self._active.pop(threading.get_ident(), None)
+        if samples is None or elapsed < self.threshold:
+            return None
+        total = sum(samples.values())
+        lines = [f"Slow request {description}: {elapsed * 1000:.1f} ms, {total} stack samples"]
+        for stack, count in samples.most_common(self.top_stacks):
+            lines.append(f"  {count / total:6.1%}  " + " <- ".join(stack))
+        report = "\n".join(lines)
+        logger.warning(report)
+        return report
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._wake.clear()
+                    continue
+                frames = sys._current_frames()
+                for thread_id, samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own_id:
+                        samples[self._stack(frame)] += 1
+
+    def _stack(self, frame):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+            frame = frame.f_back
+        return tuple(stack)
@@ -0,0 +1,211 @@
+"""Bulk movie ingestion: NDJSON or CSV records in, validated ordered upserts into MongoDB out.
+
+Usage:
+    python movie_ingest.py movies.ndjson
+    python movie_ingest.py movies.csv --batch-size 2000
+    python movie_ingest.py movies.ndjson --api http://localhost:8000
+
+Records are upserted by `Name`, ignoring case as the indexes do, so re-running a file updates movies in place; fields a
+record leaves out are kept. Without `--api`, rows go straight to MongoDB and a running
+backend picks them up through live sync. With `--api`, the file is streamed to the
+backend's `POST /ingest`, which updates its indexes once per batch as rows are written.
+"""
+import argparse
+import csv
+import json
+import logging
+import math
+import sys
+
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "csv")
+MAX_ERRORS_REPORTED = 20
+# Matches names the way the in-memory catalog keys them: case-insensitively.
+NAME_COLLATION = {"locale": "en", "strength": 2}
+
+# ------------------ Record Validation ------------------
+
+class InvalidMovie(ValueError):
+    pass
+
+
+def normalize_movie(record):
+    """A clean movie document from one raw record; raises InvalidMovie saying what is wrong."""
+    if not isinstance(record, dict):
+        raise InvalidMovie("record must be an object")
+    movie = {}
+    for field, value in record.items():
+        if not isinstance(field, str) or field.strip() in ("", "_id"):
+            continue  # Extra CSV cells arrive under None; upserts are keyed on Name, never _id
+        if isinstance(value, str):
+            value = value.strip()
+        if value is not None and value != "" and value != []:
+            movie[field.strip()] = value
+    if not isinstance(movie.get("Name"), str) or not movie["Name"]:
+        raise InvalidMovie("'Name' is required")
+    if "Year" in movie:
+        movie["Year"] = _number(movie, "Year", int, 1870, 2100)
+    if "IMDb" in movie:
+        movie["IMDb"] = _number(movie, "IMDb", float, 0.0, 10.0)
+    if "Votes" in movie:
+        movie["Votes"] = _number(movie, "Votes", int, 0, math.inf)
+    for field in ("Genre", "Director"):
+        if isinstance(movie.get(field), list):
+            movie[field] = ", ".join(str(item).strip() for item in movie[field] if str(item).strip())
+        elif field in movie:
+            movie[field] = str(movie[field])
+    if "Actors" in movie:
+        movie["Actors"] = normalize_actors(movie["Actors"])
+    return movie
+
+
+def normalize_actors(actors):
+    """Actors as a list of distinct stripped names, from a comma-separated string or a list."""
+    if isinstance(actors, str):
+        actors = actors.split(",")
+    if not isinstance(actors, list):
+        raise InvalidMovie("'Actors' must be a list or a comma-separated string")
+    names = (actor.strip() for actor in actors if isinstance(actor, str))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def _number(movie, field, kind, low, high):
+    value = movie[field]
+    try:
+        number = float(value.replace(",", "") if isinstance(value, str) else value)
+    except (ValueError, TypeError):
+        raise InvalidMovie(f"'{field}' must be a number, got {value!r}")
+    if math.isnan(number) or not low <= number <= high:
+        raise InvalidMovie(f"'{field}' is out of range: {value!r}")
+    if kind is int:
+        if not number.is_integer():
+            raise InvalidMovie(f"'{field}' must be a whole number, got {value!r}")
+        return int(number)
+    return number
+
+
+def read_records(stream, format="ndjson"):
+    """Yield (line number, raw record) from a text stream; unparseable lines yield an InvalidMovie."""
+    if format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield number, InvalidMovie(f"invalid JSON: {e.msg}")
+
+# ------------------ Batched Upserts ------------------
+
+class MovieIngestor:
+    """Writes validated movies to MongoDB in ordered batches of upserts keyed on `Name`, ignoring case.
+
+    After each batch is written, `on_batch(documents)` receives the stored documents
+    (with `_id` and the `updated_at` watermark live sync polls on), so a running backend
+    can update its indexes once per batch instead of once per movie. A failed write stops
+    the run; everything before that batch is stored and reported.
+    """
+
+    def __init__(self, collection, on_batch=None, batch_size=1000, watermark_field="updated_at"):
+        self.collection = collection
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.watermark_field = watermark_field
+        try:
+            # Every upsert looks its movie up by Name; without an index each one scans the collection.
+            self.collection.create_index("Name", name="Name_case_insensitive", collation=NAME_COLLATION)
+        except Exception as e:
+            logger.error(f"Failed to create movie name index: {e}")
+
+    def ingest(self, records):
+        """Ingest (line number, raw record) pairs and return counts plus the first few problems."""
+        report = {"received": 0, "invalid": 0, "inserted": 0, "updated": 0, "batches": 0, "errors": []}
+        batch = {}  # Lowercased name -> movie; a later row for the same name in one batch wins
+        for line, record in records:
+            report["received"] += 1
+            try:
+                if isinstance(record, InvalidMovie):
+                    raise record
+                movie = normalize_movie(record)
+            except InvalidMovie as e:
+                report["invalid"] += 1
+                if len(report["errors"]) < MAX_ERRORS_REPORTED:
+                    report["errors"].append({"line": line, "error": str(e)})
+                continue
+            batch[movie["Name"].lower()] = movie
+            if len(batch) >= self.batch_size:
+                if not self._write(batch, report):
+                    return report
+                batch = {}
+        if batch:
+            self._write(batch, report)
+        return report
+
+    def _write(self, batch, report):
+        names = [movie["Name"] for movie in batch.values()]
+        operations = [
+            UpdateOne({"Name": movie["Name"]}, {"$set": movie, "$currentDate": {self.watermark_field: True}},
+                      upsert=True, collation=NAME_COLLATION)
+            for movie in batch.values()
+        ]
+        try:
+            result = self.collection.bulk_write(operations, ordered=True)
+            documents = list(self.collection.find({"Name": {"$in": names}})) if self.on_batch is not None else None
+        except PyMongoError as e:
+            logger.error(f"Ingest batch {report['batches'] + 1} failed: {e}")
+            report["failed"] = str(e)
+            return False
+        report["inserted"] += result.upserted_count
+        report["updated"] += result.matched_count
+        report["batches"] += 1
+        if documents is not None:
+            self.on_batch(documents)
+        return True
+
+# ------------------ Command Line ------------------
+
+def post_file(url, path, format, batch_size):
+    import requests
+
+    with open(path, "rb") as f:
+        response = requests.post(f"{url.rstrip('/')}/ingest", params={"format": format, "batch_size": batch_size},
+                                 data=f, headers={"Content-Type": "text/csv" if format == "csv" else "application/x-ndjson"})
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="NDJSON or CSV file ('-' for stdin, MongoDB mode only)")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--api", help="backend URL to stream the file to instead of writing to MongoDB")
+    parser.add_argument("--db-url", default="mongodb://localhost:27017/")
+    parser.add_argument("--db-name", default="Movie_Information")
+    parser.add_argument("--collection", default="movies")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    format = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    if args.api:
+        report = post_file(args.api, args.path, format, args.batch_size)
+    else:
+        collection = MongoClient(args.db_url)[args.db_name][args.collection]
+        ingestor = MovieIngestor(collection, batch_size=args.batch_size)
+        stream = sys.stdin if args.path == "-" else open(args.path, newline="", encoding="utf-8")
+        with stream:
+            report = ingestor.ingest(read_records(stream, format))
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if "failed" in report or "error" in report else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_LATEST = object()
+
+# ------------------ Incremental Index Sync ------------------
+
+class MovieIndexSync:
+    """Streams inserts, updates and deletes from the `movies` collection into the in-memory indexes.
+
+    Uses a MongoDB change stream when the server offers one (replica sets and sharded
+    clusters). Otherwise it polls for documents whose `updated_at` watermark moved past
+    the last one seen, and every few polls sweeps `_id`s to pick up deletes and inserts
+    that carry no watermark. `on_upsert(document)` and `on_delete(movie_id)` must be
+    idempotent and apply each change atomically. Writers that update the indexes
+    themselves report the documents through `mark_applied()`, and sync skips them.
+
+    `watermark` defaults to the newest one in the collection. Pass the value
+    `read_watermark()` returned before the indexes were loaded, so writes made during
+    the load are applied too.
+    """
+
+    def __init__(self, collection, on_upsert, on_delete, known_ids, watermark_field="updated_at",
+                 poll_interval=5.0, sweep_every=12, watermark=_LATEST):
+        self.collection = collection
+        self.on_upsert = on_upsert
+        self.on_delete = on_delete
+        self.known_ids = known_ids
+        self.watermark_field = watermark_field
+        self.poll_interval = poll_interval
+        self.sweep_every = sweep_every
+        self.watermark = read_watermark(collection, watermark_field) if watermark is _LATEST else watermark
+        self.mode = None
+        self._resume_token = None
+        self._applied = {}  # _id -> watermark of a version already applied by its writer
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="movie-index-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def mark_applied(self, documents):
+        """Record documents already applied to the indexes, so sync does not apply them again."""
+        for document in documents:
+            if document.get(self.watermark_field) is not None:
+                self._applied[document["_id"]] = document[self.watermark_field]
+
+    def apply_change(self, change):
+        operation = change.get("operationType")
+        if operation in ("insert", "update", "replace"):
+            document = change.get("fullDocument")
+            if document is None:
+                # Deleted again before the update could be looked up.
+                self.on_delete(change["documentKey"]["_id"])
+            elif not self._already_applied(document):
+                self.on_upsert(document)
+        elif operation == "delete":
+            self.on_delete(change["documentKey"]["_id"])
+        elif operation in ("drop", "rename", "dropDatabase", "invalidate"):
+            logger.warning(f"Movies collection was {operation}-ed; indexes keep their last state")
+
+    def poll_once(self, sweep=False):
+        """Apply every change since the last watermark; with `sweep`, also reconcile `_id`s."""
+        applied = 0
+        query = {self.watermark_field: {"$exists": True}}
+        if self.watermark is not None:
+            query = {self.watermark_field: {"$gt": self.watermark}}
+        for document in self.collection.find(query).sort(self.watermark_field, 1):
+            self.watermark = document[self.watermark_field]
+            if not self._already_applied(document):
+                self.on_upsert(document)
+                applied += 1
+        if sweep:
+            present = {document["_id"] for document in self.collection.find({}, {"_id": 1})}
+            known = self.known_ids()
+            for movie_id in known - present:
+                self.on_delete(movie_id)
+                applied += 1
+            missing = list(present - known)
+            for start in range(0, len(missing), 1000):
+                for document in self.collection.find({"_id": {"$in": missing[start:start + 1000]}}):
+                    self.on_upsert(document)
+                    applied += 1
+        return applied
+
+    def _already_applied(self, document):
+        # Each version is seen once here, so its entry is dropped either way.
+        applied_at = self._applied.pop(document.get("_id"), None)
+        return applied_at is not None and applied_at == document.get(self.watermark_field)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._watch()
+            except Exception as e:
+                if self.mode is None:
+                    logger.info(f"Change streams unavailable ({e}); polling every {self.poll_interval}s")
+                    break
+                logger.error(f"Change stream failed, resuming: {e}")
+                self._stop.wait(self.poll_interval)
+        if self.mode is None:
+            self.mode = "polling"
+            self._poll_forever()
+
+    def _watch(self):
+        with self.collection.watch(full_document="updateLookup", resume_after=self._resume_token,
+                                   max_await_time_ms=1000) as stream:
+            if self.mode is None:
+                self.mode = "change_stream"
+                # Catch up on writes made between the initial load and opening the stream.
+                self.poll_once(sweep=True)
+            while not self._stop.is_set() and stream.alive:
+                change = stream.try_next()
+                if change is not None:
+                    self.apply_change(change)
+                self._resume_token = stream.resume_token
+
+    def _poll_forever(self):
+        polls = 0
+        while not self._stop.wait(self.poll_interval):
+            polls += 1
+            try:
+                self.poll_once(sweep=polls % self.sweep_every == 0)
+            except Exception as e:
+                logger.error(f"Polling sync failed: {e}")
+
+
+def read_watermark(collection, watermark_field="updated_at"):
+    """The newest `watermark_field` value in the collection, or None if no document has one."""
+    try:
+        latest = collection.find_one({watermark_field: {"$exists": True}}, sort=[(watermark_field, -1)])
+        return latest[watermark_field] if latest else None
+    except Exception as e:
+        logger.error(f"Failed to read sync watermark: {e}")
+        return None
@@ -0,0 +1,102 @@
+import threading
+import time
+from heapq import nlargest
+
+import numpy as np
+
+# ------------------ Count-Min Sketch ------------------
+
+
+class CountMinSketch:
+    """Approximate counts for any number of keys in a fixed `depth` x `width` table.
+
+    Each key adds to one counter per row and is estimated by the smallest of them, so
+    collisions can only inflate an estimate, never deflate it. Counters are floats so the
+    whole table decays with one multiply.
+    """
+
+    def __init__(self, width=1 << 16, depth=4, seed=0):
+        if width & (width - 1):
+            raise ValueError("width must be a power of two")
+        self.table = np.zeros((depth, width), dtype=np.float32)
+        # Multiply-shift hashing: one odd 64-bit multiplier per row spreads a key's hash over that row.
+        multipliers = np.random.default_rng(seed).integers(1, 2**63, size=depth, dtype=np.uint64)
+        self._multipliers = (multipliers | np.uint64(1))[:, None]
+        self._shift = np.uint64(64 - (width.bit_length() - 1))
+        self._rows = np.arange(depth)[:, None]
+
+    def add(self, keys, counts):
+        columns = self._columns(keys)
+        for row in range(len(self.table)):
+            np.add.at(self.table[row], columns[row], counts)
+
+    def estimate(self, keys):
+        return self.table[self._rows, self._columns(keys)].min(axis=0)
+
+    def decay(self, factor):
+        self.table *= factor
+
+    def _columns(self, keys):
+        # hash() is salted per process, which is fine for counts that never leave it.
+        hashes = np.fromiter((hash(key) & 0xFFFFFFFFFFFFFFFF for key in keys), dtype=np.uint64, count=len(keys))
+        return (hashes * self._multipliers) >> self._shift
+
+# ------------------ Decayed Popularity ------------------
+
+
+class PopularityCounter:
+    """Time-decayed key frequencies: a count-min sketch plus the `top_k` heaviest keys.
+
+    `record()` only bumps a pending count under a lock, so it is cheap enough to call on
+    every request. `refresh()`, run periodically in the background, folds the pending
+    counts into the sketch, halves everything every `half_life` seconds, and republishes
+    `scores`: the estimated counts of the heaviest keys. Keys whose count decays below
+    `min_count` are forgotten.
+    """
+
+    def __init__(self, half_life=24 * 3600.0, top_k=1000, width=1 << 16, depth=4, max_pending=100_000, min_count=1.0):
+        self.sketch = CountMinSketch(width, depth)
+        self.half_life = half_life
+        self.top_k = top_k
+        self.max_pending = max_pending
+        self.min_count = min_count
+        self.scores = {}  # Key -> decayed count; replaced on refresh, never mutated
+        self.dropped = 0  # Records lost because the pending map was full
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._refreshed_at = time.monotonic()
+
+    def record(self, key, count=1):
+        with self._lock:
+            if key in self._pending:
+                self._pending[key] += count
+            elif len(self._pending) < self.max_pending:
+                self._pending[key] = count
+            else:
+                self.dropped += count
+
+    def refresh(self, now=None):
+        """Fold in the pending counts and apply decay; return True if any were pending or a key came or went."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        self.sketch.decay(0.5 ** ((now - self._refreshed_at) / self.half_life))
+        self._refreshed_at = now
+        if pending:
+            self.sketch.add(list(pending), np.fromiter(pending.values(), dtype=np.float32, count=len(pending)))
+        candidates = list(self.scores.keys() | pending.keys())
+        estimates = self.sketch.estimate(candidates) if candidates else np.empty(0, dtype=np.float32)
+        keep = np.flatnonzero(estimates >= self.min_count)
+        if len(keep) > self.top_k:
+            keep = keep[np.argpartition(-estimates[keep], self.top_k - 1)[:self.top_k]]
+        scores = {candidates[i]: float(estimates[i]) for i in keep.tolist()}
+        changed = bool(pending) or scores.keys() != self.scores.keys()
+        self.scores = scores
+        return changed
+
+    def hottest(self, n):
+        scores = self.scores
+        return nlargest(n, scores, key=scores.__getitem__)
+
+    def __len__(self):
+        return len(self.scores)
@@ -0,0 +1,184 @@
+import hashlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+# Width x height of each pre-rendered size; posters are cropped to 2:3 around the centre
+THUMBNAIL_SIZES = {"thumb": (120, 180), "card": (240, 360), "large": (480, 720)}
+JPEG_QUALITY = 85
+_DIGEST = re.compile(r"[0-9a-f]{32}")
+
+# ------------------ Thumbnail Rendering (worker processes) ------------------
+
+
+def poster_key(name):
+    """The lookup key for a movie title or poster file stem: ASCII, lowercase, words joined by '-'."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    return re.sub(r"[^a-z0-9]+", "-", text).strip("-")
+
+
+def render_thumbnails(source, sizes, output_dir):
+    """Decode one poster and write every size as a JPEG named by the hash of its bytes; return size -> digest."""
+    from PIL import Image, ImageOps
+
+    digests = {}
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for size, (width, height) in sizes.items():
+            buffer = io.BytesIO()
+            ImageOps.fit(image, (width, height), Image.LANCZOS).save(
+                buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+            data = buffer.getvalue()
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            path = os.path.join(output_dir, digest[:2], f"{digest}.jpg")
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary = f"{path}.{os.getpid()}.tmp"
+                with open(temporary, "wb") as f:
+                    f.write(data)
+                os.replace(temporary, path)
+            digests[size] = digest
+    return digests
+
+# ------------------ Poster Store ------------------
+
+
+class PosterStore:
+    """Pre-rendered, content-addressed poster thumbnails.
+
+    `build()` scans `source_dir` for poster files named after their movie (any case or
+    punctuation: "The Dark Knight.jpg" serves "the dark knight") and renders every size
+    in `sizes` with a pool of `workers` processes. Each thumbnail is stored under the
+    hash of its bytes, so its URL never changes meaning and can be cached forever. A
+    manifest remembers which source file (by size and mtime) produced which digests, so
+    restarts only render new or changed posters. Requests only look up digests and send
+    files; nothing is decoded or resized on the request path.
+    """
+
+    def __init__(self, source_dir, output_dir, sizes=THUMBNAIL_SIZES, workers=None):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.sizes = dict(sizes)
+        self.workers = workers
+        self._thumbnails = {}  # Poster key -> size -> digest; replaced on build, never mutated
+        self._sources = {}  # Poster key -> [source file, size, mtime_ns], as recorded in the manifest
+        self._thread = None
+        self._load_manifest()
+
+    def start(self):
+        """Build in a background thread; thumbnails from the last run are served meanwhile."""
+        if self._thread is None and os.path.isdir(self.source_dir):
+            self._thread = threading.Thread(target=self.build, name="poster-thumbnails", daemon=True)
+            self._thread.start()
+
+    def digest(self, movie_name, size):
+        return self._thumbnails.get(poster_key(movie_name), {}).get(size)
+
+    def path(self, digest):
+        """The file holding `digest`, or None for anything that is not a known digest."""
+        if not _DIGEST.fullmatch(digest):
+            return None
+        path = os.path.join(self.output_dir, digest[:2], f"{digest}.jpg")
+        return path if os.path.isfile(path) else None
+
+    def build(self):
+        """Render thumbnails for new or changed posters, drop removed ones, and save the manifest."""
+        try:
+            sources = self._scan()
+        except OSError as e:
+            logger.error(f"Failed to scan posters in {self.source_dir}: {e}")
+            return
+        thumbnails, pending = {}, {}
+        for key, source in sources.items():
+            if self._sources.get(key) == source and key in self._thumbnails:
+                thumbnails[key] = self._thumbnails[key]
+            else:
+                pending[key] = source
+        if pending and importlib.util.find_spec("PIL") is None:
+            logger.error(f"Pillow is not installed (pip install pillow); {len(pending)} posters left unrendered")
+            pending = {}
+        if pending:
+            try:
+                with ProcessPoolExecutor(self.workers) as pool:
+                    futures = {key: pool.submit(render_thumbnails, os.path.join(self.source_dir, source[0]),
+                                                self.sizes, self.output_dir)
+                               for key, source in pending.items()}
+                    for key, future in futures.items():
+                        try:
+                            thumbnails[key] = future.result()
+                        except Exception as e:
+                            logger.error(f"Failed to render poster {pending[key][0]}: {e}")
+            except Exception as e:
+                logger.error(f"Poster rendering pool failed: {e}")
+        self._sources = {key: sources[key] for key in thumbnails}
+        self._thumbnails = thumbnails
+        self._save_manifest()
+        self._prune()
+        logger.info(f"Posters ready for {len(thumbnails)} movies ({len(pending)} rendered)")
+
+    def __len__(self):
+        return len(self._thumbnails)
+
+    def _scan(self):
+        sources = {}
+        for entry in sorted(os.scandir(self.source_dir), key=lambda entry: entry.name):
+            stem, extension = os.path.splitext(entry.name)
+            if extension.lower() in SOURCE_EXTENSIONS and entry.is_file():
+                stat = entry.stat()
+                sources.setdefault(poster_key(stem), [entry.name, stat.st_size, stat.st_mtime_ns])
+        return sources
+
+    def _manifest_path(self):
+        return os.path.join(self.output_dir, "manifest.json")
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path()) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring unreadable poster manifest: {e}")
+            return
+        if manifest.get("sizes") != {size: list(box) for size, box in self.sizes.items()}:
+            return  # Sizes changed: every poster is rendered again
+        posters = manifest.get("posters", {})
+        self._sources = {key: poster["source"] for key, poster in posters.items()}
+        self._thumbnails = {key: poster["thumbnails"] for key, poster in posters.items()}
+
+    def _save_manifest(self):
+        manifest = {
+            "sizes": {size: list(box) for size, box in self.sizes.items()},
+            "posters": {key: {"source": self._sources[key], "thumbnails": digests}
+                        for key, digests in self._thumbnails.items()},
+        }
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            temporary = f"{self._manifest_path()}.tmp"
+            with open(temporary, "w") as f:
+                json.dump(manifest, f)
+            os.replace(temporary, self._manifest_path())
+        except OSError as e:
+            logger.error(f"Failed to save poster manifest: {e}")
+
+    def _prune(self):
+        """Delete stored thumbnails that no poster refers to any more."""
+        live = {digest for digests in self._thumbnails.values() for digest in digests.values()}
+        try:
+            for directory in os.scandir(self.output_dir):
+                if not directory.is_dir():
+                    continue
+                for entry in os.scandir(directory.path):
+                    if entry.name.endswith(".jpg") and entry.name[:-4] not in live:
+                        os.remove(entry.path)
+        except OSError as e:
+            logger.error(f"Failed to prune poster thumbnails: {e}")
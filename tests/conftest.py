@@ -0,0 +1,47 @@
+"""Shared fixtures: the backend imported against an in-memory MongoDB stand-in (mongomock)."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+# Keep background threads and on-disk state out of the tests.
+os.environ.setdefault("MOVIE_SNAPSHOT_PATH", "")
+os.environ.setdefault("MOVIE_LIVE_SYNC", "0")
+os.environ.setdefault("POPULARITY_REFRESH_SECONDS", "0")
+os.environ.setdefault("POSTER_DIR", os.path.join(ROOT, "tests", "no-posters"))
+os.environ.setdefault("INDEX_BUILD_WORKERS", "1")
+
+from benchmarks.standin import import_backend  # noqa: E402
+from benchmarks.synthetic import generate_movies  # noqa: E402
+
+CATALOG_SIZE = 300
+
+
+@pytest.fixture(scope="session")
+def movies():
+    return [dict(movie, _id=number) for number, movie in enumerate(generate_movies(CATALOG_SIZE, seed=7))]
+
+
+@pytest.fixture(scope="session")
+def backend(movies):
+    module, _ = import_backend([dict(movie) for movie in movies])
+    return module
+
+
+@pytest.fixture
+def build_index(backend):
+    """Build a standalone `MovieIndex` from movie documents (each with an `_id`)."""
+
+    def build(documents):
+        catalog = backend.MovieCatalog()
+        for document in documents:
+            document = dict(document)
+            catalog.set_movie(document.pop("_id"), document)
+        index = backend.MovieIndex(catalog)
+        index.build()
+        return index
+
+    return build
@@ -0,0 +1,72 @@
+from urllib.parse import urlsplit
+
+import pytest
+
+from api_client import MovieApiClient
+
+
+class FlaskSession:
+    """`requests.Session` stand-in that sends each GET through the backend's Flask test client."""
+
+    class Response:
+        def __init__(self, response):
+            self.status_code = response.status_code
+            self.headers = response.headers
+            self._response = response
+
+        def json(self):
+            return self._response.get_json()
+
+        def raise_for_status(self):
+            assert self.status_code < 400, self.status_code
+
+    def __init__(self, app):
+        self.client = app.test_client()
+        self.sent = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.sent.append((urlsplit(url).path, dict(headers or {})))
+        return self.Response(self.client.get(urlsplit(url).path, query_string=params, headers=headers))
+
+
+@pytest.fixture
+def client(backend):
+    return MovieApiClient("http://backend", session=FlaskSession(backend.app))
+
+
+def test_repeated_searches_still_reach_the_backend(backend, client, monkeypatch):
+    recorded, saved = [], []
+    monkeypatch.setattr(backend.suggestion_ranker, "record_query", recorded.append)
+    monkeypatch.setattr(backend.search_history_manager, "save_search", lambda user, movie: saved.append(movie))
+    not_modified = backend.response_cache.stats()["not_modified"]
+
+    first = client.search("The", "api-user")
+    longer = client.search("The ", "api-user")
+    again = client.search("The", "api-user")
+
+    assert first and again == first and all(movie.startswith("the ") for movie in longer)
+    assert recorded == ["the", "the ", "the"] and len(saved) == 3
+    assert client.requests_sent == 3 and client.cache_hits == 0
+    assert "If-None-Match" in client.session.sent[-1][1]
+    assert backend.response_cache.stats()["not_modified"] == not_modified + 1
+
+
+def test_movie_lookups_are_recorded_every_time(backend, client, movies, monkeypatch):
+    selections = []
+    monkeypatch.setattr(backend.suggestion_ranker, "record_selection", selections.append)
+    name = movies[0]["Name"]
+    assert client.movie(name, "api-user")["Name"] == name
+    assert client.movie(name, "api-user")["Name"] == name
+    assert selections == [name, name] and client.requests_sent == 2
+
+
+def test_other_responses_are_cached_then_revalidated(client):
+    top = client.top_rated(5)
+    assert client.top_rated(5) == top
+    assert client.requests_sent == 1 and client.cache_hits == 1
+
+    client.ttl = 0
+    assert client.top_rated(5) == top
+    assert client.requests_sent == 2
+    path, headers = client.session.sent[-1]
+    assert path == "/top-rated" and "If-None-Match" in headers
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+
+from facet_index import FacetIndex
+
+
+def brute_force(rows, genres=(), directors=(), min_year=None, max_year=None, min_rating=None, max_rating=None):
+    def keep(row, skip=None):
+        _, rating, year, _, row_genres, director = row
+        rating = np.float32(rating)
+        return ((skip == "genre" or not genres or set(row_genres) & set(genres))
+                and (skip == "director" or not directors or director.lower() in {d.lower() for d in directors})
+                and (skip == "year" or ((min_year is None or year >= min_year) and (max_year is None or year <= max_year)))
+                and (skip == "rating" or ((min_rating is None or rating >= np.float32(min_rating))
+                                          and (max_rating is None or rating <= np.float32(max_rating)))))
+
+    def counts(skip, value):
+        result = {}
+        for row in rows.values():
+            if keep(row, skip):
+                for key in value(row):
+                    result[key] = result.get(key, 0) + 1
+        return result
+
+    return {
+        "names": {name for name, row in rows.items() if keep(row)},
+        "genre": counts("genre", lambda row: row[4]),
+        "director": counts("director", lambda row: [row[5].lower()] if row[5] else []),
+        "year": counts("year", lambda row: [str(row[2])] if row[2] else []),
+        "rating": counts("rating", lambda row: [str(int(np.floor(np.float32(row[1]))))]),
+    }
+
+
+def test_query_matches_brute_force_through_adds_and_removes(backend, movies):
+    rnd = random.Random(3)
+    rows = {row[0]: row for row in map(backend.movie_facets, movies[:200])}
+    index = FacetIndex()
+    index.build(rows.values())
+    genres = sorted({genre for row in rows.values() for genre in row[4]})
+    directors = sorted({row[5] for row in rows.values()})
+    for step in range(400):
+        movie = rnd.choice(movies)
+        name = movie["Name"].lower()
+        if name in rows and rnd.random() < 0.4:
+            index.remove(name)
+            del rows[name]
+        else:
+            row = backend.movie_facets(dict(movie, IMDb=round(rnd.uniform(1, 10), 1)))
+            index.add(*row)
+            rows[name] = row
+        if index.needs_rebuild():
+            index.build(rows.values())
+        if step % 40:
+            continue
+        for filters in ({}, {"genres": rnd.sample(genres, 2)}, {"directors": rnd.sample(directors, 3)},
+                        {"min_year": 1980, "max_year": 2005}, {"min_rating": 6.5},
+                        {"genres": [rnd.choice(genres)], "min_rating": 5, "max_year": 2010}):
+            expected = brute_force(rows, **filters)
+            for sort in FacetIndex.SORTS:
+                result = index.query(**filters, sort=sort, limit=1000, facet_limit=1000)
+                assert result["total"] == len(expected["names"])
+                assert set(result["names"]) == expected["names"]
+                column = {"rating": 1, "year": 2, "votes": 3}[sort]
+                keys = [np.float32(rows[name][column]) for name in result["names"]]
+                assert keys == sorted(keys, reverse=True)
+            facets = result["facets"]
+            assert facets["genre"] == {genre: count for genre, count in expected["genre"].items() if count}
+            assert {name.lower(): count for name, count in facets["director"].items()} == expected["director"]
+            assert facets["year"] == expected["year"]
+            assert facets["rating"] == expected["rating"]
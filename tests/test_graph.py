@@ -0,0 +1,61 @@
+import random
+from collections import Counter
+
+import networkx as nx
+
+
+def assert_csr_matches(graph):
+    csr = graph.csr()
+    assert set(csr.ids) == set(graph.graph.nodes)
+    for name, data in graph.graph.nodes(data=True):
+        assert sorted(csr.neighbors(name)) == sorted(graph.graph.neighbors(name)), name
+        assert bool(csr.is_actor[csr.ids[name]]) == (data["type"] == "actor")
+
+
+def test_csr_follows_adds_and_removes(backend):
+    rnd = random.Random(4)
+    graph = backend.MovieGraph()
+    actors = [f"actor {number}" for number in range(40)]
+    graph.add_movies((f"movie {number}", rnd.sample(actors, 3)) for number in range(30))
+    assert_csr_matches(graph)
+    for step in range(600):
+        movie = f"movie {rnd.randrange(60)}"
+        if movie in graph.graph and rnd.random() < 0.5:
+            graph.remove_movie(movie)
+        else:
+            graph.remove_movie(movie)
+            graph.add_movie(movie)
+            for actor in rnd.sample(actors, rnd.randint(0, 4)) + [actors[0]]:
+                graph.add_actor(actor)
+                graph.add_edge(actor, movie)
+                graph.add_edge(actor, movie)  # Repeated credits add one edge
+        if step % 25 == 0:
+            assert_csr_matches(graph)
+    assert len(graph._names) <= 2 * len(graph._ids) + 5  # Removed ids are renumbered away
+
+
+def test_graph_endpoints_match_networkx(backend):
+    client = backend.app.test_client()
+    with backend.index_holder.read() as index:
+        graph = index.movie_graph.get_graph()
+        actors = sorted(index.movie_graph.all_actors)
+    actor = max(actors, key=graph.degree)
+
+    co_stars = client.get("/co-stars", query_string={"actor": actor, "limit": 1000}).get_json()["co_stars"]
+    expected = Counter(co_star for movie in graph.neighbors(actor) for co_star in graph.neighbors(movie) if co_star != actor)
+    assert {star["name"]: star["shared_movies"] for star in co_stars} == expected
+    assert [star["shared_movies"] for star in co_stars] == sorted(expected.values(), reverse=True)
+
+    nodes = client.get("/neighborhood", query_string={"name": actor, "k": 3, "limit": 100000}).get_json()["nodes"]
+    distances = nx.single_source_shortest_path_length(graph, actor, cutoff=3)
+    del distances[actor]
+    assert {node["name"]: node["distance"] for node in nodes} == distances
+    assert [node["distance"] for node in nodes] == sorted(node["distance"] for node in nodes)
+
+    reachable = [other for other in actors if other != actor and other in nx.node_connected_component(graph, actor)]
+    for target in reachable[:5]:
+        path = client.get("/actor-path", query_string={"from": actor, "to": target}).get_json()["path"]
+        assert path[0] == actor and path[-1] == target
+        assert all(graph.has_edge(a, b) for a, b in zip(path, path[1:]))
+        assert len(path) - 1 == nx.shortest_path_length(graph, actor, target)
+    assert client.get("/actor-path", query_string={"from": actor}).status_code == 400
@@ -0,0 +1,86 @@
+import threading
+import time
+
+
+def test_update_swaps_and_replays_on_the_retired_copy(backend, build_index, movies):
+    holder = backend.IndexHolder(build_index(movies[:30]))
+    first = holder.current
+    holder.update([("upsert", dict(movies[30]))])
+
+    assert holder.version == 1
+    assert holder.current is not first
+    assert holder._standby is first
+    for index in (holder.current, holder._standby):
+        assert movies[30]["Name"].lower() in index.get_movie_data()
+
+    holder.update([("delete", 30), ("upsert", dict(movies[31]))])
+    assert holder.version == 2
+    for index in (holder.current, holder._standby):
+        assert movies[30]["Name"].lower() not in index.get_movie_data()
+        assert movies[31]["Name"].lower() in index.get_movie_data()
+
+
+def test_pinned_reader_keeps_its_copy_until_it_finishes(backend, build_index, movies):
+    holder = backend.IndexHolder(build_index(movies[:30]))
+    new_name = movies[30]["Name"].lower()
+    with holder.read() as pinned:
+        writer = threading.Thread(target=holder.update, args=([("upsert", dict(movies[30]))],))
+        writer.start()
+        while holder.current is pinned:
+            time.sleep(0.001)
+        time.sleep(0.02)
+        assert writer.is_alive()  # Waiting for this reader before replaying on its copy
+        assert new_name not in pinned.get_movie_data()
+        assert new_name in holder.current.get_movie_data()
+    writer.join(5)
+    assert not writer.is_alive()
+    assert new_name in pinned.get_movie_data()
+
+
+def test_update_publishes_an_up_to_date_graph_csr(backend, build_index, movies):
+    holder = backend.IndexHolder(build_index(movies[:30]))
+    holder.update([("upsert", dict(movies[30])), ("delete", 3)])
+    graph = holder.current.movie_graph
+    assert graph._csr_version == graph._version  # Readers never rebuild it
+    removed = movies[3]["Name"].lower()
+    added = movies[30]["Name"].lower()
+    assert removed not in graph._csr
+    assert sorted(graph._csr.neighbors(added)) == sorted(backend.parse_actors(movies[30]))
+
+
+def test_recommendations_are_refreshed_off_the_update_path(backend, build_index, movies):
+    holder = backend.IndexHolder(build_index(movies[:60]), refresh_interval=0)
+    recommendations = holder.current._recommendations
+    deleted = movies[5]["Name"].lower()
+    popular = holder.current.rating_index.most_voted(backend.RECOMMEND_PRECOMPUTE)
+    source = next(name for name in popular if deleted in [result[0] for result in recommendations[name]])
+    holder.update([("upsert", dict(movies[60])), ("delete", 5)])
+
+    index = holder.current
+    scorer = index._similarity
+    assert index._similarity_version != index.movie_graph._version  # Not rebuilt per update...
+    assert index._recommendations == recommendations  # ...nor emptied
+    assert deleted not in [movie["Name"].lower() for movie in index.recommend(source, backend.MAX_RECOMMENDATIONS)]
+
+    version = holder.version
+    assert holder.refresh_recommendations()
+    assert holder.version == version + 1
+    for index in (holder.current, holder._standby):
+        assert index._similarity is not scorer
+        assert index._similarity_version == index.movie_graph._version
+        assert sorted(index._recommendations) == sorted(index.rating_index.most_voted(backend.RECOMMEND_PRECOMPUTE))
+    for name in popular[:10]:
+        if name != deleted:
+            assert holder.current._recommendations[name] == holder.current._similarity.similar(
+                name, backend.MAX_RECOMMENDATIONS)
+    assert not holder.refresh_recommendations()  # Nothing changed since
+
+
+def test_warm_standby_clones_ahead_of_the_first_update(backend, build_index, movies):
+    holder = backend.IndexHolder(build_index(movies[:20]), refresh_interval=0)
+    holder.start(warm_standby=True)
+    holder.close()
+    standby = holder._standby
+    assert standby is not None and standby is not holder.current
+    holder.update([("delete", 3)])
+    assert holder.current is standby
@@ -0,0 +1,53 @@
+import datetime
+
+import mongomock
+
+from index_snapshot import collection_version, load_snapshot, save_snapshot
+
+
+def test_restored_index_accepts_updates(backend, build_index, movies, tmp_path):
+    path = str(tmp_path / "movie_index.snap")
+    save_snapshot(path, "v1", {"index": build_index(movies[:50])})
+    assert load_snapshot(path, "v2") is None
+
+    restored = load_snapshot(path, "v1")["index"]
+    assert not restored.facet_index.live.flags.writeable  # A view into the read-only mmap
+    holder = backend.IndexHolder(restored)
+    upserted = dict(movies[10], IMDb=9.9, Genre="Western")
+    holder.update([("upsert", upserted), ("delete", 11), ("upsert", dict(movies[60]))])
+    holder.update([("upsert", dict(movies[61]))])
+
+    for index in (holder.current, holder._standby):
+        data = index.get_movie_data()
+        assert movies[11]["Name"].lower() not in data
+        assert movies[60]["Name"].lower() in data and movies[61]["Name"].lower() in data
+        assert index.browse(genres=["western"])["movies"][0]["Name"] == upserted["Name"]
+
+
+class LookupOnlyCollection:
+    """Fails the test if computing the version issues a server command or iterates the collection."""
+
+    def __init__(self, collection):
+        self._collection = collection
+        self.database = None
+
+    def find(self, *args, **kwargs):
+        raise AssertionError("collection_version must not scan the collection")
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+def test_collection_version_uses_cheap_lookups_and_stamped_edits(movies):
+    plain = mongomock.MongoClient().db.movies
+    plain.insert_many([dict(movie) for movie in movies[:20]])
+    collection = LookupOnlyCollection(plain)
+    before = collection_version(collection)
+
+    plain.update_one({"_id": movies[3]["_id"]}, {"$set": {"IMDb": 1.0}})
+    assert collection_version(collection) == before  # Only stamped edits are noticed
+    plain.update_one({"_id": movies[3]["_id"]}, {"$set": {"updated_at": datetime.datetime(2026, 1, 1)}})
+    stamped = collection_version(collection)
+    assert stamped != before
+    plain.delete_one({"_id": movies[5]["_id"]})
+    assert collection_version(collection) != stamped
@@ -0,0 +1,55 @@
+import time
+
+from metrics import MetricsRegistry, SlowRequestProfiler
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ["route"])
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.gauge("answer", "Computed at scrape time.", function=lambda: 42)
+    registry.gauge("broken", "Fails to read.", function=lambda: 1 / 0)
+    requests.labels('/say "hi"').inc()
+    requests.labels('/say "hi"').inc(2)
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+
+    lines = registry.render().splitlines()
+    assert lines[:3] == ["# HELP requests_total Requests.", "# TYPE requests_total counter",
+                         'requests_total{route="/say \\"hi\\""} 3']
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines and 'latency_seconds_bucket{le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in lines and "latency_seconds_count 3" in lines
+    assert "latency_seconds_sum 5.55" in lines
+    assert "answer 42" in lines and not any(line.startswith("broken") for line in lines if "#" not in line)
+
+
+def test_metrics_endpoint_counts_requests_by_route_pattern(backend, movies):
+    client = backend.app.test_client()
+    client.get(f"/movie/{movies[0]['Name']}")
+    client.get(f"/movie/{movies[1]['Name']}")
+    response = client.get("/metrics")
+    assert response.mimetype == "text/plain" and "version=0.0.4" in response.headers["Content-Type"]
+    text = response.get_data(as_text=True)
+    line = next(line for line in text.splitlines()
+                if line.startswith('http_requests_total{route="/movie/<string:movie_name>",method="GET",status="200"}'))
+    assert int(line.split()[-1]) >= 2
+    assert f"movies_indexed {len(backend.index_holder.current.get_movie_data())}" in text
+    assert 'http_request_duration_seconds_count{route="/movie/<string:movie_name>",method="GET"}' in text
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_slow_request_profiler_reports_where_time_went():
+    profiler = SlowRequestProfiler(threshold=0.02, interval=0.002)
+    profiler.start_request()
+    spin(0.001)
+    assert profiler.finish_request(0.001, "GET /fast") is None
+
+    profiler.start_request()
+    spin(0.1)
+    report = profiler.finish_request(0.1, "GET /slow")
+    assert report.startswith("Slow request GET /slow: 100.0 ms") and "spin (test_metrics.py" in report
@@ -0,0 +1,44 @@
+import datetime
+
+
+def test_movies_read_back_as_stored(backend):
+    catalog = backend.MovieCatalog()
+    stored = [
+        {"Name": "Strings", "Year": "1999", "IMDb": "9.0", "Votes": "2,500,000", "Genre": ["Drama", "Crime"],
+         "Director": "Someone", "Actors": "A One, B Two"},
+        {"Name": "Missing", "Year": "N/A", "IMDb": "n/a", "Votes": "N/A", "Genre": "", "Actors": ["C Three ", ""]},
+        {"Name": "Typed", "Year": 2001, "IMDb": 7.5, "Votes": 1200, "Genre": "Comedy", "Actors": ["D Four"]},
+    ]
+    for movie_id, movie in enumerate(stored):
+        catalog.set_movie(movie_id, dict(movie))
+    data = catalog.get_movie_data()
+    for movie in stored:
+        assert data[movie["Name"].lower()] == movie
+        assert {field: type(value) for field, value in data[movie["Name"].lower()].items()} == \
+            {field: type(value) for field, value in movie.items()}
+    assert 2 not in catalog._originals  # Values the columns reproduce are not stored twice
+
+    data["strings"]["Genre"].append("Mutated")
+    catalog.set_movie(0, {"Name": "Strings", "IMDb": 8})
+    assert catalog.get_movie_data()["strings"] == {"Name": "Strings", "IMDb": 8}
+
+    index = backend.MovieIndex(catalog)
+    index.build()
+    assert index.rating_index.top(1)[0]["Name"] == "Strings"
+
+
+def test_movie_endpoint_returns_stored_values_without_bookkeeping_fields(backend):
+    collection = backend.movie_data_manager.collection
+    document = {"Name": "Round Trip", "Year": "2004", "IMDb": "9.0", "Votes": "2,500,000", "Genre": ["Drama"],
+                "Director": "N/A", "Actors": "E Five", "Trailer_URL": "https://example.com/t",
+                "updated_at": datetime.datetime(2026, 1, 1)}
+    document["_id"] = collection.insert_one(dict(document)).inserted_id
+    backend.apply_movie_upsert(dict(document))
+    client = backend.app.test_client()
+
+    expected = {field: value for field, value in document.items() if field not in ("_id", "updated_at")}
+    assert client.get("/movie/round trip").get_json() == expected
+    backend.movie_details_cache.discard(document["_id"])  # Read the cold fields from MongoDB this time
+    backend.apply_movie_upsert(dict(document, Votes="2,500,001"))
+    backend.movie_details_cache.discard(document["_id"])
+    assert client.get("/movie/round trip").get_json() == dict(expected, Votes="2,500,001")
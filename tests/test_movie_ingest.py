@@ -0,0 +1,121 @@
+import io
+import re
+from datetime import timedelta
+
+import mongomock
+import pytest
+
+from movie_ingest import InvalidMovie, MovieIngestor, normalize_movie, read_records
+from movie_sync import MovieIndexSync
+
+
+class BulkUpsertCollection:
+    """mongomock collection whose `bulk_write` runs pymongo `UpdateOne` upserts one by one.
+
+    mongomock's own `bulk_write` does not accept the `UpdateOne` of current pymongo releases,
+    and it ignores collations, so a case-insensitive one is applied as an anchored regex.
+    """
+
+    class Result:
+        def __init__(self):
+            self.upserted_count = 0
+            self.matched_count = 0
+
+    def __init__(self):
+        self._collection = mongomock.MongoClient().db.movies
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    def bulk_write(self, operations, ordered=True):
+        result = self.Result()
+        for operation in operations:
+            query = operation._filter
+            if operation._collation:
+                query = {field: {"$regex": f"^{re.escape(value)}$", "$options": "i"} for field, value in query.items()}
+            written = self._collection.update_one(query, operation._doc, upsert=True)
+            if written.upserted_id is not None:
+                result.upserted_count += 1
+            else:
+                result.matched_count += written.matched_count
+        return result
+
+
+def test_normalize_movie_cleans_and_validates():
+    movie = normalize_movie({"_id": "x", "Name": " Heat ", "Year": "1995", "IMDb": "8.3", "Votes": "1,234",
+                             "Genre": ["Crime", " Drama "], "Actors": "Al Pacino, Robert De Niro, Al Pacino",
+                             "Director": "", None: ["extra"]})
+    assert movie == {"Name": "Heat", "Year": 1995, "IMDb": 8.3, "Votes": 1234, "Genre": "Crime, Drama",
+                     "Actors": ["Al Pacino", "Robert De Niro"]}
+    for record in ({"Year": 2000}, {"Name": "A", "Year": "1800"}, {"Name": "A", "IMDb": "11"},
+                   {"Name": "A", "Votes": "1.5"}, {"Name": "A", "Actors": 3}, []):
+        with pytest.raises(InvalidMovie):
+            normalize_movie(record)
+
+
+def test_read_records_reports_line_numbers():
+    ndjson = list(read_records(io.StringIO('{"Name": "A"}\n\n{oops\n')))
+    assert ndjson[0] == (1, {"Name": "A"})
+    assert ndjson[1][0] == 3 and isinstance(ndjson[1][1], InvalidMovie)
+    rows = list(read_records(io.StringIO('Name,Year\nA,2000\n"B, The",2001\n'), "csv"))
+    assert rows == [(2, {"Name": "A", "Year": "2000"}), (3, {"Name": "B, The", "Year": "2001"})]
+
+
+def test_ingest_upserts_in_batches_and_reports_invalid_rows():
+    collection = BulkUpsertCollection()
+    collection.insert_one({"Name": "Kept", "Year": 1990, "Trailer_URL": "t"})
+    batches = []
+    ingestor = MovieIngestor(collection, on_batch=batches.append, batch_size=2)
+    records = [(1, {"Name": "A", "IMDb": "7"}), (2, {"Name": "B"}), (3, {"Year": "x"}),
+               (4, {"Name": "Kept", "IMDb": 8}), (5, InvalidMovie("invalid JSON")), (6, {"Name": "A", "IMDb": 9})]
+    report = ingestor.ingest(records)
+
+    assert report == {"received": 6, "invalid": 2, "inserted": 2, "updated": 2, "batches": 2,
+                      "errors": [{"line": 3, "error": "'Name' is required"}, {"line": 5, "error": "invalid JSON"}]}
+    assert [sorted(document["Name"] for document in batch) for batch in batches] == [["A", "B"], ["A", "Kept"]]
+    kept = collection.find_one({"Name": "Kept"})
+    assert kept["IMDb"] == 8 and kept["Trailer_URL"] == "t" and "updated_at" in kept
+    assert collection.find_one({"Name": "A"})["IMDb"] == 9
+    assert collection.count_documents({}) == 3
+
+
+def test_ingest_matches_names_ignoring_case():
+    collection = BulkUpsertCollection()
+    collection.insert_one({"Name": "Dune", "Year": 1984})
+    report = MovieIngestor(collection, batch_size=10).ingest([(1, {"Name": "DUNE", "IMDb": 6.3}),
+                                                              (2, {"Name": "dune", "Votes": 150000})])
+    assert report["inserted"] == 0 and report["updated"] == 1
+    assert collection.count_documents({}) == 1
+    stored = collection.find_one({})
+    assert (stored["Name"], stored["Year"], stored["Votes"]) == ("dune", 1984, 150000) and "IMDb" not in stored
+
+
+def test_ingest_endpoint_updates_the_indexes(backend, monkeypatch):
+    monkeypatch.setattr(backend.movie_data_manager, "collection", BulkUpsertCollection())
+    client = backend.app.test_client()
+    body = '{"Name": "Ingested Feature", "IMDb": 8.1, "Actors": "Ingest Star, Other Star"}\n{"Year": 1}\n'
+    response = client.post("/ingest?batch_size=10", data=body)
+    assert response.status_code == 200
+    assert response.get_json()["inserted"] == 1 and response.get_json()["invalid"] == 1
+    assert client.get("/search", query_string={"prefix": "ingested f"}).get_json()["movies"] == ["ingested feature"]
+    assert "Ingested Feature" in client.get("/movies-by-actor", query_string={"prefix": "ingest star"}).get_json()["movies"]
+    assert client.post("/ingest?format=xml", data="").status_code == 400
+
+
+def test_live_sync_skips_batches_the_ingest_endpoint_applied(backend, monkeypatch):
+    collection = BulkUpsertCollection()
+    monkeypatch.setattr(backend.movie_data_manager, "collection", collection)
+    sync = MovieIndexSync(collection, backend.apply_movie_upsert, backend.apply_movie_delete,
+                          known_ids=lambda: backend.index_holder.current.catalog.known_ids())
+    monkeypatch.setattr(backend, "movie_sync", sync)
+    client = backend.app.test_client()
+    body = '{"Name": "Synced Once", "Actors": "Sync Star"}\n{"Name": "Synced Twice"}\n'
+    assert client.post("/ingest", data=body).status_code == 200
+    version = backend.index_holder.version
+    assert sync.poll_once() == 0
+    assert backend.index_holder.version == version
+
+    edited_at = collection.find_one({"Name": "Synced Twice"})["updated_at"] + timedelta(seconds=1)
+    collection.update_one({"Name": "Synced Twice"}, {"$set": {"IMDb": 7.7, "updated_at": edited_at}})
+    assert sync.poll_once() == 1
+    assert backend.index_holder.current.get_movie_data()["synced twice"]["IMDb"] == 7.7
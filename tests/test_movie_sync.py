@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+from movie_sync import MovieIndexSync, read_watermark
+
+T0 = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def collection(movies):
+    collection = mongomock.MongoClient().db.movies
+    collection.insert_many([dict(movie) for movie in movies[:50]])
+    return collection
+
+
+@pytest.fixture
+def holder(backend, build_index, movies):
+    return backend.IndexHolder(build_index(movies[:50]))
+
+
+def make_sync(collection, holder):
+    return MovieIndexSync(collection, lambda document: holder.update([("upsert", document)]),
+                          lambda movie_id: holder.update([("delete", movie_id)]),
+                          known_ids=lambda: holder.current.catalog.known_ids())
+
+
+def names(holder):
+    return set(holder.current.get_movie_data())
+
+
+def test_watermark_starts_at_newest_document(collection, holder):
+    collection.update_one({"_id": 0}, {"$set": {"updated_at": T0}})
+    sync = make_sync(collection, holder)
+    assert sync.watermark == T0
+    assert sync.poll_once() == 0
+
+
+def test_poll_applies_only_changes_past_the_watermark(collection, holder, movies):
+    collection.update_one({"_id": 0}, {"$set": {"updated_at": T0}})
+    sync = make_sync(collection, holder)
+    collection.update_one({"_id": 1}, {"$set": {"Name": "Brand New Title", "IMDb": 9.9,
+                                                "updated_at": T0 + timedelta(seconds=1)}})
+    collection.update_one({"_id": 2}, {"$set": {"Name": "Unstamped Rename"}})
+
+    assert sync.poll_once() == 1
+    assert sync.watermark == T0 + timedelta(seconds=1)
+    assert "brand new title" in names(holder)
+    assert movies[1]["Name"].lower() not in names(holder)
+    assert "unstamped rename" not in names(holder)
+    assert sync.poll_once() == 0
+
+
+def test_first_poll_without_watermark_takes_every_stamped_document(collection, holder):
+    sync = make_sync(collection, holder)
+    assert sync.watermark is None
+    collection.update_one({"_id": 5}, {"$set": {"Name": "Stamped Later", "updated_at": T0}})
+    assert sync.poll_once() == 1
+    assert "stamped later" in names(holder)
+
+
+def test_sweep_applies_deletes_and_unstamped_inserts(collection, holder, movies):
+    sync = make_sync(collection, holder)
+    collection.delete_one({"_id": 3})
+    collection.insert_one({"_id": 1000, "Name": "Found By Sweep", "Year": 2001, "IMDb": 7.5,
+                           "Genre": "Drama", "Actors": ["Sweep Actor"]})
+
+    assert sync.poll_once() == 0
+    assert sync.poll_once(sweep=True) == 2
+    index = holder.current
+    assert movies[3]["Name"].lower() not in names(holder)
+    assert "found by sweep" in index.movie_trie_manager.search_movies("found by")
+    assert index.movie_graph.get_movies_by_actor("sweep actor") == ["found by sweep"]
+    assert sync.poll_once(sweep=True) == 0
+
+
+def test_change_stream_events_update_every_index(collection, holder, movies):
+    sync = make_sync(collection, holder)
+    document = dict(movies[4], Name="Streamed Title", IMDb=9.8, Genre="Western")
+    sync.apply_change({"operationType": "update", "fullDocument": document})
+    index = holder.current
+    assert index.movie_trie_manager.search_movies("streamed") == ["streamed title"]
+    assert index.title_index.search("streamed ti") == ["streamed title"]
+    assert index.rating_index.top(1, genre="western")[0]["Name"] == "Streamed Title"
+    assert index.browse(genres=["western"])["movies"][0]["Name"] == "Streamed Title"
+
+    sync.apply_change({"operationType": "delete", "documentKey": {"_id": 4}})
+    assert "streamed title" not in names(holder)
+    assert index.title_index.search("streamed") == []
+
+    sync.apply_change({"operationType": "update", "fullDocument": None, "documentKey": {"_id": 5}})
+    assert movies[5]["Name"].lower() not in names(holder)
+
+
+def test_versions_marked_applied_are_skipped_once(collection, holder):
+    sync = make_sync(collection, holder)
+    collection.update_one({"_id": 6}, {"$set": {"Name": "Written By Ingest", "updated_at": T0}})
+    sync.mark_applied([collection.find_one({"_id": 6})])
+    version = holder.version
+    assert sync.poll_once() == 0
+    assert sync.watermark == T0 and holder.version == version
+
+    sync.mark_applied([collection.find_one({"_id": 6})])
+    later = dict(collection.find_one({"_id": 6}), Name="Edited Since", updated_at=T0 + timedelta(seconds=1))
+    sync.apply_change({"operationType": "update", "fullDocument": later})
+    assert "edited since" in names(holder)
+
+
+def test_same_named_movies_do_not_flip_on_every_sweep(collection, holder):
+    collection.insert_many([{"_id": 2001, "Name": "Dune", "Year": 1984, "IMDb": 6.3},
+                            {"_id": 2002, "Name": "Dune", "Year": 2021, "IMDb": 8.0}])
+    sync = make_sync(collection, holder)
+    assert sync.poll_once(sweep=True) == 2
+    year = holder.current.get_movie_data()["dune"]["Year"]
+    version = holder.version
+    for _ in range(3):
+        sync.poll_once(sweep=True)
+    assert holder.version == version and holder.current.get_movie_data()["dune"]["Year"] == year
+
+    # Once the indexed one goes, the sweep brings the other one back.
+    collection.delete_one({"Year": year})
+    sync.poll_once(sweep=True)
+    sync.poll_once(sweep=True)
+    assert holder.current.get_movie_data()["dune"]["Year"] == ({1984, 2021} - {year}).pop()
+
+
+def test_unchanged_documents_do_not_swap(collection, holder):
+    sync = make_sync(collection, holder)
+    version = holder.version
+    sync.apply_change({"operationType": "replace", "fullDocument": collection.find_one({"_id": 7})})
+    sync.apply_change({"operationType": "delete", "documentKey": {"_id": 99999}})
+    assert holder.version == version
+
+
+def test_watermark_read_before_loading_keeps_writes_made_during_the_load(collection, holder):
+    collection.update_one({"_id": 0}, {"$set": {"updated_at": T0}})
+    watermark = read_watermark(collection)
+    collection.update_one({"_id": 8}, {"$set": {"Name": "Written During Load", "updated_at": T0 + timedelta(seconds=1)}})
+    sync = MovieIndexSync(collection, lambda document: holder.update([("upsert", document)]),
+                          lambda movie_id: holder.update([("delete", movie_id)]),
+                          known_ids=lambda: holder.current.catalog.known_ids(), watermark=watermark)
+    assert sync.poll_once() == 1
+    assert "written during load" in names(holder)
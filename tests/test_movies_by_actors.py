@@ -0,0 +1,43 @@
+def actor_movies(backend, actor):
+    return backend.index_holder.current.movie_graph.get_movies_by_actor(actor)
+
+
+def test_post_returns_full_records_for_every_actor(backend, movies):
+    by_name = {movie["Name"].lower(): movie for movie in movies}
+    first, second = movies[0]["Actors"][0], movies[1]["Actors"][0]
+    body = {"actors": [first.upper(), f" {second} ", first, 7, "", "Nobody At All"]}
+    response = backend.app.test_client().post("/movies-by-actors", json=body)
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["actors"] == [first.lower(), second.lower(), "nobody at all"]
+    assert data["movies"]["nobody at all"] == []
+    for actor in (first.lower(), second.lower()):
+        records = data["movies"][actor]
+        assert [record["Name"].lower() for record in records] == actor_movies(backend, actor)
+        for record in records:
+            stored = by_name[record["Name"].lower()]
+            # Resident fields plus the ones read from MongoDB, without internal fields.
+            assert record["Trailer_URL"] == stored["Trailer_URL"] and record["Year"] == stored["Year"]
+            assert "_id" not in record
+
+
+def test_get_looks_actors_up_by_prefix(backend, movies):
+    client = backend.app.test_client()
+    actor = movies[2]["Actors"][0].lower()
+    data = client.get("/movies-by-actors", query_string={"prefix": actor[:3], "limit": 3}).get_json()
+    assert 0 < len(data["actors"]) <= 3 and all(name.startswith(actor[:3]) for name in data["actors"])
+    assert set(data["movies"]) == set(data["actors"])
+
+    exact = client.get("/movies-by-actors", query_string={"prefix": actor, "limit": 1}).get_json()
+    assert exact["actors"] == [actor]
+    typo = client.get("/movies-by-actors", query_string={"prefix": actor[:-1] + "#", "fuzzy": 1}).get_json()
+    assert actor in typo["actors"]
+    assert client.get("/movies-by-actors").get_json()["actors"] == []
+
+
+def test_post_rejects_non_lists_and_caps_the_batch(backend):
+    client = backend.app.test_client()
+    assert client.post("/movies-by-actors", json={"actors": "a, b"}).status_code == 400
+    many = [f"actor {number}" for number in range(backend.MAX_BATCH_ACTORS + 20)]
+    assert len(client.post("/movies-by-actors", json={"actors": many}).get_json()["actors"]) == backend.MAX_BATCH_ACTORS
@@ -0,0 +1,80 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from popularity import CountMinSketch, PopularityCounter
+
+
+def test_sketch_never_underestimates_and_decays():
+    sketch = CountMinSketch(width=64, depth=3)
+    counts = Counter({f"key{i}": i % 7 + 1 for i in range(500)})
+    sketch.add(list(counts), np.array(list(counts.values()), dtype=np.float32))
+    estimates = sketch.estimate(list(counts))
+    assert all(estimate >= count for estimate, count in zip(estimates, counts.values()))
+    sketch.decay(0.5)
+    assert np.allclose(sketch.estimate(list(counts)), estimates / 2)
+    with pytest.raises(ValueError):
+        CountMinSketch(width=100)
+
+
+def test_counter_keeps_the_heaviest_keys_and_decays_by_half_life():
+    counter = PopularityCounter(half_life=100.0, top_k=2, max_pending=3, min_count=1.0)
+    for key, count in (("a", 8), ("b", 4), ("c", 2)):
+        counter.record(key, count)
+    counter.record("d")
+    assert counter.dropped == 1
+    assert counter.refresh(now=counter._refreshed_at) is True
+    assert counter.scores == {"a": 8.0, "b": 4.0} and counter.hottest(1) == ["a"]
+
+    assert counter.refresh(now=counter._refreshed_at + 100.0) is False  # Same keys, just decayed
+    assert counter.scores == {"a": 4.0, "b": 2.0}
+    counter.refresh(now=counter._refreshed_at + 200.0)
+    assert counter.scores == {"a": 1.0}  # "b" fell below min_count
+
+
+@pytest.fixture
+def ranker(backend, build_index, movies):
+    holder = backend.IndexHolder(build_index(movies[:80]))
+    return backend.SuggestionRanker(holder, refresh_interval=0, hot_results=5)
+
+
+def shared_prefix(index):
+    """The first letter of the most titles, with its names in trie (rating) order."""
+    letter = Counter(name[0] for name in index.get_movie_data()).most_common(1)[0][0]
+    return letter, index.movie_trie_manager.search_movies(letter, None, True)
+
+
+def test_picked_titles_rank_first_then_the_rest_by_rating(ranker):
+    index = ranker.index_holder.current
+    prefix, by_rating = shared_prefix(index)
+    assert len(by_rating) >= 4
+    least, second_least = by_rating[-1], by_rating[-2]
+    for _ in range(3):
+        ranker.record_selection(least.title())
+    ranker.record_selection(second_least)
+    ranker.record_selection("no such movie")
+    version = ranker.version
+    ranker.refresh()
+    assert ranker.version == version + 1
+
+    expected = [least, second_least] + [name for name in by_rating if name not in (least, second_least)]
+    assert ranker.suggest(index, prefix) == expected
+    assert ranker.suggest(index, prefix, 3) == expected[:3]
+    assert ranker.suggest(index, prefix + "\U0010ffff", 3) == []
+
+
+def test_hot_prefixes_are_precomputed_until_the_index_changes(backend, ranker, movies):
+    index = ranker.index_holder.current
+    prefix, by_rating = shared_prefix(index)
+    ranker.record_query(prefix)
+    ranker.refresh()
+    hot = backend.SUGGESTION_LOOKUPS.labels("hot")
+    before = hot.value
+    assert ranker.suggest(index, prefix, 3) == by_rating[:3]
+    assert hot.value == before + 1
+
+    ranker.index_holder.update([("upsert", dict(movies[90], Name=prefix.upper() + " Best Ever", IMDb=10.0))])
+    with ranker.index_holder.read() as index:
+        assert ranker.suggest(index, prefix, 3)[0] == prefix + " best ever"
+    assert hot.value == before + 1
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from posters import PosterStore, poster_key
+
+Image = pytest.importorskip("PIL.Image")
+
+SIZES = {"thumb": (40, 60), "card": (80, 120)}
+
+
+def write_poster(directory, file_name, color):
+    Image.new("RGB", (300, 200), color).save(os.path.join(directory, file_name))
+
+
+def stored_files(directory):
+    return {name[:-4] for _, _, names in os.walk(directory) for name in names if name.endswith(".jpg")}
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    source, output = tmp_path / "posters", tmp_path / "cache"
+    source.mkdir()
+    write_poster(source, "The Dark Knight.jpg", "red")
+    write_poster(source, "Amélie.png", "green")
+    return str(source), str(output)
+
+
+def test_poster_keys_ignore_case_accents_and_punctuation():
+    assert poster_key("The Dark Knight") == poster_key("the-dark_knight!") == "the-dark-knight"
+    assert poster_key("Amélie") == "amelie"
+
+
+def test_build_renders_every_size_and_restarts_from_the_manifest(dirs):
+    store = PosterStore(*dirs, sizes=SIZES, workers=1)
+    store.build()
+    assert len(store) == 2
+    digest = store.digest("THE DARK KNIGHT", "card")
+    with Image.open(store.path(digest)) as image:
+        assert image.size == (80, 120)
+    assert store.path("../" + digest) is None and store.digest("Heat", "card") is None
+
+    restarted = PosterStore(*dirs, sizes=SIZES, workers=1)
+    assert restarted.digest("the dark knight", "card") == digest  # Served before the rebuild runs
+    resized = PosterStore(*dirs, sizes={"card": (60, 90)}, workers=1)
+    assert len(resized) == 0  # Different sizes invalidate the manifest
+
+
+def test_prune_deletes_thumbnails_no_poster_refers_to(dirs):
+    source, output = dirs
+    store = PosterStore(source, output, sizes=SIZES, workers=1)
+    store.build()
+    amelie = set(store._thumbnails["amelie"].values())
+    stray = os.path.join(output, "ab", "ab" * 16 + ".jpg")
+    os.makedirs(os.path.dirname(stray), exist_ok=True)
+    open(stray, "wb").close()
+
+    os.remove(os.path.join(source, "Amélie.png"))
+    store.build()
+    assert store.digest("amelie", "card") is None
+    assert stored_files(output) == set(store._thumbnails["the-dark-knight"].values())
+    assert not amelie & stored_files(output)
+
+
+def test_poster_routes_redirect_to_immutable_files(backend, dirs, monkeypatch):
+    store = PosterStore(*dirs, sizes=SIZES, workers=1)
+    store.build()
+    monkeypatch.setattr(backend, "poster_store", store)
+    client = backend.app.test_client()
+
+    redirect = client.get("/poster/The Dark Knight", query_string={"size": "thumb"})
+    digest = store.digest("the dark knight", "thumb")
+    assert redirect.status_code == 302 and redirect.headers["Location"].endswith(f"/posters/{digest}.jpg")
+    image = client.get(f"/posters/{digest}.jpg")
+    assert image.status_code == 200 and image.mimetype == "image/jpeg"
+    assert "immutable" in image.headers["Cache-Control"] and "max-age=31536000" in image.headers["Cache-Control"]
+    assert client.get(f"/posters/{digest}.jpg", headers={"If-None-Match": f'"{digest}"'}).status_code == 304
+
+    assert client.get("/poster/Unknown Film").status_code == 404
+    assert client.get("/poster/The Dark Knight", query_string={"size": "huge"}).status_code == 400
+    assert client.get("/posters/not-a-digest.jpg").status_code == 404
@@ -0,0 +1,59 @@
+import itertools
+import random
+
+import pytest
+
+
+def brute_force(movies, n, offset, genre, min_year, max_year, min_votes, backend):
+    rows = []
+    for movie in movies.values():
+        if not movie.get("IMDb"):
+            continue
+        year, votes = int(movie.get("Year") or 0), backend.movie_votes(movie)
+        if genre and genre.lower() not in backend.movie_genres(movie):
+            continue
+        if (min_year is not None and year < min_year) or (max_year is not None and year > max_year):
+            continue
+        if min_votes is not None and votes < min_votes:
+            continue
+        rows.append(((-float(movie["IMDb"]), -year, movie["Name"].lower()), movie["Name"]))
+    return [name for _, name in sorted(rows)[offset:offset + n]]
+
+
+@pytest.fixture
+def catalog(movies):
+    return {movie["Name"].lower(): {field: value for field, value in movie.items() if field != "_id"}
+            for movie in movies}
+
+
+def assert_matches(index, catalog, backend):
+    for genre, (min_year, max_year), min_votes in itertools.product(
+            (None, "Drama", "western"), ((None, None), (1990, None), (None, 1975), (1980, 1999)),
+            (None, 0, 500, 20_000)):
+        for n, offset in ((10, 0), (5, 7)):
+            result = index.top(n, offset, genre, min_year, max_year, min_votes)
+            expected = brute_force(catalog, n, offset, genre, min_year, max_year, min_votes, backend)
+            assert [row["Name"] for row in result] == expected, (genre, min_year, max_year, min_votes, offset)
+
+
+def test_filtered_top_matches_a_full_scan(backend, catalog):
+    index = backend.RatingIndex()
+    index.build(catalog.values())
+    assert_matches(index, catalog, backend)
+
+
+@pytest.mark.parametrize("batch_size", [1, 200])
+def test_filtered_top_stays_correct_through_updates(backend, catalog, batch_size):
+    rnd = random.Random(11)
+    index = backend.RatingIndex()
+    index.build(catalog.values())
+    names = sorted(catalog)
+    with index.batch(batch_size):
+        for name in rnd.sample(names, 40):
+            index.remove_movie(name)
+            del catalog[name]
+        for name in rnd.sample(sorted(catalog), 40):
+            movie = dict(catalog[name], Votes=rnd.choice([0, 90, 999, 1000, 45_000]), Year=rnd.randint(1960, 2020))
+            index.add_movie(movie)
+            catalog[name] = movie
+    assert_matches(index, catalog, backend)
@@ -0,0 +1,39 @@
+def test_entries_are_reused_until_the_version_moves(backend):
+    version = [0]
+    cache = backend.ResponseCache(lambda: version[0], max_entries=2)
+    computed = []
+
+    def compute(value):
+        computed.append(value)
+        return {"value": value}
+
+    first = cache.fetch("a", lambda: compute(1))
+    assert cache.fetch("a", lambda: compute(2)) is first and computed == [1]
+    version[0] += 1
+    assert cache.fetch("a", lambda: compute(3)).payload == {"value": 3}
+    cache.fetch("b", lambda: compute(4))
+    cache.fetch("c", lambda: compute(5))
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 4, 1)
+
+
+def test_etag_revalidation_answers_304_until_the_index_changes(backend, movies):
+    client = backend.app.test_client()
+    first = client.get("/top-rated", query_string={"N": 3})
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+
+    again = client.get("/top-rated", query_string={"N": 3}, headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b"" and again.headers["ETag"] == etag
+    other = client.get("/top-rated", query_string={"N": 4}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+    best = dict(movies[0], _id="cache-test", Name="Cache Test Classic", IMDb=10.0)
+    backend.index_holder.update([("upsert", best)])
+    try:
+        changed = client.get("/top-rated", query_string={"N": 3}, headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+        assert changed.get_json()["top_movies"][0]["Name"] == "Cache Test Classic"
+    finally:
+        backend.index_holder.update([("delete", "cache-test")])
+    assert client.get("/top-rated", query_string={"N": 3}).headers["ETag"] == etag
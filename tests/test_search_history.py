@@ -0,0 +1,45 @@
+import datetime
+
+import mongomock
+
+
+class ListStore:
+    def __init__(self, events=()):
+        self.events = list(events)
+        self.reads = []
+
+    def write(self, events):
+        self.events.extend(events)
+
+    def read_user(self, user_id, limit):
+        self.reads.append(user_id)
+        return [movie for user, movie, _ in self.events if user == user_id][-limit:]
+
+
+def test_persisted_history_is_read_lazily_and_once_per_user(backend):
+    now = datetime.datetime(2026, 1, 1)
+    store = ListStore([("ann", "Alien", now), ("ann", "Heat", now), ("bob", "Up", now), ("ann", "Jaws", now)])
+    manager = backend.SearchHistoryManager(max_items_per_user=3, max_users=2, store=store, flush_interval=3600)
+    try:
+        assert store.reads == []  # Nothing read at startup
+        manager.save_search("ann", "Brazil")
+        manager.save_search("ann", "heat")
+        assert manager.get_search_history("ann") == ["Jaws", "Brazil", "heat"]
+        assert manager.get_search_history("ann") == ["Jaws", "Brazil", "heat"]
+        assert store.reads == ["ann"]
+
+        assert manager.get_search_history("bob") == ["Up"]
+        manager.save_search("cy", "Ran")  # Evicts ann, the least recently active user
+        assert manager.get_search_history("ann") == ["Alien", "Heat", "Jaws"]
+        assert store.reads == ["ann", "bob", "ann"]
+    finally:
+        manager.close()
+
+
+def test_mongo_store_reads_a_users_most_recent_events(backend):
+    store = backend.MongoHistoryStore(mongomock.MongoClient().db.search_history)
+    start = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=1)  # Inside the TTL
+    store.write([("ann", f"Movie {number}", start + datetime.timedelta(seconds=number)) for number in range(5)])
+    store.write([("bob", "Other", start)])
+    assert store.read_user("ann", 3) == ["Movie 2", "Movie 3", "Movie 4"]
+    assert store.read_user("nobody", 3) == []
@@ -0,0 +1,34 @@
+import random
+
+
+def brute_force(backend, movies, query, limit):
+    words = backend.title_words(query)
+    *required, partial = words
+    matches = []
+    for movie in movies.values():
+        title = backend.title_words(movie["Name"])
+        if all(word in title for word in required) and any(word.startswith(partial) for word in title):
+            rating, year = backend.movie_rank(movie)
+            matches.append((-rating, -year, movie["Name"].lower()))
+    return [name for _, _, name in sorted(matches)[:limit]]
+
+
+def test_search_matches_brute_force_through_adds_and_removes(backend, movies):
+    rnd = random.Random(5)
+    live = {movie["Name"].lower(): movie for movie in movies[:200]}
+    index = backend.TitleIndex()
+    index.build(live.values())
+    queries = ["the", "the d", "love", "night of", "l", "dark nig", "of the", "zzz", "christmas st"]
+    for step in range(300):
+        movie = rnd.choice(movies)
+        if movie["Name"].lower() in live and rnd.random() < 0.5:
+            index.remove_movie(movie["Name"])
+            del live[movie["Name"].lower()]
+        else:
+            movie = dict(movie, IMDb=round(rnd.uniform(1, 10), 1))
+            index.add_movie(movie)
+            live[movie["Name"].lower()] = movie
+        if step % 30 == 0:
+            for query in queries:
+                for limit in (1, 5, 1000):
+                    assert index.search(query, limit) == brute_force(backend, live, query, limit), (query, limit)
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+
+@pytest.fixture(params=["Trie", "RadixTrie"])
+def trie_class(request, backend):
+    return getattr(backend, request.param)
+
+
+def words(rnd, count):
+    alphabet = "abcde "
+    return sorted({"".join(rnd.choice(alphabet) for _ in range(rnd.randint(1, 7))).strip() or "a" for _ in range(count)})
+
+
+def expected(ranks, prefix, limit=None):
+    matches = sorted((name for name in ranks if name.startswith(prefix)), key=lambda name: (-ranks[name], name))
+    return matches if limit is None else matches[:limit]
+
+
+def test_ranked_search_survives_inserts_rerankings_and_removals(trie_class):
+    rnd = random.Random(11)
+    trie = trie_class(top_k=5)
+    ranks = {}
+    names = words(rnd, 200)
+    for step in range(2000):
+        name = rnd.choice(names)
+        if name in ranks and rnd.random() < 0.4:
+            assert trie.remove(name)
+            del ranks[name]
+        else:
+            ranks[name] = rnd.randint(0, 20)  # Re-inserting a name may promote or demote it
+            trie.insert(name, rank=(ranks[name],))
+        if step % 50 == 0:
+            for prefix in ["", "a", "ab", "c", "dd", "e a"]:
+                for limit in (1, 5):
+                    assert trie.search(prefix, limit, rank=True) == expected(ranks, prefix, limit)
+                assert trie.search(prefix, None, rank=True) == expected(ranks, prefix)
+                assert sorted(trie.search(prefix)) == sorted(expected(ranks, prefix))
+    for name in list(ranks):
+        assert trie.remove(name)
+    assert trie.search("") == []
+    assert not trie.remove("a")
+
+
+def levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        previous, row[0] = row[0], i
+        for j in range(1, len(b) + 1):
+            previous, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, previous + (char != b[j - 1]))
+    return row[-1]
+
+
+@pytest.mark.parametrize("prefix", [True, False])
+def test_fuzzy_search_matches_brute_force_levenshtein(trie_class, prefix):
+    rnd = random.Random(13)
+    trie = trie_class(top_k=3)
+    ranks = {name: rnd.randint(0, 20) for name in words(rnd, 300)}
+    for name, rank in ranks.items():
+        trie.insert(name, rank=(rank,))
+    for query in ["abc", "e", "dab", "cc a", "bade", "x", "abcdeab"]:
+        for max_edits in (0, 1, 2):
+            edits = min(max_edits, len(query) - 1)  # A budget as long as the query would match everything
+            distances = {}
+            for name in ranks:
+                candidates = [name[:end] for end in range(len(name) + 1)] if prefix else [name]
+                distance = min(levenshtein(query, candidate) for candidate in candidates)
+                if distance <= edits:
+                    distances[name] = distance
+            brute_force = sorted(distances, key=lambda name: (distances[name], -ranks[name], name))
+            for limit in (None, 2, 50):
+                result = trie.fuzzy_search(query, max_edits, limit, prefix=prefix)
+                assert result == (brute_force if limit is None else brute_force[:limit]), (query, max_edits, limit)
+
+
+def test_short_fuzzy_queries_stay_bounded(backend, trie_class):
+    rnd = random.Random(5)
+    trie = trie_class()
+    for name in words(rnd, 3000):
+        trie.insert(name, rank=(rnd.randint(0, 20),))
+    stats = {}
+    # Two edits on a two-letter query would match every name; the budget is capped at one.
+    assert trie.fuzzy_search("ab", 2, 10, stats=stats) == trie.fuzzy_search("ab", 1, 10)
+    assert stats["nodes_visited"] < 100
+
+    client = backend.app.test_client()
+    movies = client.get("/search", query_string={"prefix": "th", "fuzzy": 1, "max_edits": 3}).get_json()["movies"]
+    assert 0 < len(movies) <= backend.MAX_FUZZY_RESULTS
+    actors = client.get("/movies-by-actor", query_string={"prefix": "an", "fuzzy": 1}).get_json()["actors"]
+    assert 0 < len(actors) <= backend.MAX_FUZZY_RESULTS